@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import re
+
+from .. import constants
+from .. import errors
+from .. import utils
+from ..api.build import BuildApiMixin
+
+
+class AsyncBuildApiMixin(object):
+    def build(self, path=None, tag=None, quiet=False, fileobj=None,
+              nocache=False, rm=False, stream=True, timeout=None,
+              custom_context=False, encoding=None, pull=False,
+              forcerm=False, dockerfile=None, container_limits=None,
+              decode=False, buildargs=None, gzip=False, shmsize=None,
+              labels=None):
+        """
+        Like :py:meth:`~docker.api.build.BuildApiMixin.build`. With
+        ``stream=True`` (the default), returns an async generator of build
+        output. Otherwise returns a coroutine resolving to an
+        ``(image_id, output)`` tuple.
+
+        The build context is archived in a worker thread so the event loop
+        is not blocked while reading the files under ``path``.
+        """
+        remote = None
+        container_limits = container_limits or {}
+        if path is None and fileobj is None:
+            raise TypeError("Either path or fileobj needs to be provided.")
+        if gzip and encoding is not None:
+            raise errors.DockerException(
+                'Can not use custom encoding if gzip is enabled'
+            )
+
+        for key in container_limits.keys():
+            if key not in constants.CONTAINER_LIMITS_KEYS:
+                raise errors.DockerException(
+                    'Invalid container_limits key {0}'.format(key)
+                )
+
+        if custom_context and not fileobj:
+            raise TypeError("You must specify fileobj with custom_context")
+        if fileobj is None:
+            if path.startswith(('http://', 'https://',
+                                'git://', 'github.com/', 'git@')):
+                remote = path
+            elif not os.path.isdir(path):
+                raise TypeError(
+                    "You must specify a directory to build in path"
+                )
+            elif gzip:
+                encoding = 'gzip'
+
+        params = {
+            't': tag,
+            'remote': remote,
+            'q': quiet,
+            'nocache': nocache,
+            'rm': rm,
+            'forcerm': forcerm,
+            'pull': pull,
+            'dockerfile': dockerfile,
+        }
+        params.update(container_limits)
+        if buildargs:
+            params['buildargs'] = json.dumps(buildargs)
+        if shmsize:
+            params['shmsize'] = shmsize
+        if labels:
+            params['labels'] = json.dumps(labels)
+
+        response = self._build_request(
+            path, fileobj, custom_context, remote, dockerfile, gzip,
+            encoding, params, timeout
+        )
+        if stream:
+            return self._stream_helper(response, decode=decode)
+        return self._build_result(response)
+
+    async def _build_request(self, path, fileobj, custom_context, remote,
+                             dockerfile, gzip, encoding, params, timeout):
+        context = None
+        if custom_context:
+            context = fileobj
+        elif fileobj is not None:
+            context = utils.mkbuildcontext(fileobj)
+        elif remote is None:
+            context = await asyncio.get_event_loop().run_in_executor(
+                None, _build_context, path, dockerfile, gzip
+            )
+
+        headers = {}
+        if context is not None:
+            headers['Content-Type'] = 'application/tar'
+            if encoding:
+                headers['Content-Encoding'] = encoding
+        await self._ensure_version()
+        BuildApiMixin._set_auth_headers(self, headers)
+
+        try:
+            return await self._post(
+                self._url('/build'), data=context, params=params,
+                headers=headers, timeout=timeout
+            )
+        finally:
+            if context is not None and not custom_context:
+                context.close()
+
+    async def _build_result(self, response):
+        output = await self._result(response)
+        srch = r'Successfully built ([0-9a-f]+)'
+        match = re.search(srch, output)
+        if not match:
+            return None, output
+        return match.group(1), output
+
+
+def _build_context(path, dockerfile, gzip):
+    dockerignore = os.path.join(path, '.dockerignore')
+    exclude = None
+    if os.path.exists(dockerignore):
+        with open(dockerignore, 'r') as f:
+            exclude = list(filter(bool, f.read().splitlines()))
+    return utils.tar(path, exclude=exclude, dockerfile=dockerfile, gzip=gzip)
@@ -0,0 +1,304 @@
+import asyncio
+import inspect
+import json
+import struct
+from functools import partial
+
+import six
+
+from .build import AsyncBuildApiMixin
+from .container import AsyncContainerApiMixin
+from .daemon import AsyncDaemonApiMixin
+from .image import AsyncImageApiMixin
+from .transport import (AsyncConnectionPool, create_ssl_context,
+                        send_request, tcp_opener, unix_opener)
+from .. import auth
+from ..constants import (DEFAULT_TIMEOUT_SECONDS, DEFAULT_USER_AGENT,
+                         IS_WINDOWS_PLATFORM, DEFAULT_DOCKER_API_VERSION,
+                         DEFAULT_MAX_POOL_SIZE, STREAM_HEADER_SIZE_BYTES)
+from ..errors import DockerException, TLSParameterError
+from ..utils import utils
+from ..utils.json_stream import json_loads
+
+
+class AsyncAPIClient(
+        AsyncBuildApiMixin,
+        AsyncContainerApiMixin,
+        AsyncDaemonApiMixin,
+        AsyncImageApiMixin):
+    """
+    A low-level asyncio client for the Docker Remote API. Requires Python 3.6
+    or above.
+
+    Methods mirror those of :py:class:`~docker.api.client.APIClient` but are
+    coroutines. Streaming methods (``logs``, ``events``, ``stats``, ``pull``,
+    ``push`` and ``build`` with ``stream=True``) return async generators
+    instead of blocking generators.
+
+    Example:
+
+        >>> import asyncio
+        >>> from docker.aio import AsyncAPIClient
+        >>> async def main():
+        ...     async with AsyncAPIClient() as client:
+        ...         async for event in client.events(decode=True):
+        ...             print(event)
+        >>> asyncio.get_event_loop().run_until_complete(main())
+
+    Args:
+        base_url (str): URL to the Docker server. For example,
+            ``unix:///var/run/docker.sock`` or ``tcp://127.0.0.1:1234``.
+        version (str): The version of the API to use. Set to ``auto`` to
+            automatically detect the server's version on the first request.
+            Default: ``1.24``
+        timeout (int): Default timeout for API calls, in seconds.
+        tls (bool or :py:class:`~docker.tls.TLSConfig`): Enable TLS. Pass
+            ``True`` to enable it with default options, or pass a
+            :py:class:`~docker.tls.TLSConfig` object to use custom
+            configuration.
+        user_agent (str): Set a custom user agent for requests to the server.
+        max_pool_size (int): The maximum number of connections kept open to
+            the server. Requests beyond that wait for a free connection.
+    """
+    def __init__(self, base_url=None, version=None,
+                 timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
+                 user_agent=DEFAULT_USER_AGENT,
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE):
+        if tls and not base_url:
+            raise TLSParameterError(
+                'If using TLS, the base_url argument must be provided.'
+            )
+
+        self.timeout = timeout
+        self.headers = {'User-Agent': user_agent}
+        self._auth_configs = auth.load_config()
+
+        base_url = utils.parse_host(
+            base_url, IS_WINDOWS_PLATFORM, tls=bool(tls)
+        )
+        self._path_prefix = ''
+        if base_url.startswith('http+unix://'):
+            socket_path = base_url.replace('http+unix://', '')
+            if not socket_path.startswith('/'):
+                socket_path = '/' + socket_path
+            opener = unix_opener(socket_path)
+            self._host = 'localhost'
+            self.base_url = 'http+docker://localunixsocket'
+        elif base_url.startswith('npipe://'):
+            raise DockerException(
+                'The npipe:// protocol is not supported by AsyncAPIClient'
+            )
+        else:
+            parsed = six.moves.urllib.parse.urlparse(base_url)
+            ssl_context = None
+            if parsed.scheme == 'https':
+                ssl_context = create_ssl_context(tls or True)
+            opener = tcp_opener(parsed.hostname, parsed.port, ssl_context)
+            self._host = parsed.netloc
+            self._path_prefix = parsed.path.rstrip('/')
+            self.base_url = base_url
+        self._pool = AsyncConnectionPool(opener, maxsize=max_pool_size)
+
+        if version is None:
+            self._version = DEFAULT_DOCKER_API_VERSION
+        elif isinstance(version, six.string_types):
+            self._version = None if version.lower() == 'auto' else version
+        else:
+            raise DockerException(
+                'Version parameter must be a string or None. Found {0}'.format(
+                    type(version).__name__
+                )
+            )
+        self._version_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Close all idle connections to the server.
+        """
+        self._pool.close()
+
+    async def _retrieve_server_version(self):
+        try:
+            return (await self.version(api_version=False))["ApiVersion"]
+        except KeyError:
+            raise DockerException(
+                'Invalid response from docker daemon: key "ApiVersion"'
+                ' is missing.'
+            )
+        except Exception as e:
+            raise DockerException(
+                'Error while fetching server API version: {0}'.format(e)
+            )
+
+    async def _ensure_version(self):
+        if self._version is None:
+            if self._version_lock is None:
+                self._version_lock = asyncio.Lock()
+            async with self._version_lock:
+                if self._version is None:
+                    self._version = await self._retrieve_server_version()
+        return self._version
+
+    def _url(self, pathfmt, *args):
+        for arg in args:
+            if not isinstance(arg, six.string_types):
+                raise ValueError(
+                    'Expected a string but found {0} ({1}) '
+                    'instead'.format(arg, type(arg))
+                )
+
+        quote_f = partial(six.moves.urllib.parse.quote_plus, safe="/:")
+        return pathfmt.format(*map(quote_f, args))
+
+    async def _request(self, method, path, params=None, headers=None,
+                       data=None, timeout=None, versioned_api=True):
+        if versioned_api:
+            path = '/v{0}{1}'.format(await self._ensure_version(), path)
+        path = self._path_prefix + path
+        if params:
+            query = six.moves.urllib.parse.urlencode([
+                (k, v) for k, v in sorted(params.items()) if v is not None
+            ], doseq=True)
+            if query:
+                path = '{0}?{1}'.format(path, query)
+
+        request_headers = dict(self.headers)
+        if 'HttpHeaders' in self._auth_configs:
+            request_headers.update(self._auth_configs['HttpHeaders'])
+        request_headers.update(headers or {})
+
+        return await send_request(
+            self._pool, method, self.base_url + path, path, self._host,
+            request_headers, body=data, timeout=timeout
+        )
+
+    def _set_request_timeout(self, kwargs):
+        """Prepare the kwargs for an HTTP request by inserting the timeout
+        parameter, if not already present."""
+        kwargs.setdefault('timeout', self.timeout)
+        return kwargs
+
+    def _get(self, path, **kwargs):
+        return self._request('GET', path, **self._set_request_timeout(kwargs))
+
+    def _post(self, path, **kwargs):
+        return self._request('POST', path, **self._set_request_timeout(kwargs))
+
+    def _delete(self, path, **kwargs):
+        return self._request(
+            'DELETE', path, **self._set_request_timeout(kwargs)
+        )
+
+    def _post_json(self, path, data, **kwargs):
+        # Go <1.1 can't unserialize null to a string
+        data2 = {}
+        if data is not None:
+            for k, v in six.iteritems(data):
+                if v is not None:
+                    data2[k] = v
+
+        headers = kwargs.pop('headers', None) or {}
+        headers['Content-Type'] = 'application/json'
+        return self._post(
+            path, data=json.dumps(data2).encode('utf-8'), headers=headers,
+            **kwargs
+        )
+
+    async def _raise_for_status(self, response):
+        """Raises stored :class:`APIError`, if one occurred. The response body
+        is read and discarded, so that the connection can be reused."""
+        response = await _resolve(response)
+        await response.raise_for_status()
+        await response.read()
+        return response
+
+    async def _result(self, response, json=False, binary=False):
+        assert not (json and binary)
+        response = await _resolve(response)
+        await response.raise_for_status()
+
+        if json:
+            return await response.json()
+        data = await response.read()
+        if binary:
+            return data
+        return data.decode('utf-8')
+
+    async def _stream_helper(self, response, decode=False):
+        """Async generator for data coming from a chunked-encoded HTTP
+        response."""
+        response = await _resolve(response)
+        await response.raise_for_status()
+        if not response.chunked:
+            # Response isn't chunked, meaning we probably
+            # encountered an error immediately
+            yield await self._result(response, json=decode)
+            return
+
+        if not decode:
+            async for data in response.iter_chunks():
+                yield data
+            return
+
+        # The start of a line is kept in pieces until its end arrives, so
+        # that a long line is not copied and scanned again for each chunk.
+        pending = []
+        async for data in response.iter_chunks():
+            lines = data.split(b'\n')
+            rest = lines.pop()
+            if lines:
+                pending.append(lines[0])
+                lines[0] = b''.join(pending)
+                pending = []
+            pending.append(rest)
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield json_loads(line)
+        rest = b''.join(pending)
+        if rest.strip():
+            yield json_loads(rest)
+
+    async def _multiplexed_response_stream_helper(self, response):
+        """An async generator of multiplexed data blocks coming from a
+        response stream."""
+        response = await _resolve(response)
+        await response.raise_for_status()
+        buf = bytearray()
+        async for data in response.iter_chunks():
+            buf += data
+            while len(buf) >= STREAM_HEADER_SIZE_BYTES:
+                _, length = struct.unpack_from('>BxxxL', buf)
+                end = STREAM_HEADER_SIZE_BYTES + length
+                if len(buf) < end:
+                    break
+                frame = bytes(buf[STREAM_HEADER_SIZE_BYTES:end])
+                del buf[:end]
+                if frame:
+                    yield frame
+
+    async def _stream_raw_result(self, response):
+        """Async generator for the output of a TTY-enabled container."""
+        response = await _resolve(response)
+        await response.raise_for_status()
+        async for data in response.iter_chunks():
+            yield data
+
+    @property
+    def api_version(self):
+        return self._version
+
+
+async def _resolve(response):
+    # Helpers accept either a response or the pending request that will
+    # produce it, so that mixins can be written like their blocking
+    # counterparts: ``self._result(self._get(url), True)``
+    if inspect.isawaitable(response):
+        response = await response
+    return response
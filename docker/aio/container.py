@@ -0,0 +1,303 @@
+from datetime import datetime
+
+import six
+
+from .. import errors, utils
+from ..utils.utils import create_networking_config, create_endpoint_config
+
+
+class AsyncContainerApiMixin(object):
+    async def containers(self, quiet=False, all=False, trunc=False,
+                         latest=False, since=None, before=None, limit=-1,
+                         size=False, filters=None):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.containers`.
+        """
+        params = {
+            'limit': 1 if latest else limit,
+            'all': 1 if all else 0,
+            'size': 1 if size else 0,
+            'trunc_cmd': 1 if trunc else 0,
+            'since': since,
+            'before': before
+        }
+        if filters:
+            params['filters'] = utils.convert_filters(filters)
+        u = self._url("/containers/json")
+        res = await self._result(self._get(u, params=params), True)
+
+        if quiet:
+            return [{'Id': x['Id']} for x in res]
+        if trunc:
+            for x in res:
+                x['Id'] = x['Id'][:12]
+        return res
+
+    async def create_container(self, image, command=None, hostname=None,
+                               user=None, detach=False, stdin_open=False,
+                               tty=False, mem_limit=None, ports=None,
+                               environment=None, dns=None, volumes=None,
+                               volumes_from=None, network_disabled=False,
+                               name=None, entrypoint=None, cpu_shares=None,
+                               working_dir=None, domainname=None,
+                               memswap_limit=None, cpuset=None,
+                               host_config=None, mac_address=None,
+                               labels=None, volume_driver=None,
+                               stop_signal=None, networking_config=None,
+                               healthcheck=None):
+        """
+        Like
+        :py:meth:`~docker.api.container.ContainerApiMixin.create_container`.
+        """
+        if isinstance(volumes, six.string_types):
+            volumes = [volumes, ]
+
+        # With ``version='auto'``, the configs depend on the server's version
+        await self._ensure_version()
+        config = self.create_container_config(
+            image, command, hostname, user, detach, stdin_open,
+            tty, mem_limit, ports, environment, dns, volumes, volumes_from,
+            network_disabled, entrypoint, cpu_shares, working_dir, domainname,
+            memswap_limit, cpuset, host_config, mac_address, labels,
+            volume_driver, stop_signal, networking_config, healthcheck,
+        )
+        return await self.create_container_from_config(config, name)
+
+    def create_container_config(self, *args, **kwargs):
+        return utils.create_container_config(
+            self._resolved_version(), *args, **kwargs
+        )
+
+    async def create_container_from_config(self, config, name=None):
+        u = self._url("/containers/create")
+        params = {
+            'name': name
+        }
+        res = self._post_json(u, data=config, params=params)
+        return await self._result(res, True)
+
+    def create_host_config(self, *args, **kwargs):
+        """
+        Like
+        :py:meth:`~docker.api.container.ContainerApiMixin.create_host_config`.
+        """
+        if not kwargs:
+            kwargs = {}
+        if 'version' in kwargs:
+            raise TypeError(
+                "create_host_config() got an unexpected "
+                "keyword argument 'version'"
+            )
+        kwargs['version'] = self._resolved_version()
+        return utils.create_host_config(*args, **kwargs)
+
+    def create_networking_config(self, *args, **kwargs):
+        return create_networking_config(*args, **kwargs)
+
+    def create_endpoint_config(self, *args, **kwargs):
+        return create_endpoint_config(
+            self._resolved_version(), *args, **kwargs
+        )
+
+    def _resolved_version(self):
+        # The config helpers are not coroutines, so they cannot detect the
+        # server's version themselves.
+        if self._version is None:
+            raise errors.DockerException(
+                'The API version has not been detected yet. Make a request '
+                'to the server, like version(), first.'
+            )
+        return self._version
+
+    @utils.check_resource
+    async def diff(self, container):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.diff`.
+        """
+        return await self._result(
+            self._get(self._url("/containers/{0}/changes", container)), True
+        )
+
+    @utils.check_resource
+    async def inspect_container(self, container):
+        """
+        Like
+        :py:meth:`~docker.api.container.ContainerApiMixin.inspect_container`.
+        """
+        return await self._result(
+            self._get(self._url("/containers/{0}/json", container)), True
+        )
+
+    @utils.check_resource
+    async def kill(self, container, signal=None):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.kill`.
+        """
+        url = self._url("/containers/{0}/kill", container)
+        params = {}
+        if signal is not None:
+            if not isinstance(signal, six.string_types):
+                signal = int(signal)
+            params['signal'] = signal
+        await self._raise_for_status(self._post(url, params=params))
+
+    @utils.check_resource
+    def logs(self, container, stdout=True, stderr=True, stream=False,
+             timestamps=False, tail='all', since=None, follow=None):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.logs`. With
+        ``stream=True``, returns an async generator of output blocks.
+        Otherwise returns a coroutine resolving to the whole output.
+        """
+        if follow is None:
+            follow = stream
+        params = {'stderr': stderr and 1 or 0,
+                  'stdout': stdout and 1 or 0,
+                  'timestamps': timestamps and 1 or 0,
+                  'follow': follow and 1 or 0,
+                  }
+        if tail != 'all' and (not isinstance(tail, int) or tail < 0):
+            tail = 'all'
+        params['tail'] = tail
+
+        if isinstance(since, datetime):
+            params['since'] = utils.datetime_to_timestamp(since)
+        elif (isinstance(since, int) and since > 0):
+            params['since'] = since
+
+        url = self._url("/containers/{0}/logs", container)
+        if stream:
+            return self._get_stream_result(
+                container, self._get(url, params=params, timeout=None)
+            )
+        return self._get_result(container, self._get(url, params=params))
+
+    async def _get_result(self, container, res):
+        cont = await self.inspect_container(container)
+        if cont['Config']['Tty']:
+            return await self._result(res, binary=True)
+        return six.binary_type().join(
+            [x async for x in self._multiplexed_response_stream_helper(res)]
+        )
+
+    async def _get_stream_result(self, container, res):
+        cont = await self.inspect_container(container)
+        if cont['Config']['Tty']:
+            helper = self._stream_raw_result
+        else:
+            helper = self._multiplexed_response_stream_helper
+        async for data in helper(res):
+            yield data
+
+    @utils.check_resource
+    async def pause(self, container):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.pause`.
+        """
+        url = self._url('/containers/{0}/pause', container)
+        await self._raise_for_status(self._post(url))
+
+    @utils.check_resource
+    async def remove_container(self, container, v=False, link=False,
+                               force=False):
+        """
+        Like
+        :py:meth:`~docker.api.container.ContainerApiMixin.remove_container`.
+        """
+        params = {'v': v, 'link': link, 'force': force}
+        await self._raise_for_status(self._delete(
+            self._url("/containers/{0}", container), params=params
+        ))
+
+    @utils.check_resource
+    async def rename(self, container, name):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.rename`.
+        """
+        url = self._url("/containers/{0}/rename", container)
+        params = {'name': name}
+        await self._raise_for_status(self._post(url, params=params))
+
+    @utils.check_resource
+    async def resize(self, container, height, width):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.resize`.
+        """
+        params = {'h': height, 'w': width}
+        url = self._url("/containers/{0}/resize", container)
+        await self._raise_for_status(self._post(url, params=params))
+
+    @utils.check_resource
+    async def restart(self, container, timeout=10):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.restart`.
+        """
+        params = {'t': timeout}
+        url = self._url("/containers/{0}/restart", container)
+        await self._raise_for_status(self._post(
+            url, params=params, timeout=(timeout + (self.timeout or 0))
+        ))
+
+    @utils.check_resource
+    async def start(self, container):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.start`.
+        """
+        url = self._url("/containers/{0}/start", container)
+        await self._raise_for_status(self._post(url))
+
+    @utils.check_resource
+    def stats(self, container, decode=None, stream=True):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.stats`. With
+        ``stream=True``, returns an async generator. Otherwise returns a
+        coroutine resolving to the current stats.
+        """
+        url = self._url("/containers/{0}/stats", container)
+        if stream:
+            return self._stream_helper(self._get(url, timeout=None),
+                                       decode=decode)
+        else:
+            return self._result(self._get(url, params={'stream': False}),
+                                json=True)
+
+    @utils.check_resource
+    async def stop(self, container, timeout=10):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.stop`.
+        """
+        params = {'t': timeout}
+        url = self._url("/containers/{0}/stop", container)
+        await self._raise_for_status(self._post(
+            url, params=params, timeout=(timeout + (self.timeout or 0))
+        ))
+
+    @utils.check_resource
+    async def top(self, container, ps_args=None):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.top`.
+        """
+        u = self._url("/containers/{0}/top", container)
+        params = {}
+        if ps_args is not None:
+            params['ps_args'] = ps_args
+        return await self._result(self._get(u, params=params), True)
+
+    @utils.check_resource
+    async def unpause(self, container):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.unpause`.
+        """
+        url = self._url('/containers/{0}/unpause', container)
+        await self._raise_for_status(self._post(url))
+
+    @utils.check_resource
+    async def wait(self, container, timeout=None):
+        """
+        Like :py:meth:`~docker.api.container.ContainerApiMixin.wait`.
+        """
+        url = self._url("/containers/{0}/wait", container)
+        json_ = await self._result(self._post(url, timeout=timeout), True)
+        if 'StatusCode' in json_:
+            return json_['StatusCode']
+        return -1
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from .. import utils
+
+
+class AsyncDaemonApiMixin(object):
+    def events(self, since=None, until=None, filters=None, decode=None):
+        """
+        Like :py:meth:`~docker.api.daemon.DaemonApiMixin.events`, but returns
+        an async generator.
+        """
+        if isinstance(since, datetime):
+            since = utils.datetime_to_timestamp(since)
+
+        if isinstance(until, datetime):
+            until = utils.datetime_to_timestamp(until)
+
+        if filters:
+            filters = utils.convert_filters(filters)
+
+        params = {
+            'since': since,
+            'until': until,
+            'filters': filters
+        }
+
+        return self._stream_helper(
+            self._get(self._url('/events'), params=params, timeout=None),
+            decode=decode
+        )
+
+    async def info(self):
+        """
+        Like :py:meth:`~docker.api.daemon.DaemonApiMixin.info`.
+        """
+        return await self._result(self._get(self._url("/info")), True)
+
+    async def ping(self):
+        """
+        Like :py:meth:`~docker.api.daemon.DaemonApiMixin.ping`.
+        """
+        return await self._result(self._get(self._url('/_ping'))) == 'OK'
+
+    async def version(self, api_version=True):
+        """
+        Like :py:meth:`~docker.api.daemon.DaemonApiMixin.version`.
+        """
+        res = self._get(self._url("/version"), versioned_api=api_version)
+        return await self._result(res, json=True)
@@ -0,0 +1,144 @@
+import logging
+
+from .. import auth, utils
+
+log = logging.getLogger(__name__)
+
+
+class AsyncImageApiMixin(object):
+
+    @utils.check_resource
+    async def history(self, image):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.history`.
+        """
+        res = self._get(self._url("/images/{0}/history", image))
+        return await self._result(res, True)
+
+    async def images(self, name=None, quiet=False, all=False, filters=None):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.images`.
+        """
+        params = {
+            'filter': name,
+            'only_ids': 1 if quiet else 0,
+            'all': 1 if all else 0,
+        }
+        if filters:
+            params['filters'] = utils.convert_filters(filters)
+        res = await self._result(
+            self._get(self._url("/images/json"), params=params), True
+        )
+        if quiet:
+            return [x['Id'] for x in res]
+        return res
+
+    @utils.check_resource
+    async def inspect_image(self, image):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.inspect_image`.
+        """
+        return await self._result(
+            self._get(self._url("/images/{0}/json", image)), True
+        )
+
+    async def load_image(self, data):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.load_image`. ``data``
+        may be bytes or a readable file object.
+        """
+        await self._raise_for_status(
+            self._post(self._url("/images/load"), data=data, timeout=None)
+        )
+
+    def pull(self, repository, tag=None, stream=False, auth_config=None,
+             decode=False):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.pull`. With
+        ``stream=True``, returns an async generator. Otherwise returns a
+        coroutine resolving to the whole output.
+        """
+        if not tag:
+            repository, tag = utils.parse_repository_tag(repository)
+        registry, repo_name = auth.resolve_repository_name(repository)
+
+        params = {
+            'tag': tag,
+            'fromImage': repository
+        }
+        headers = self._registry_auth_headers(registry, auth_config)
+
+        response = self._post(
+            self._url('/images/create'), params=params, headers=headers,
+            timeout=None
+        )
+        if stream:
+            return self._stream_helper(response, decode=decode)
+        return self._result(response)
+
+    def push(self, repository, tag=None, stream=False, auth_config=None,
+             decode=False):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.push`. With
+        ``stream=True``, returns an async generator. Otherwise returns a
+        coroutine resolving to the whole output.
+        """
+        if not tag:
+            repository, tag = utils.parse_repository_tag(repository)
+        registry, repo_name = auth.resolve_repository_name(repository)
+        u = self._url("/images/{0}/push", repository)
+        params = {
+            'tag': tag
+        }
+        headers = self._registry_auth_headers(registry, auth_config)
+
+        response = self._post_json(
+            u, None, headers=headers, params=params, timeout=None
+        )
+        if stream:
+            return self._stream_helper(response, decode=decode)
+        return self._result(response)
+
+    def _registry_auth_headers(self, registry, auth_config):
+        headers = {}
+        if auth_config is None:
+            header = auth.get_config_header(self, registry)
+            if header:
+                headers['X-Registry-Auth'] = header
+        else:
+            log.debug('Sending supplied auth config')
+            headers['X-Registry-Auth'] = auth.encode_header(auth_config)
+        return headers
+
+    @utils.check_resource
+    async def remove_image(self, image, force=False, noprune=False):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.remove_image`.
+        """
+        params = {'force': force, 'noprune': noprune}
+        await self._raise_for_status(
+            self._delete(self._url("/images/{0}", image), params=params)
+        )
+
+    async def search(self, term):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.search`.
+        """
+        return await self._result(
+            self._get(self._url("/images/search"), params={'term': term}),
+            True
+        )
+
+    @utils.check_resource
+    async def tag(self, image, repository, tag=None, force=False):
+        """
+        Like :py:meth:`~docker.api.image.ImageApiMixin.tag`.
+        """
+        params = {
+            'tag': tag,
+            'repo': repository,
+            'force': 1 if force else 0
+        }
+        url = self._url("/images/{0}/tag", image)
+        res = await self._raise_for_status(self._post(url, params=params))
+        return res.status_code == 201
@@ -0,0 +1,314 @@
+import asyncio
+import collections
+import ssl
+from functools import partial
+
+import requests
+import requests.exceptions
+from requests.structures import CaseInsensitiveDict
+import six
+
+from ..errors import DockerException, create_api_error_from_http_exception
+from ..utils.json_stream import json_loads
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncConnection(object):
+    """
+    A single HTTP/1.1 connection to the Docker daemon, wrapping an asyncio
+    stream reader/writer pair.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class AsyncConnectionPool(object):
+    """
+    A pool of keep-alive connections to a single daemon. At most ``maxsize``
+    connections are open at the same time; further requests wait for a
+    connection to be released.
+    """
+    def __init__(self, opener, maxsize=10):
+        self._opener = opener
+        self._idle = collections.deque()
+        self._semaphore = None
+        self.maxsize = maxsize
+
+    async def acquire(self, timeout=None):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.maxsize)
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.closed and not conn.reader.at_eof():
+                    return conn
+                conn.close()
+            reader, writer = await asyncio.wait_for(self._opener(), timeout)
+            return AsyncConnection(reader, writer)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, conn, reuse=True):
+        if reuse and not conn.closed:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._semaphore.release()
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+def unix_opener(socket_path):
+    def opener():
+        return asyncio.open_unix_connection(socket_path)
+    return opener
+
+
+def tcp_opener(host, port, ssl_context=None):
+    def opener():
+        return asyncio.open_connection(
+            host, port, ssl=ssl_context,
+            server_hostname=host if ssl_context else None
+        )
+    return opener
+
+
+def create_ssl_context(tls):
+    """
+    Build an :py:class:`ssl.SSLContext` from the ``tls`` argument accepted by
+    :py:class:`~docker.api.client.APIClient`.
+    """
+    if tls is True:
+        return ssl.create_default_context()
+
+    verify = tls.verify
+    context = ssl.create_default_context(
+        cafile=tls.ca_cert if verify and tls.ca_cert else None
+    )
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif tls.assert_hostname is False:
+        context.check_hostname = False
+    if tls.cert:
+        context.load_cert_chain(*tls.cert)
+    return context
+
+
+class AsyncResponse(object):
+    """
+    An HTTP response whose body has not been read yet. The connection goes
+    back to the pool once the body has been consumed through :py:meth:`read`
+    or :py:meth:`iter_chunks`, or is dropped by :py:meth:`close`. Each read
+    from the connection fails after ``timeout`` seconds without data.
+    """
+    def __init__(self, pool, conn, url, status_code, reason, headers,
+                 keep_alive, timeout=None):
+        self._pool = pool
+        self._conn = conn
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self._keep_alive = keep_alive
+        te = headers.get('Transfer-Encoding', '')
+        self.chunked = 'chunked' in te.lower()
+        length = headers.get('Content-Length')
+        self.length = int(length) if length is not None else None
+        self.timeout = timeout
+
+    @property
+    def reader(self):
+        return self._conn.reader
+
+    async def iter_chunks(self):
+        """
+        Yield the body as it arrives, undoing the chunked transfer encoding
+        if necessary.
+        """
+        reader = self.reader
+        wait = partial(asyncio.wait_for, timeout=self.timeout)
+        reuse = False
+        try:
+            if self.chunked:
+                while True:
+                    size_line = await wait(reader.readline())
+                    if not size_line:
+                        break
+                    size = int(size_line.split(b';', 1)[0].strip(), 16)
+                    if size == 0:
+                        # Discard the trailers and the final CRLF
+                        while (await wait(reader.readline())) not in (
+                                b'\r\n', b''):
+                            pass
+                        reuse = self._keep_alive
+                        break
+                    data = await wait(reader.readexactly(size))
+                    await wait(reader.readexactly(2))
+                    yield data
+            elif self.length is not None:
+                left = self.length
+                while left > 0:
+                    data = await wait(
+                        reader.read(min(left, READ_CHUNK_SIZE))
+                    )
+                    if not data:
+                        break
+                    left -= len(data)
+                    yield data
+                reuse = self._keep_alive and left == 0
+            else:
+                while True:
+                    data = await wait(reader.read(READ_CHUNK_SIZE))
+                    if not data:
+                        break
+                    yield data
+        finally:
+            self._finish(reuse)
+
+    async def read(self):
+        return b''.join([chunk async for chunk in self.iter_chunks()])
+
+    def close(self):
+        self._finish(False)
+
+    def _finish(self, reuse):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn, reuse=reuse)
+
+    async def raise_for_status(self):
+        """
+        Raise a :py:class:`~docker.errors.APIError` if the daemon answered
+        with an error status. The error body is consumed.
+        """
+        if self.status_code < 400:
+            return
+        res = requests.Response()
+        res.status_code = self.status_code
+        res.reason = self.reason
+        res.url = self.url
+        res.headers = self.headers
+        res._content = await self.read()
+        try:
+            res.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise create_api_error_from_http_exception(e)
+
+    async def json(self):
+        data = await self.read()
+        return json_loads(data)
+
+
+def _encode_request(method, path, host, headers, length):
+    lines = ['{0} {1} HTTP/1.1'.format(method, path), 'Host: {0}'.format(host)]
+    for key, value in headers.items():
+        lines.append('{0}: {1}'.format(key, value))
+    if length is None:
+        lines.append('Transfer-Encoding: chunked')
+    else:
+        lines.append('Content-Length: {0}'.format(length))
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def _body_length(body):
+    if body is None:
+        return 0
+    if isinstance(body, six.binary_type):
+        return len(body)
+    if hasattr(body, 'seek') and hasattr(body, 'tell'):
+        position = body.tell()
+        body.seek(0, 2)
+        length = body.tell() - position
+        body.seek(position)
+        return length
+    return None
+
+
+async def _write_body(writer, body, length):
+    if body is None:
+        return
+    if isinstance(body, six.binary_type):
+        writer.write(body)
+        return
+    if hasattr(body, 'read'):
+        chunks = iter(lambda: body.read(READ_CHUNK_SIZE), b'')
+    else:
+        chunks = body
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if length is None:
+            writer.write('{0:x}\r\n'.format(len(chunk)).encode('ascii'))
+            writer.write(chunk)
+            writer.write(b'\r\n')
+        else:
+            writer.write(chunk)
+        await writer.drain()
+    if length is None:
+        writer.write(b'0\r\n\r\n')
+
+
+async def _read_head(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise DockerException('Connection closed by the Docker daemon')
+    parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    http_version, status_code = parts[0], int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ''
+    headers = CaseInsensitiveDict()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip()] = value.strip()
+    return http_version, status_code, reason, headers
+
+
+async def send_request(pool, method, url, path, host, headers, body=None,
+                       timeout=None):
+    """
+    Send a request over a pooled connection and return an
+    :py:class:`AsyncResponse` once the status line and headers have been
+    received. ``timeout`` applies to connecting, to waiting for the headers
+    and to each read of the body.
+    """
+    conn = await pool.acquire(timeout)
+    try:
+        length = _body_length(body)
+        conn.writer.write(
+            _encode_request(method, path, host, headers, length)
+        )
+        await _write_body(conn.writer, body, length)
+        await conn.writer.drain()
+        head = await asyncio.wait_for(_read_head(conn.reader), timeout)
+        http_version, status_code, reason, res_headers = head
+    except BaseException:
+        pool.release(conn, reuse=False)
+        raise
+
+    keep_alive = (
+        http_version == 'HTTP/1.1' and
+        res_headers.get('Connection', '').lower() != 'close'
+    )
+    response = AsyncResponse(
+        pool, conn, url, status_code, reason, res_headers, keep_alive,
+        timeout
+    )
+    if status_code in (204, 304) or method == 'HEAD':
+        response.length = 0
+        response.chunked = False
+    return response
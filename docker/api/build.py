@@ -18,7 +18,8 @@ class BuildApiMixin(object):
               custom_context=False, encoding=None, pull=False,
               forcerm=False, dockerfile=None, container_limits=None,
               decode=False, buildargs=None, gzip=False, shmsize=None,
-              labels=None):
+              labels=None, buffered=False, stream_context=False,
+              context_cache=None, gzip_workers=1, gzip_level=9):
         """
         Similar to the ``docker build`` command. Either ``path`` or ``fileobj``
         needs to be set. ``path`` can be a local path (to a directory
@@ -92,6 +93,24 @@ class BuildApiMixin(object):
             shmsize (int): Size of `/dev/shm` in bytes. The size must be
                 greater than 0. If omitted the system uses 64MB.
             labels (dict): A dictionary of labels to set on the image.
+            buffered (bool): Read the response from the socket in large
+                blocks and parse the chunked encoding in the client. Much
+                faster on busy streams. Without ``decode``, each item may hold
+                several messages. Default ``False``.
+            stream_context (bool): Send the build context from ``path`` as
+                it is archived, using chunked transfer encoding, instead of
+                writing it to a temporary file first. Default ``False``.
+            context_cache (BuildContextCache): A
+                :py:class:`~docker.utils.build_cache.BuildContextCache` to
+                reuse the files of ``path`` that have not changed since a
+                previous build from. Its ``last_build`` describes the
+                context of the last build that used it.
+            gzip (bool): Compress the build context from ``path`` with gzip.
+            gzip_workers (int): The number of threads compressing the build
+                context when ``gzip`` is set. With more than one, the context
+                is sent as a multi-member gzip stream. Default ``1``.
+            gzip_level (int): The gzip compression level, from 1 (fastest)
+                to 9 (best). Default ``9``.
 
         Returns:
             A generator for the build output.
@@ -135,9 +154,18 @@ class BuildApiMixin(object):
             if os.path.exists(dockerignore):
                 with open(dockerignore, 'r') as f:
                     exclude = list(filter(bool, f.read().splitlines()))
-            context = utils.tar(
-                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip
-            )
+            if stream_context:
+                context = utils.tar_stream(
+                    path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                    cache=context_cache, gzip_workers=gzip_workers,
+                    gzip_level=gzip_level
+                )
+            else:
+                context = utils.tar(
+                    path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                    cache=context_cache, gzip_workers=gzip_workers,
+                    gzip_level=gzip_level
+                )
             encoding = 'gzip' if gzip else encoding
 
         if utils.compare_version('1.8', self._version) >= 0:
@@ -208,10 +236,14 @@ class BuildApiMixin(object):
         if context is not None and not custom_context:
             context.close()
 
+        repositories = [tag] if tag else []
         if stream:
-            return self._stream_helper(response, decode=decode)
+            return self._forget_tags_after(self._stream_helper(
+                response, decode=decode, buffered=buffered
+            ), repositories)
         else:
             output = self._result(response)
+            self._forget_tags(repositories)
             srch = r'Successfully built ([0-9a-f]+)'
             match = re.search(srch, output)
             if not match:
@@ -21,13 +21,18 @@ from .. import auth, ssladapter
 from ..constants import (DEFAULT_TIMEOUT_SECONDS, DEFAULT_USER_AGENT,
                          IS_WINDOWS_PLATFORM, DEFAULT_DOCKER_API_VERSION,
                          STREAM_HEADER_SIZE_BYTES, DEFAULT_NUM_POOLS,
-                         MINIMUM_DOCKER_API_VERSION)
+                         DEFAULT_MAX_POOL_SIZE,
+                         MINIMUM_DOCKER_API_VERSION, DEFAULT_BLOCK_SIZE)
 from ..errors import (DockerException, TLSParameterError,
                       create_api_error_from_http_exception)
 from ..tls import TLSConfig
-from ..transport import UnixAdapter
+from ..transport import TCPAdapter, UnixAdapter
 from ..utils import utils, check_resource, update_headers
-from ..utils.socket import frames_iter
+from ..utils.singleflight import SingleFlight
+from ..utils.socket import STDERR, STDOUT, chunks_iter, frames_iter
+from ..utils.json_stream import json_loads, json_stream
+from ..utils.stream import (decode_blocks, decode_frames, decode_output,
+                            demux_buffer, iter_lines, read_chunked)
 try:
     from ..transport import NpipeAdapter
 except ImportError:
@@ -74,10 +79,32 @@ class APIClient(
             :py:class:`~docker.tls.TLSConfig` object to use custom
             configuration.
         user_agent (str): Set a custom user agent for requests to the server.
+        image_cache (:py:class:`~docker.utils.image_cache.ImageCache`): A
+            cache for the results of
+            :py:meth:`~docker.api.image.ImageApiMixin.inspect_image` and
+            :py:meth:`~docker.api.image.ImageApiMixin.history`. Default: no
+            cache.
+        single_flight (bool): Make identical inspect requests which are
+            made at the same time from several threads share one request
+            to the server. A thread may then get a result which was
+            requested before its own last change to the object. Default:
+            ``False``
+        max_pool_size (int): The number of connections to the server kept
+            open for reuse. Default: ``10``
+        pool_block (bool): Wait for one of the ``max_pool_size``
+            connections to be free instead of opening more, which are
+            closed after use. Default: ``False``
+
+    Attributes:
+        single_flight (:py:class:`~docker.utils.singleflight.SingleFlight`):
+            Counts the inspect requests which were shared, as ``hits``, and
+            those which were sent, as ``misses``. ``None`` if disabled.
     """
     def __init__(self, base_url=None, version=None,
                  timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
-                 user_agent=DEFAULT_USER_AGENT, num_pools=DEFAULT_NUM_POOLS):
+                 user_agent=DEFAULT_USER_AGENT, num_pools=DEFAULT_NUM_POOLS,
+                 image_cache=None, single_flight=False,
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, pool_block=False):
         super(APIClient, self).__init__()
 
         if tls and not base_url:
@@ -88,6 +115,10 @@ class APIClient(
         self.base_url = base_url
         self.timeout = timeout
         self.headers['User-Agent'] = user_agent
+        self.image_cache = image_cache
+        self.single_flight = SingleFlight() if single_flight else None
+        self.max_pool_size = max_pool_size
+        self.pool_block = pool_block
 
         self._auth_configs = auth.load_config()
 
@@ -96,7 +127,8 @@ class APIClient(
         )
         if base_url.startswith('http+unix://'):
             self._custom_adapter = UnixAdapter(
-                base_url, timeout, pool_connections=num_pools
+                base_url, timeout, pool_connections=num_pools,
+                pool_maxsize=max_pool_size, pool_block=pool_block
             )
             self.mount('http+docker://', self._custom_adapter)
             self._unmount('http://', 'https://')
@@ -108,7 +140,8 @@ class APIClient(
                 )
             try:
                 self._custom_adapter = NpipeAdapter(
-                    base_url, timeout, pool_connections=num_pools
+                    base_url, timeout, pool_connections=num_pools,
+                    pool_maxsize=max_pool_size, pool_block=pool_block
                 )
             except NameError:
                 raise DockerException(
@@ -117,14 +150,25 @@ class APIClient(
             self.mount('http+docker://', self._custom_adapter)
             self.base_url = 'http+docker://localnpipe'
         else:
+            self.mount('http://', TCPAdapter(
+                pool_connections=num_pools, pool_maxsize=max_pool_size,
+                pool_block=pool_block
+            ))
             # Use SSLAdapter for the ability to specify SSL version
             if isinstance(tls, TLSConfig):
                 tls.configure_client(self)
             elif tls:
                 self._custom_adapter = ssladapter.SSLAdapter(
-                    pool_connections=num_pools
+                    pool_connections=num_pools, pool_maxsize=max_pool_size,
+                    pool_block=pool_block
                 )
                 self.mount('https://', self._custom_adapter)
+            else:
+                # The default adapter of requests does not count connections
+                self.mount('https://', ssladapter.SSLAdapter(
+                    pool_connections=num_pools, pool_maxsize=max_pool_size,
+                    pool_block=pool_block
+                ))
             self.base_url = base_url
 
         # version detection needs to be after unix adapter mounting
@@ -214,11 +258,23 @@ class APIClient(
         self._raise_for_status(response)
 
         if json:
-            return response.json()
+            return json_loads(response.content)
         if binary:
             return response.content
         return response.text
 
+    def _get_json(self, url, **kwargs):
+        """GET ``url`` and decode the JSON response. Identical calls made
+        while one is in progress share its request, if single flight is
+        enabled. The request must be idempotent."""
+        def get():
+            return self._result(self._get(url, **kwargs), True)
+
+        if self.single_flight is None:
+            return get()
+        key = (url, json.dumps(kwargs, sort_keys=True, default=repr))
+        return self.single_flight.do(key, get)
+
     def _post_json(self, url, data, **kwargs):
         # Go <1.1 can't unserialize null to a string
         # so we do this disgusting thing here.
@@ -274,9 +330,13 @@ class APIClient(
 
         return sock
 
-    def _stream_helper(self, response, decode=False):
+    def _stream_helper(self, response, decode=False, buffered=False):
         """Generator for data coming from a chunked-encoded HTTP response."""
-        if response.raw._fp.chunked:
+        fp = getattr(response.raw._fp, 'fp', None)
+        if buffered and response.raw._fp.chunked and hasattr(fp, 'read1'):
+            for data in self._buffered_stream_helper(response, fp, decode):
+                yield data
+        elif response.raw._fp.chunked:
             reader = response.raw
             while not reader.closed:
                 # this read call will block until we get a chunk
@@ -294,7 +354,7 @@ class APIClient(
                     data_list = data.split("\r\n")
                     # load and yield each line seperately
                     for data in data_list:
-                        data = json.loads(data)
+                        data = json_loads(data)
                         yield data
                 else:
                     yield data
@@ -303,23 +363,47 @@ class APIClient(
             # encountered an error immediately
             yield self._result(response, json=decode)
 
-    def _multiplexed_buffer_helper(self, response):
-        """A generator of multiplexed data blocks read from a buffered
-        response."""
-        buf = self._result(response, binary=True)
-        walker = 0
+    def _buffered_stream_helper(self, response, fp, decode):
+        """Like :py:meth:`_stream_helper`, but reads large blocks from the
+        socket and parses the chunk framing itself. Yields decoded objects if
+        ``decode`` is set, raw blocks of data otherwise."""
+        blocks = self._read_chunked(response, fp)
+        if decode:
+            blocks = json_stream(blocks)
+        for data in blocks:
+            yield data
+
+    def _read_chunked(self, response, fp, chunk_size=DEFAULT_BLOCK_SIZE):
+        try:
+            for data in read_chunked(fp, chunk_size):
+                yield data
+        finally:
+            # The chunk framing was consumed behind httplib's back, so the
+            # connection can't be returned to the pool.
+            response.close()
+
+    def _raw_stream(self, response, chunk_size=DEFAULT_BLOCK_SIZE):
+        """A generator of the raw response body, yielding whatever has been
+        received, up to ``chunk_size`` bytes at a time."""
+        fp = getattr(response.raw._fp, 'fp', None)
+        if response.raw._fp.chunked and hasattr(fp, 'read1'):
+            return self._read_chunked(response, fp, chunk_size)
+        if hasattr(response.raw._fp, 'read1'):
+            # stream() would wait for chunk_size bytes to be received.
+            return self._read_available(response.raw._fp, chunk_size)
+        return response.raw.stream(chunk_size, decode_content=False)
+
+    def _read_available(self, fp, chunk_size):
         while True:
-            if len(buf[walker:]) < 8:
-                break
-            _, length = struct.unpack_from('>BxxxL', buf[walker:])
-            start = walker + STREAM_HEADER_SIZE_BYTES
-            end = start + length
-            walker = end
-            yield buf[start:end]
+            data = fp.read1(chunk_size)
+            if not data:
+                return
+            yield data
 
-    def _multiplexed_response_stream_helper(self, response):
+    def _multiplexed_response_stream_helper(self, response, demux=False):
         """A generator of multiplexed data blocks coming from a response
-        stream."""
+        stream. If ``demux`` is ``True``, each block is yielded as a
+        ``(stream, data)`` tuple."""
 
         # Disable timeout on the underlying socket to prevent
         # Read timed out(s) for long running processes
@@ -330,36 +414,64 @@ class APIClient(
             header = response.raw.read(STREAM_HEADER_SIZE_BYTES)
             if not header:
                 break
-            _, length = struct.unpack('>BxxxL', header)
+            stream, length = struct.unpack('>BxxxL', header)
             if not length:
                 continue
             data = response.raw.read(length)
             if not data:
                 break
-            yield data
+            yield (stream, data) if demux else data
 
     def _stream_raw_result_old(self, response):
         ''' Stream raw output for API versions below 1.6 '''
         self._raise_for_status(response)
-        for line in response.iter_lines(chunk_size=1,
-                                        decode_unicode=True):
+        for line in iter_lines(self._raw_stream(response)):
+            line = line.rstrip(b'\r')
             # filter out keep-alive new lines
             if line:
                 yield line
 
-    def _stream_raw_result(self, response):
-        ''' Stream result for TTY-enabled container above API 1.6 '''
+    def _stream_raw_result(self, response, chunk_size=DEFAULT_BLOCK_SIZE,
+                           decode=False):
+        ''' Stream result for TTY-enabled container above API 1.6. Yields
+        bytes as they are received, or text if ``decode`` is set. '''
         self._raise_for_status(response)
-        for out in response.iter_content(chunk_size=1, decode_unicode=True):
+        blocks = self._raw_stream(response, chunk_size)
+        if decode:
+            blocks = decode_blocks(blocks)
+        for out in blocks:
             yield out
 
-    def _read_from_socket(self, response, stream):
+    def _read_from_socket(self, response, stream, tty=False, demux=False,
+                          chunk_size=DEFAULT_BLOCK_SIZE, decode=False):
         socket = self._get_raw_response_socket(response)
+        # A container may stay quiet for longer than the timeout.
+        self._disable_socket_timeout(socket)
+
+        if tty:
+            frames = (
+                (STDOUT, data) for data in chunks_iter(socket, chunk_size)
+            )
+        else:
+            frames = frames_iter(socket, chunk_size)
 
         if stream:
-            return frames_iter(socket)
+            if decode:
+                frames = decode_frames(frames)
+            if demux:
+                return frames
+            return (data for _, data in frames)
+
+        sep = six.binary_type()
+        if not demux:
+            output = sep.join(data for _, data in frames)
         else:
-            return six.binary_type().join(frames_iter(socket))
+            out = []
+            err = []
+            for stream_id, data in frames:
+                (err if stream_id == STDERR else out).append(data)
+            output = sep.join(out), sep.join(err)
+        return decode_output(output) if decode else output
 
     def _disable_socket_timeout(self, socket):
         """ Depending on the combination of python version and whether we're
@@ -389,11 +501,19 @@ class APIClient(
 
             s.settimeout(None)
 
-    def _get_result(self, container, stream, res):
+    def _check_is_tty(self, container):
         cont = self.inspect_container(container)
-        return self._get_result_tty(stream, res, cont['Config']['Tty'])
+        return cont['Config']['Tty']
 
-    def _get_result_tty(self, stream, res, is_tty):
+    def _get_result(self, container, stream, res, demux=False,
+                    chunk_size=DEFAULT_BLOCK_SIZE, decode=False):
+        return self._get_result_tty(
+            stream, res, self._check_is_tty(container), demux, chunk_size,
+            decode
+        )
+
+    def _get_result_tty(self, stream, res, is_tty, demux=False,
+                        chunk_size=DEFAULT_BLOCK_SIZE, decode=False):
         # Stream multi-plexing was only introduced in API v1.6. Anything
         # before that needs old-style streaming.
         if utils.compare_version('1.6', self._version) < 0:
@@ -402,17 +522,28 @@ class APIClient(
         # We should also use raw streaming (without keep-alives)
         # if we're dealing with a tty-enabled container.
         if is_tty:
-            return self._stream_raw_result(res) if stream else \
-                self._result(res, binary=True)
-
-        self._raise_for_status(res)
-        sep = six.binary_type()
-        if stream:
-            return self._multiplexed_response_stream_helper(res)
+            if stream:
+                output = self._stream_raw_result(res, chunk_size, decode)
+                return ((STDOUT, x) for x in output) if demux else output
+            output = self._result(res, binary=True)
+            if demux:
+                output = output, six.binary_type()
         else:
-            return sep.join(
-                [x for x in self._multiplexed_buffer_helper(res)]
+            self._raise_for_status(res)
+            if stream:
+                # Frames are read whole, so chunk_size does not apply
+                if not decode:
+                    return self._multiplexed_response_stream_helper(
+                        res, demux
+                    )
+                frames = decode_frames(
+                    self._multiplexed_response_stream_helper(res, True)
+                )
+                return frames if demux else (data for _, data in frames)
+            output = demux_buffer(
+                self._result(res, binary=True), separate=demux
             )
+        return decode_output(output) if decode else output
 
     def _unmount(self, *args):
         for proto in args:
@@ -430,3 +561,12 @@ class APIClient(
     @property
     def api_version(self):
         return self._version
+
+    @property
+    def pool_metrics(self):
+        """
+        The :py:class:`~docker.transport.pool.PoolMetrics` of the
+        connections to the server, or ``None`` if the adapter mounted for
+        ``base_url`` does not count them.
+        """
+        return getattr(self.get_adapter(self.base_url), 'metrics', None)
@@ -4,13 +4,30 @@ from datetime import datetime
 
 from .. import errors
 from .. import utils
+from ..constants import DEFAULT_BLOCK_SIZE, DEFAULT_MAX_WORKERS
+from ..utils import batch
+from ..utils.archive import (
+    ProgressReader, extract_stream, read_blocks, rewrite_stream, stat_size
+)
 from ..utils.utils import create_networking_config, create_endpoint_config
 
 
+# The keys of the results of ``inspect_container`` which can be taken from
+# the summaries returned by ``containers``. The other keys the summaries
+# share with the results are in another format, like ``State``, which is a
+# string, or ``Created``, which is a timestamp.
+CONTAINER_SUMMARY_FIELDS = {
+    'Id': lambda summary: summary['Id'],
+    'Name': batch.container_name,
+    'Image': lambda summary: summary['ImageID'],
+}
+
+
 class ContainerApiMixin(object):
     @utils.check_resource
     def attach(self, container, stdout=True, stderr=True,
-               stream=False, logs=False):
+               stream=False, logs=False, demux=False,
+               chunk_size=DEFAULT_BLOCK_SIZE, decode=False):
         """
         Attach to a container.
 
@@ -25,12 +42,23 @@ class ContainerApiMixin(object):
             stream (bool): Return container output progressively as an iterator
                 of strings, rather than a single string.
             logs (bool): Include the container's previous output.
+            demux (bool): Keep stdout and stderr separate. Default ``False``.
+            chunk_size (int): The size of the reads from the socket.
+                Default: 64KiB
+            decode (bool): Return the output as text decoded from UTF-8,
+                rather than bytes. Default ``False``.
 
         Returns:
             By default, the container's output as a single string.
 
             If ``stream=True``, an iterator of output strings.
 
+            If ``demux=True``, a ``(stdout, stderr)`` tuple of strings, or
+            with ``stream=True`` an iterator of ``(stream, data)`` tuples,
+            where ``stream`` is ``1`` for stdout and ``2`` for stderr. Without
+            multiplexing (when a TTY is allocated), all output is stdout and
+            ``stderr`` is empty.
+
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
@@ -50,7 +78,12 @@ class ContainerApiMixin(object):
         u = self._url("/containers/{0}/attach", container)
         response = self._post(u, headers=headers, params=params, stream=stream)
 
-        return self._read_from_socket(response, stream)
+        # Telling stdout from stderr requires knowing whether the output is
+        # multiplexed, which costs an inspect.
+        tty = demux and self._check_is_tty(container)
+        return self._read_from_socket(
+            response, stream, tty, demux, chunk_size, decode
+        )
 
     @utils.check_resource
     def attach_socket(self, container, params=None, ws=False):
@@ -123,8 +156,10 @@ class ContainerApiMixin(object):
             'changes': changes
         }
         u = self._url("/commit")
-        return self._result(self._post_json(u, data=conf, params=params),
-                            json=True)
+        result = self._result(self._post_json(u, data=conf, params=params),
+                              json=True)
+        self._forget_tags([repository] if repository else [])
+        return result
 
     def containers(self, quiet=False, all=False, trunc=False, latest=False,
                    since=None, before=None, limit=-1, size=False,
@@ -227,6 +262,59 @@ class ContainerApiMixin(object):
         self._raise_for_status(res)
         return res.raw
 
+    @utils.check_resource
+    @utils.minimum_version('1.20')
+    def copy_archive(self, container, path, dest_container, dest_path,
+                     rename=None, progress=None,
+                     chunk_size=DEFAULT_BLOCK_SIZE):
+        """
+        Copy a file or folder from a container to another one, or to
+        another path of the same container. The archive retrieved with
+        :py:meth:`get_archive` is uploaded with :py:meth:`put_archive` as it
+        is received, with at most about ``chunk_size`` bytes of it in
+        memory, and is never written to the host's disk.
+
+        Args:
+            container (str): The container to copy from
+            path (str): Path to the file or folder to copy
+            dest_container (str): The container to copy to
+            dest_path (str): Path inside ``dest_container`` where the file
+                or folder will be extracted. Must exist.
+            rename (callable): Called with the name of each member of the
+                archive, returns its new name, or ``None`` to leave it out.
+                Names are relative to ``dest_path`` and start with the base
+                name of ``path``.
+            progress (callable): Called as ``progress(received, total)``
+                while the archive is copied, as with
+                :py:meth:`extract_archive`.
+            chunk_size (int): The size of the reads from the source
+                container.
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        params = {
+            'path': path
+        }
+        url = self._url('/containers/{0}/archive', container)
+        res = self._get(url, params=params, stream=True)
+        self._raise_for_status(res)
+        encoded_stat = res.headers.get('x-docker-container-path-stat')
+        stat = utils.decode_json_header(encoded_stat) if encoded_stat else None
+        reader = ProgressReader(res.raw, progress, stat_size(stat))
+        if rename is not None:
+            data = rewrite_stream(reader, rename, chunk_size)
+        else:
+            data = read_blocks(reader, chunk_size)
+        try:
+            return self.put_archive(dest_container, dest_path, data)
+        finally:
+            res.close()
+
     def create_container(self, image, command=None, hostname=None, user=None,
                          detach=False, stdin_open=False, tty=False,
                          mem_limit=None, ports=None, environment=None,
@@ -683,6 +771,51 @@ class ContainerApiMixin(object):
         self._raise_for_status(res)
         return res.raw
 
+    @utils.check_resource
+    @utils.minimum_version('1.20')
+    def extract_archive(self, container, path, dest=None, callback=None,
+                        progress=None, chunk_size=DEFAULT_BLOCK_SIZE):
+        """
+        Retrieve a file or folder from a container and extract it on the
+        host as it is received, holding only ``chunk_size`` bytes of the
+        archive in memory at a time.
+
+        Args:
+            container (str): The container where the file is located
+            path (str): Path to the file or folder to retrieve
+            dest (str): The directory to extract it into
+            callback (callable): Instead of extracting the archive, call
+                ``callback(member, f)`` with each of its members, as
+                described in :py:func:`docker.utils.archive.extract_stream`
+            progress (callable): Called as ``progress(received, total)``
+                while the archive is received, with the number of bytes
+                received so far. ``total`` is the size of ``path`` reported
+                by the daemon, which excludes the headers of the archive, or
+                ``None`` if ``path`` is a folder.
+            chunk_size (int): The size of the reads from the response.
+
+        Returns:
+            (dict): The ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        params = {
+            'path': path
+        }
+        url = self._url('/containers/{0}/archive', container)
+        res = self._get(url, params=params, stream=True)
+        self._raise_for_status(res)
+        encoded_stat = res.headers.get('x-docker-container-path-stat')
+        stat = utils.decode_json_header(encoded_stat) if encoded_stat else None
+        reader = ProgressReader(res.raw, progress, stat_size(stat))
+        try:
+            extract_stream(reader, dest, callback, chunk_size)
+        finally:
+            res.close()
+        return stat
+
     @utils.check_resource
     @utils.minimum_version('1.20')
     def get_archive(self, container, path):
@@ -730,9 +863,60 @@ class ContainerApiMixin(object):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self._result(
-            self._get(self._url("/containers/{0}/json", container)), True
-        )
+        return self._get_json(self._url("/containers/{0}/json", container))
+
+    def inspect_containers(self, containers, fields=None,
+                           max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Inspect several containers at once.
+
+        If all the ``fields`` needed are ``Id``, ``Name`` or ``Image``, which
+        the summaries returned by :py:meth:`containers` also give, the
+        containers are looked up with one or two filtered list requests, and
+        the results only have these three keys. Otherwise, each container is
+        inspected, with up to ``max_workers`` requests at a time.
+
+        Args:
+            containers (list): The IDs, short IDs or names of the
+                containers.
+            fields (list): The keys of the results the caller needs.
+                Default: all the keys returned by :py:meth:`inspect_container`.
+            max_workers (int): The number of containers inspected at the
+                same time. Default ``8``.
+
+        Returns:
+            (list): The results, in the order of ``containers``. A container
+            which could not be looked up has the
+            :py:class:`~docker.errors.DockerException` raised for it in place
+            of its result, like :py:class:`~docker.errors.NotFound`.
+        """
+        keys = [batch.resource_id(c) for c in containers]
+        if fields is None or not set(fields) <= set(CONTAINER_SUMMARY_FIELDS):
+            return batch.map_results(
+                self.inspect_container, keys, max_workers
+            )
+
+        def names(summary):
+            return [name.lstrip('/') for name in summary.get('Names') or []]
+
+        def not_found(key):
+            return errors.NotFound('No such container: {0}'.format(key))
+
+        ids = [k for k in keys if k and batch.HEX_RE.match(k)]
+        summaries = []
+        if ids:
+            summaries = self.containers(all=True, filters={'id': ids})
+        results = batch.match_summaries(keys, summaries, names, not_found)
+        missing = [
+            k for k, r in zip(keys, results) if isinstance(r, errors.NotFound)
+        ]
+        if missing:
+            # Hexadecimal names are not found by ID
+            summaries += self.containers(all=True, filters={'name': missing})
+            results = batch.match_summaries(
+                keys, summaries, names, not_found
+            )
+        return batch.from_summaries(results, CONTAINER_SUMMARY_FIELDS)
 
     @utils.check_resource
     def kill(self, container, signal=None):
@@ -759,7 +943,8 @@ class ContainerApiMixin(object):
 
     @utils.check_resource
     def logs(self, container, stdout=True, stderr=True, stream=False,
-             timestamps=False, tail='all', since=None, follow=None):
+             timestamps=False, tail='all', since=None, follow=None,
+             demux=False, chunk_size=DEFAULT_BLOCK_SIZE, decode=False):
         """
         Get logs from a container. Similar to the ``docker logs`` command.
 
@@ -778,9 +963,17 @@ class ContainerApiMixin(object):
             since (datetime or int): Show logs since a given datetime or
                 integer epoch (in seconds)
             follow (bool): Follow log output
+            demux (bool): Keep stdout and stderr separate. Default ``False``.
+            chunk_size (int): The size of the reads from the response when
+                streaming the output of a container with a TTY. Output
+                without a TTY is read one frame at a time. Default: 64KiB
+            decode (bool): Return the logs as text decoded from UTF-8,
+                rather than bytes. Default ``False``.
 
         Returns:
-            (generator or str)
+            (generator or str): If ``demux=True``, a ``(stdout, stderr)``
+            tuple, or a generator of ``(stream, data)`` tuples. See
+            :py:meth:`attach`.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -811,13 +1004,18 @@ class ContainerApiMixin(object):
                         params['since'] = since
             url = self._url("/containers/{0}/logs", container)
             res = self._get(url, params=params, stream=stream)
-            return self._get_result(container, stream, res)
+            return self._get_result(
+                container, stream, res, demux, chunk_size, decode
+            )
         return self.attach(
             container,
             stdout=stdout,
             stderr=stderr,
             stream=stream,
-            logs=True
+            logs=True,
+            demux=demux,
+            chunk_size=chunk_size,
+            decode=decode
         )
 
     @utils.check_resource
@@ -896,7 +1094,8 @@ class ContainerApiMixin(object):
             container (str): The container where the file(s) will be extracted
             path (str): Path inside the container where the file(s) will be
                 extracted. Must exist.
-            data (bytes): tar data to be extracted
+            data (bytes): tar data to be extracted. A file opened in binary
+                mode is sent with ``sendfile`` where the platform supports it.
 
         Returns:
             (bool): True if the call succeeds.
@@ -914,6 +1113,40 @@ class ContainerApiMixin(object):
         self._raise_for_status(res)
         return res.status_code == 200
 
+    @utils.check_resource
+    @utils.minimum_version('1.20')
+    def put_directory(self, container, path, src, exclude=None, gzip=False,
+                      gzip_workers=1, gzip_level=9):
+        """
+        Copy the contents of a local directory to an existing container,
+        with :py:meth:`put_archive`. The archive is created and, optionally,
+        compressed while it is uploaded.
+
+        Args:
+            container (str): The container to copy the files to
+            path (str): Path inside the container where the contents of
+                ``src`` will be extracted. Must exist.
+            src (str): Path to the local directory
+            exclude (list): ``.dockerignore`` style patterns of the files to
+                leave out
+            gzip (bool): Compress the archive with gzip
+            gzip_workers (int): The number of threads compressing the
+                archive. Default ``1``.
+            gzip_level (int): The gzip compression level, from 1 (fastest)
+                to 9 (best). Default ``9``.
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`~docker.errors.APIError` If an error occurs.
+        """
+        data = utils.tar_stream(
+            src, exclude=exclude, gzip=gzip, gzip_workers=gzip_workers,
+            gzip_level=gzip_level
+        )
+        return self.put_archive(container, path, data)
+
     @utils.check_resource
     def remove_container(self, container, v=False, link=False, force=False):
         """
@@ -1036,7 +1269,7 @@ class ContainerApiMixin(object):
 
     @utils.minimum_version('1.17')
     @utils.check_resource
-    def stats(self, container, decode=None, stream=True):
+    def stats(self, container, decode=None, stream=True, buffered=False):
         """
         Stream statistics for a specific container. Similar to the
         ``docker stats`` command.
@@ -1047,6 +1280,10 @@ class ContainerApiMixin(object):
                 on the fly. False by default.
             stream (bool): If set to false, only the current stats will be
                 returned instead of a stream. True by default.
+            buffered (bool): Read the response from the socket in large
+                blocks and parse the chunked encoding in the client. Much
+                faster on busy streams. Without ``decode``, each item may hold
+                several messages. Default ``False``.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -1056,7 +1293,7 @@ class ContainerApiMixin(object):
         url = self._url("/containers/{0}/stats", container)
         if stream:
             return self._stream_helper(self._get(url, stream=True),
-                                       decode=decode)
+                                       decode=decode, buffered=buffered)
         else:
             return self._result(self._get(url, params={'stream': False}),
                                 json=True)
@@ -7,7 +7,8 @@ from ..constants import INSECURE_REGISTRY_DEPRECATION_WARNING
 
 
 class DaemonApiMixin(object):
-    def events(self, since=None, until=None, filters=None, decode=None):
+    def events(self, since=None, until=None, filters=None, decode=None,
+               buffered=False):
         """
         Get real-time events from the server. Similar to the ``docker events``
         command.
@@ -18,6 +19,10 @@ class DaemonApiMixin(object):
             filters (dict): Filter the events by event time, container or image
             decode (bool): If set to true, stream will be decoded into dicts on
                 the fly. False by default.
+            buffered (bool): Read the response from the socket in large
+                blocks and parse the chunked encoding in the client. Much
+                faster on busy streams. Without ``decode``, each item may hold
+                several messages. Default ``False``.
 
         Returns:
             (generator): A blocking generator you can iterate over to retrieve
@@ -55,7 +60,7 @@ class DaemonApiMixin(object):
 
         return self._stream_helper(
             self.get(self._url('/events'), params=params, stream=True),
-            decode=decode
+            decode=decode, buffered=buffered
         )
 
     def info(self):
@@ -2,6 +2,7 @@ import six
 
 from .. import errors
 from .. import utils
+from ..constants import DEFAULT_BLOCK_SIZE
 
 
 class ExecApiMixin(object):
@@ -98,7 +99,8 @@ class ExecApiMixin(object):
 
     @utils.minimum_version('1.15')
     def exec_start(self, exec_id, detach=False, tty=False, stream=False,
-                   socket=False):
+                   socket=False, demux=False, chunk_size=DEFAULT_BLOCK_SIZE,
+                   decode=False):
         """
         Start a previously set up exec instance.
 
@@ -108,11 +110,20 @@ class ExecApiMixin(object):
                 Default: False
             tty (bool): Allocate a pseudo-TTY. Default: False
             stream (bool): Stream response data. Default: False
+            demux (bool): Keep stdout and stderr separate. Default: False
+            chunk_size (int): The size of the reads from the socket.
+                Default: 64KiB
+            decode (bool): Return the output as text decoded from UTF-8,
+                rather than bytes. Default: False
 
         Returns:
             (generator or str): If ``stream=True``, a generator yielding
             response chunks. A string containing response data otherwise.
 
+            If ``demux=True``, a ``(stdout, stderr)`` tuple, or a generator
+            of ``(stream, data)`` tuples. See
+            :py:meth:`~docker.api.container.ContainerApiMixin.attach`.
+
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
@@ -140,4 +151,6 @@ class ExecApiMixin(object):
 
         if socket:
             return self._get_raw_response_socket(res)
-        return self._read_from_socket(res, stream)
+        return self._read_from_socket(
+            res, stream, tty, demux, chunk_size, decode
+        )
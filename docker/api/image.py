@@ -5,10 +5,30 @@ import warnings
 import six
 
 from .. import auth, errors, utils
-from ..constants import INSECURE_REGISTRY_DEPRECATION_WARNING
+from ..constants import (
+    DEFAULT_MAX_WORKERS, INSECURE_REGISTRY_DEPRECATION_WARNING
+)
+from ..utils import batch
 
 log = logging.getLogger(__name__)
 
+# The keys of the results of ``inspect_image`` which can be taken from the
+# summaries returned by ``images``. The summaries give ``Created`` as a
+# timestamp and ``Labels`` at the top level, and name untagged images
+# ``<none>:<none>``.
+IMAGE_SUMMARY_FIELDS = {
+    'Id': lambda summary: summary['Id'],
+    'Parent': lambda summary: summary.get('ParentId', ''),
+    'RepoTags': lambda summary: [
+        t for t in summary.get('RepoTags') or [] if t != '<none>:<none>'
+    ],
+    'RepoDigests': lambda summary: [
+        d for d in summary.get('RepoDigests') or [] if d != '<none>@<none>'
+    ],
+    'Size': lambda summary: summary['Size'],
+    'VirtualSize': lambda summary: summary['VirtualSize'],
+}
+
 
 class ImageApiMixin(object):
 
@@ -54,8 +74,19 @@ class ImageApiMixin(object):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        res = self._get(self._url("/images/{0}/history", image))
-        return self._result(res, True)
+        cache = self.image_cache
+        if cache is not None:
+            image_id = self._resolve_image_id(image)
+            result = cache.get('history', image_id)
+            if result is not None:
+                return result
+            # Ask for the image that was resolved, in case the name has
+            # moved to another one since.
+            image = image_id
+        result = self._get_json(self._url("/images/{0}/history", image))
+        if cache is not None:
+            cache.put('history', image, result)
+        return result
 
     def images(self, name=None, quiet=False, all=False, viz=False,
                filters=None):
@@ -131,22 +162,19 @@ class ImageApiMixin(object):
         headers = {'Content-Type': 'application/tar'}
 
         if image or params.get('fromSrc') != '-':  # from image or URL
-            return self._result(
-                self._post(u, data=None, params=params)
-            )
+            res = self._post(u, data=None, params=params)
         elif isinstance(src, six.string_types):  # from file path
             with open(src, 'rb') as f:
-                return self._result(
-                    self._post(
-                        u, data=f, params=params, headers=headers, timeout=None
-                    )
+                res = self._post(
+                    u, data=f, params=params, headers=headers, timeout=None
                 )
         else:  # from raw data
             if stream_src:
                 headers['Transfer-Encoding'] = 'chunked'
-            return self._result(
-                self._post(u, data=src, params=params, headers=headers)
-            )
+            res = self._post(u, data=src, params=params, headers=headers)
+        result = self._result(res)
+        self._forget_tags([repository] if repository else [])
+        return result
 
     def import_image_from_data(self, data, repository=None, tag=None,
                                changes=None):
@@ -165,11 +193,13 @@ class ImageApiMixin(object):
             repository, tag, src='-', changes=changes
         )
         headers = {'Content-Type': 'application/tar'}
-        return self._result(
+        result = self._result(
             self._post(
                 u, data=data, params=params, headers=headers, timeout=None
             )
         )
+        self._forget_tags([repository] if repository else [])
+        return result
 
     def import_image_from_file(self, filename, repository=None, tag=None,
                                changes=None):
@@ -247,6 +277,9 @@ class ImageApiMixin(object):
         Get detailed information about an image. Similar to the ``docker
         inspect`` command, but only for containers.
 
+        If the client has an ``image_cache``, the result is looked up in it
+        first.
+
         Args:
             container (str): The container to inspect
 
@@ -258,9 +291,84 @@ class ImageApiMixin(object):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self._result(
-            self._get(self._url("/images/{0}/json", image)), True
+        cache = self.image_cache
+        if cache is not None:
+            result = cache.get('inspect', image)
+            if result is not None:
+                return result
+        result = self._get_json(self._url("/images/{0}/json", image))
+        if cache is not None:
+            cache.put('inspect', result['Id'], result, name=image)
+        return result
+
+    def inspect_images(self, images, fields=None,
+                       max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Inspect several images at once.
+
+        If all the ``fields`` needed are among ``Id``, ``Parent``,
+        ``RepoTags``, ``RepoDigests``, ``Size`` and ``VirtualSize``, which
+        the summaries returned by :py:meth:`images` also give, the images
+        named by a reference are looked up with one list request filtered
+        by ``reference``, and the results only have these keys. The other
+        images, like those given by ID, are inspected, with up to
+        ``max_workers`` requests at a time.
+
+        Args:
+            images (list): The IDs, short IDs or names of the images.
+            fields (list): The keys of the results the caller needs.
+                Default: all the keys returned by :py:meth:`inspect_image`.
+            max_workers (int): The number of images inspected at the same
+                time. Default ``8``.
+
+        Returns:
+            (list): The results, in the order of ``images``. An image which
+            could not be looked up has the
+            :py:class:`~docker.errors.DockerException` raised for it in place
+            of its result, like :py:class:`~docker.errors.ImageNotFound`.
+        """
+        keys = [batch.resource_id(i) for i in images]
+        if fields is None or not set(fields) <= set(IMAGE_SUMMARY_FIELDS):
+            return batch.map_results(self.inspect_image, keys, max_workers)
+
+        def names(summary):
+            for name in summary.get('RepoTags') or []:
+                yield name
+                if name.endswith(':latest'):
+                    yield name[:-len(':latest')]
+            for name in summary.get('RepoDigests') or []:
+                yield name
+
+        def not_found(key):
+            return errors.ImageNotFound('No such image: {0}'.format(key))
+
+        def inspect(key):
+            result = self.inspect_image(key)
+            return dict((k, result.get(k)) for k in IMAGE_SUMMARY_FIELDS)
+
+        # The reference filter does not match IDs, and a list which is not
+        # of all images cannot tell whether an ID prefix is unique.
+        references = [k for k in keys if k and not batch.HEX_RE.match(k)]
+        results = dict((k, not_found(k)) for k in keys if k)
+        if references and utils.version_gte(self._version, '1.25'):
+            summaries = self.images(filters={'reference': references})
+            found = batch.from_summaries(
+                batch.match_summaries(references, summaries, names, not_found),
+                IMAGE_SUMMARY_FIELDS
+            )
+            results.update(zip(references, found))
+        missing = [
+            k for k, r in results.items() if isinstance(r, errors.NotFound)
+        ]
+        results.update(
+            zip(missing, batch.map_results(inspect, missing, max_workers))
         )
+        return [
+            results[k] if k else errors.NullResource(
+                'image or container param is undefined'
+            )
+            for k in keys
+        ]
 
     def load_image(self, data):
         """
@@ -269,13 +377,17 @@ class ImageApiMixin(object):
         save``). Similar to ``docker load``.
 
         Args:
-            data (binary): Image data to be loaded.
+            data (binary): Image data to be loaded. A file opened in binary
+                mode is sent with ``sendfile`` where the platform supports it.
         """
         res = self._post(self._url("/images/load"), data=data)
         self._raise_for_status(res)
+        # The images loaded may have any tags.
+        self._forget_tags()
 
     def pull(self, repository, tag=None, stream=False,
-             insecure_registry=False, auth_config=None, decode=False):
+             insecure_registry=False, auth_config=None, decode=False,
+             buffered=False):
         """
         Pulls an image. Similar to the ``docker pull`` command.
 
@@ -288,6 +400,12 @@ class ImageApiMixin(object):
                 :py:meth:`~docker.api.daemon.DaemonApiMixin.login` has set for
                 this request. ``auth_config`` should contain the ``username``
                 and ``password`` keys to be valid.
+            decode (bool): Decode the JSON data from the server into dicts.
+                Only applies with ``stream=True``
+            buffered (bool): Read the response from the socket in large
+                blocks and parse the chunked encoding in the client. Much
+                faster on busy streams. Without ``decode``, each item may hold
+                several messages. Default ``False``.
 
         Returns:
             (generator or str): The output
@@ -345,12 +463,17 @@ class ImageApiMixin(object):
         self._raise_for_status(response)
 
         if stream:
-            return self._stream_helper(response, decode=decode)
+            return self._forget_tags_after(self._stream_helper(
+                response, decode=decode, buffered=buffered
+            ), [repository])
 
-        return self._result(response)
+        result = self._result(response)
+        self._forget_tags([repository])
+        return result
 
     def push(self, repository, tag=None, stream=False,
-             insecure_registry=False, auth_config=None, decode=False):
+             insecure_registry=False, auth_config=None, decode=False,
+             buffered=False):
         """
         Push an image or a repository to the registry. Similar to the ``docker
         push`` command.
@@ -365,6 +488,12 @@ class ImageApiMixin(object):
                 :py:meth:`~docker.api.daemon.DaemonApiMixin.login` has set for
                 this request. ``auth_config`` should contain the ``username``
                 and ``password`` keys to be valid.
+            decode (bool): Decode the JSON data from the server into dicts.
+                Only applies with ``stream=True``
+            buffered (bool): Read the response from the socket in large
+                blocks and parse the chunked encoding in the client. Much
+                faster on busy streams. Without ``decode``, each item may hold
+                several messages. Default ``False``.
 
         Returns:
             (generator or str): The output from the server.
@@ -414,7 +543,9 @@ class ImageApiMixin(object):
         self._raise_for_status(response)
 
         if stream:
-            return self._stream_helper(response, decode=decode)
+            return self._stream_helper(
+                response, decode=decode, buffered=buffered
+            )
 
         return self._result(response)
 
@@ -429,8 +560,19 @@ class ImageApiMixin(object):
             noprune (bool): Do not delete untagged parents
         """
         params = {'force': force, 'noprune': noprune}
+        cache = self.image_cache
+        if cache is not None:
+            # The name may be gone, or have expired from the cache, by the
+            # time the image's entries are invalidated.
+            image_id = self._resolve_image_id(image)
         res = self._delete(self._url("/images/{0}", image), params=params)
         self._raise_for_status(res)
+        if cache is not None:
+            cache.invalidate(image)
+            cache.invalidate(image_id)
+            for item in self._result(res, True) or []:
+                if item.get('Deleted'):
+                    cache.invalidate(item['Deleted'])
 
     def search(self, term):
         """
@@ -476,10 +618,43 @@ class ImageApiMixin(object):
             'force': 1 if force else 0
         }
         url = self._url("/images/{0}/tag", image)
+        cache = self.image_cache
+        if cache is not None:
+            image_id = self._resolve_image_id(image)
         res = self._post(url, params=params)
         self._raise_for_status(res)
+        if cache is not None:
+            cache.invalidate(image_id)
+        self._forget_tags([repository])
         return res.status_code == 201
 
+    def _forget_tags(self, repositories=None):
+        # Tags of ``repositories``, or of any repository, may now refer to
+        # other images than those the image cache knows.
+        if self.image_cache is not None:
+            self.image_cache.forget_tags(repositories)
+
+    def _forget_tags_after(self, stream, repositories=None):
+        # Tags are only moved once the progress stream of the operation
+        # moving them is over.
+        if self.image_cache is None:
+            return stream
+        return self._forget_tags_when_done(stream, repositories)
+
+    def _forget_tags_when_done(self, stream, repositories):
+        try:
+            for item in stream:
+                yield item
+        finally:
+            self._forget_tags(repositories)
+
+    def _resolve_image_id(self, image):
+        # The full ID of an image, from the image cache or the server.
+        image_id = self.image_cache.resolve(image)
+        if image_id is None:
+            image_id = self.inspect_image(image)['Id']
+        return image_id
+
 
 def is_file(src):
     try:
@@ -142,8 +142,7 @@ class NetworkApiMixin(object):
             net_id (str): ID of network
         """
         url = self._url("/networks/{0}", net_id)
-        res = self._get(url)
-        return self._result(res, json=True)
+        return self._get_json(url)
 
     @check_resource
     @minimum_version('1.21')
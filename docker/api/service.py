@@ -83,7 +83,7 @@ class ServiceApiMixin(object):
                 If the server returns an error.
         """
         url = self._url('/services/{0}', service)
-        return self._result(self._get(url), True)
+        return self._get_json(url)
 
     @utils.minimum_version('1.24')
     @utils.check_resource
@@ -102,7 +102,7 @@ class ServiceApiMixin(object):
                 If the server returns an error.
         """
         url = self._url('/tasks/{0}', task)
-        return self._result(self._get(url), True)
+        return self._get_json(url)
 
     @utils.minimum_version('1.24')
     @utils.check_resource
@@ -114,7 +114,7 @@ class SwarmApiMixin(object):
                 If the server returns an error.
         """
         url = self._url('/swarm')
-        return self._result(self._get(url), True)
+        return self._get_json(url)
 
     @utils.check_resource
     @utils.minimum_version('1.24')
@@ -133,7 +133,7 @@ class SwarmApiMixin(object):
                 If the server returns an error.
         """
         url = self._url('/nodes/{0}', node_id)
-        return self._result(self._get(url), True)
+        return self._get_json(url)
 
     @utils.minimum_version('1.24')
     def join_swarm(self, remote_addrs, join_token, listen_addr=None,
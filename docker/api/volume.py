@@ -112,7 +112,7 @@ class VolumeApiMixin(object):
 
         """
         url = self._url('/volumes/{0}', name)
-        return self._result(self._get(url), True)
+        return self._get_json(url)
 
     @utils.minimum_version('1.21')
     def remove_volume(self, name):
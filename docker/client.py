@@ -29,6 +29,8 @@ class Client(object):
             :py:class:`~docker.tls.TLSConfig` object to use custom
             configuration.
         user_agent (str): Set a custom user agent for requests to the server.
+        image_cache (:py:class:`~docker.utils.image_cache.ImageCache`): A
+            cache for the results of inspecting images.
     """
     def __init__(self, *args, **kwargs):
         self.api = APIClient(*args, **kwargs)
@@ -62,6 +64,8 @@ class Client(object):
             assert_hostname (bool): Verify the hostname of the server.
             environment (dict): The environment to read environment variables
                 from. Default: the value of ``os.environ``
+            image_cache (:py:class:`~docker.utils.image_cache.ImageCache`): A
+                cache for the results of inspecting images.
 
         Example:
 
@@ -73,7 +77,8 @@ class Client(object):
         """
         timeout = kwargs.pop('timeout', None)
         version = kwargs.pop('version', None)
-        return cls(timeout=timeout, version=version,
+        image_cache = kwargs.pop('image_cache', None)
+        return cls(timeout=timeout, version=version, image_cache=image_cache,
                    **kwargs_from_env(**kwargs))
 
     # Resources
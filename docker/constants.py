@@ -17,3 +17,7 @@ IS_WINDOWS_PLATFORM = (sys.platform == 'win32')
 
 DEFAULT_USER_AGENT = "docker-py/{0}".format(version)
 DEFAULT_NUM_POOLS = 25
+DEFAULT_MAX_POOL_SIZE = 10
+# Kept below DEFAULT_MAX_POOL_SIZE so that every worker gets a connection
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BLOCK_SIZE = 64 * 1024
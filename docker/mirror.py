@@ -0,0 +1,412 @@
+import collections
+import logging
+import socket
+import threading
+
+import six
+
+from . import errors
+
+log = logging.getLogger(__name__)
+
+# Container events which do not change the summary of the container
+_CONTAINER_NOOP_ACTIONS = frozenset([
+    'archive-path', 'attach', 'commit', 'copy', 'detach', 'exec_create',
+    'exec_detach', 'exec_die', 'exec_start', 'export', 'extract-to-dir',
+    'resize', 'top',
+])
+_IMAGE_NOOP_ACTIONS = frozenset(['push', 'save'])
+
+
+def _container_fields(container):
+    for name in container.get('Names') or []:
+        yield 'name', name.lstrip('/')
+    yield 'image', container.get('Image')
+    yield 'image', container.get('ImageID')
+    yield 'status', container.get('State')
+    for item in _label_fields(container):
+        yield item
+    networks = (container.get('NetworkSettings') or {}).get('Networks')
+    for name, network in six.iteritems(networks or {}):
+        yield 'network', name
+        yield 'network', (network or {}).get('NetworkID')
+
+
+def _image_fields(image):
+    for tag in image.get('RepoTags') or []:
+        if tag == '<none>:<none>':
+            continue
+        yield 'name', tag
+        yield 'name', tag.rsplit(':', 1)[0]
+    for item in _label_fields(image):
+        yield item
+
+
+def _named_fields(obj):
+    yield 'name', obj.get('Name')
+    for item in _label_fields(obj):
+        yield item
+
+
+def _label_fields(obj):
+    for key, value in six.iteritems(obj.get('Labels') or {}):
+        yield 'label', key
+        yield 'label', '{0}={1}'.format(key, value)
+
+
+class _Store(object):
+    """Objects by ID, with an index of the values of their fields."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.objects = {}
+        self.index = collections.defaultdict(
+            lambda: collections.defaultdict(set)
+        )
+        self._entries = {}
+
+    def put(self, key, obj):
+        self.remove(key)
+        entries = [(f, v) for f, v in self.fields(obj) if v is not None]
+        for field, value in entries:
+            self.index[field][value].add(key)
+        self.objects[key] = obj
+        self._entries[key] = entries
+
+    def remove(self, key):
+        self.objects.pop(key, None)
+        for field, value in self._entries.pop(key, ()):
+            keys = self.index[field][value]
+            keys.discard(key)
+            if not keys:
+                del self.index[field][value]
+
+    def replace(self, objects):
+        self.objects.clear()
+        self.index.clear()
+        self._entries.clear()
+        for key, obj in objects:
+            self.put(key, obj)
+
+    def find(self, filters):
+        keys = None
+        for field, values in six.iteritems(filters):
+            if values is None:
+                continue
+            if isinstance(values, six.string_types):
+                values = [values]
+            for value in values:
+                if field == 'id':
+                    matches = set([value]) if value in self.objects else set()
+                else:
+                    matches = self.index[field].get(value, set())
+                keys = matches if keys is None else keys & matches
+        if keys is None:
+            return list(self.objects.values())
+        return [self.objects[key] for key in keys]
+
+
+class StateMirror(object):
+    """
+    An in-memory copy of the containers, images, networks and volumes of a
+    daemon, kept up to date from its events, so that they can be queried
+    without making requests.
+
+    It is loaded from one list of each type of object, then each event
+    updates the object it is about. If the event stream is interrupted, the
+    mirror is loaded again from scratch once the stream is reopened.
+
+    The objects are those returned by the list endpoints, like
+    :py:meth:`~docker.api.container.ContainerApiMixin.containers`, and must
+    not be modified.
+
+    Args:
+        client (:py:class:`~docker.api.client.APIClient`): The client to
+            the daemon to mirror.
+        retry_interval (float): The number of seconds to wait before
+            reopening an interrupted event stream.
+
+    Attributes:
+        resyncs (int): The number of times the mirror has been loaded again
+            after the event stream was interrupted.
+
+    Example:
+
+        >>> with StateMirror(client) as mirror:
+        ...     mirror.wait_ready()
+        ...     mirror.containers(status='running', label='app=web')
+    """
+    def __init__(self, client, retry_interval=1):
+        self.client = getattr(client, 'api', client)
+        self.retry_interval = retry_interval
+        self.resyncs = 0
+        self._lock = threading.RLock()
+        self._stores = {
+            'container': _Store(_container_fields),
+            'image': _Store(_image_fields),
+            'network': _Store(_named_fields),
+            'volume': _Store(_named_fields),
+        }
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._response = None
+        self._thread = None
+
+    def start(self):
+        """
+        Load the mirror and keep it up to date in a background thread.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop following the events of the daemon.
+        """
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            _shutdown(self.client, response)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait_ready(self, timeout=None):
+        """
+        Wait until the mirror has been loaded.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            (bool): Whether the mirror is loaded.
+        """
+        return self._ready.wait(timeout)
+
+    def sync(self):
+        """
+        Load all the objects from the daemon again.
+        """
+        containers = self.client.containers(all=True)
+        images = self.client.images()
+        networks = self.client.networks()
+        volumes = self.client.volumes().get('Volumes') or []
+        with self._lock:
+            self._stores['container'].replace((c['Id'], c) for c in containers)
+            self._stores['image'].replace((i['Id'], i) for i in images)
+            self._stores['network'].replace((n['Id'], n) for n in networks)
+            self._stores['volume'].replace((v['Name'], v) for v in volumes)
+
+    def containers(self, id=None, name=None, image=None, status=None,
+                   network=None, label=None):
+        """
+        Find containers in the mirror. Every criterion given must match.
+
+        Args:
+            id (str): The full ID of the container.
+            name (str): One of the names of the container.
+            image (str): The image of the container, as it was given when
+                creating it, or its ID.
+            status (str): The state of the container, like ``running``.
+            network (str): The name or ID of a network the container is
+                connected to.
+            label (str or list): Labels of the container, as ``key`` or
+                ``key=value``.
+
+        Returns:
+            (list): The summaries of the containers.
+        """
+        return self._find('container', id=id, name=name, image=image,
+                          status=status, network=network, label=label)
+
+    def images(self, id=None, name=None, label=None):
+        """
+        Find images in the mirror. Every criterion given must match.
+
+        Args:
+            id (str): The full ID of the image.
+            name (str): A tag of the image, as ``repository:tag``, or its
+                repository.
+            label (str or list): Labels of the image, as ``key`` or
+                ``key=value``.
+
+        Returns:
+            (list): The summaries of the images.
+        """
+        return self._find('image', id=id, name=name, label=label)
+
+    def networks(self, id=None, name=None, label=None):
+        """
+        Find networks in the mirror, by full ``id``, ``name`` or
+        ``label``.
+
+        Returns:
+            (list): The networks.
+        """
+        return self._find('network', id=id, name=name, label=label)
+
+    def volumes(self, name=None, label=None):
+        """
+        Find volumes in the mirror, by ``name`` or ``label``.
+
+        Returns:
+            (list): The volumes.
+        """
+        return self._find('volume', id=name, label=label)
+
+    def apply(self, event):
+        """
+        Update the mirror, and the ``image_cache`` of the client if it has
+        one, from a decoded event. An error refreshing the object the event
+        is about, like one removed since, is logged and the event skipped.
+        """
+        try:
+            self._apply(event)
+        except errors.DockerException as e:
+            log.warning('Cannot apply event %r: %s', event, e)
+
+    def _apply(self, event):
+        kind = event.get('Type', 'container')
+        action = (event.get('Action') or event.get('status') or '')
+        action = action.split(':', 1)[0]
+        actor = event.get('Actor') or {}
+        key = actor.get('ID') or event.get('id')
+
+        if kind == 'container':
+            if action == 'destroy':
+                with self._lock:
+                    self._stores['container'].remove(key)
+            elif action not in _CONTAINER_NOOP_ACTIONS:
+                self._refresh_container(key)
+        elif kind == 'image':
+            cache = getattr(self.client, 'image_cache', None)
+            if cache is not None:
+                cache.apply(event)
+            if action == 'delete':
+                with self._lock:
+                    self._stores['image'].remove(key)
+            elif action not in _IMAGE_NOOP_ACTIONS:
+                self._refresh_image(key)
+        elif kind == 'network':
+            if action in ('destroy', 'remove'):
+                with self._lock:
+                    self._stores['network'].remove(key)
+            else:
+                self._refresh_network(key)
+                container = (actor.get('Attributes') or {}).get('container')
+                if container:
+                    self._refresh_container(container)
+        elif kind == 'volume':
+            if action == 'destroy':
+                with self._lock:
+                    self._stores['volume'].remove(key)
+            elif action == 'create':
+                volume = self.client.inspect_volume(key)
+                with self._lock:
+                    self._stores['volume'].put(key, volume)
+
+    def _find(self, kind, **filters):
+        with self._lock:
+            return self._stores[kind].find(filters)
+
+    def _refresh_container(self, key):
+        found = [
+            c for c in self.client.containers(all=True, filters={'id': key})
+            if c['Id'] == key
+        ]
+        with self._lock:
+            if found:
+                self._stores['container'].put(key, found[0])
+            else:
+                self._stores['container'].remove(key)
+
+    def _refresh_image(self, key):
+        # Only the tags and digests of an image change. key is a name for
+        # some events, like pull.
+        try:
+            image = self.client.inspect_image(key)
+        except errors.NotFound:
+            return
+        image_id = image['Id']
+        tags = image.get('RepoTags') or []
+        with self._lock:
+            summary = self._stores['image'].objects.get(image_id)
+        if summary is None:
+            # The list of images cannot be filtered by ID.
+            found = [
+                i for i in self.client.images(name=tags[0] if tags else None)
+                if i['Id'] == image_id
+            ]
+            if not found:
+                return
+            summary = found[0]
+        summary = dict(
+            summary, RepoTags=tags or ['<none>:<none>'],
+            RepoDigests=image.get('RepoDigests') or ['<none>@<none>']
+        )
+        with self._lock:
+            store = self._stores['image']
+            # The image may have taken tags from others.
+            for tag in tags:
+                for other in store.find({'name': tag}):
+                    if other['Id'] == image_id:
+                        continue
+                    left = [t for t in other['RepoTags'] if t != tag]
+                    store.put(other['Id'], dict(
+                        other, RepoTags=left or ['<none>:<none>']
+                    ))
+            store.put(image_id, summary)
+
+    def _refresh_network(self, key):
+        found = [n for n in self.client.networks(ids=[key]) if n['Id'] == key]
+        with self._lock:
+            if found:
+                self._stores['network'].put(key, found[0])
+            else:
+                self._stores['network'].remove(key)
+
+    def _run(self):
+        first = True
+        while not self._stopped.is_set():
+            try:
+                # The stream is opened before loading the objects, so that
+                # no change made in the meantime is missed.
+                # The daemon may send no event for longer than the client
+                # timeout, which must not end the stream.
+                self._response = self.client._get(
+                    self.client._url('/events'), stream=True, timeout=None
+                )
+                self.client._raise_for_status(self._response)
+                if not first:
+                    self.resyncs += 1
+                self.sync()
+                first = False
+                self._ready.set()
+                for event in self.client._stream_helper(
+                        self._response, decode=True, buffered=True):
+                    self.apply(event)
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                log.warning('Event stream interrupted: %s', e)
+            finally:
+                self._response = None
+            self._stopped.wait(self.retry_interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def _shutdown(client, response):
+    try:
+        sock = client._get_raw_response_socket(response)
+        sock = getattr(sock, '_sock', sock)
+        sock.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, errors.DockerException, socket.error):
+        response.close()
@@ -1,19 +1,22 @@
 import copy
 
+from ..constants import DEFAULT_BLOCK_SIZE, DEFAULT_MAX_WORKERS
 from ..errors import (ContainerError, ImageNotFound,
                       create_unexpected_kwargs_error)
-from ..utils import create_host_config
+from ..utils import batch, create_host_config
+from ..utils.archive import save_response
 from .images import Image
 from .resource import Collection, Model
 
 
 class Container(Model):
-
     @property
     def name(self):
         """
         The name of the container.
         """
+        if not self.hydrated and self.summary.get('Names'):
+            return batch.container_name(self.summary).lstrip('/')
         if self.attrs.get('Name') is not None:
             return self.attrs['Name'].lstrip('/')
 
@@ -22,6 +25,8 @@ class Container(Model):
         """
         The status of the container. For example, ``running``, or ``exited``.
         """
+        if not self.hydrated and self.summary.get('State'):
+            return self.summary['State']
         return self.attrs['State']['Status']
 
     def attach(self, **kwargs):
@@ -38,12 +43,23 @@ class Container(Model):
             stream (bool): Return container output progressively as an iterator
                 of strings, rather than a single string.
             logs (bool): Include the container's previous output.
+            demux (bool): Keep stdout and stderr separate. Default ``False``.
+            chunk_size (int): The size of the reads from the socket.
+                Default: 64KiB
+            decode (bool): Return the output as text decoded from UTF-8,
+                rather than bytes. Default ``False``.
 
         Returns:
             By default, the container's output as a single string.
 
             If ``stream=True``, an iterator of output strings.
 
+            If ``demux=True``, a ``(stdout, stderr)`` tuple of strings, or
+            with ``stream=True`` an iterator of ``(stream, data)`` tuples,
+            where ``stream`` is ``1`` for stdout and ``2`` for stderr. Without
+            multiplexing (when a TTY is allocated), all output is stdout and
+            ``stderr`` is empty.
+
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
@@ -91,6 +107,36 @@ class Container(Model):
                                       **kwargs)
         return self.client.images.get(resp['Id'])
 
+    def copy_archive(self, path, dest_container, dest_path, **kwargs):
+        """
+        Copy a file or folder from this container to another one, streaming
+        it from one to the other without staging it on the host.
+
+        Args:
+            path (str): Path to the file or folder to copy
+            dest_container (:py:class:`Container` or str): The container to
+                copy to
+            dest_path (str): Path inside ``dest_container`` where the file
+                or folder will be extracted. Must exist.
+            rename (callable): Called with the name of each member of the
+                archive, returns its new name, or ``None`` to leave it out.
+            progress (callable): Called as ``progress(received, total)``
+                while the archive is copied
+            chunk_size (int): The size of the reads from this container.
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if isinstance(dest_container, Container):
+            dest_container = dest_container.id
+        return self.client.api.copy_archive(
+            self.id, path, dest_container, dest_path, **kwargs
+        )
+
     def diff(self):
         """
         Inspect changes on a container's filesystem.
@@ -106,7 +152,8 @@ class Container(Model):
 
     def exec_run(self, cmd, stdout=True, stderr=True, stdin=False, tty=False,
                  privileged=False, user='', detach=False, stream=False,
-                 socket=False):
+                 socket=False, demux=False, chunk_size=DEFAULT_BLOCK_SIZE,
+                 decode=False):
         """
         Run a command inside this container. Similar to
         ``docker exec``.
@@ -123,11 +170,19 @@ class Container(Model):
                 Default: False
             tty (bool): Allocate a pseudo-TTY. Default: False
             stream (bool): Stream response data. Default: False
+            demux (bool): Keep stdout and stderr separate. Default: False
+            chunk_size (int): The size of the reads from the socket.
+                Default: 64KiB
+            decode (bool): Return the output as text decoded from UTF-8,
+                rather than bytes. Default: False
 
         Returns:
             (generator or str): If ``stream=True``, a generator yielding
             response chunks. A string containing response data otherwise.
 
+            If ``demux=True``, a ``(stdout, stderr)`` tuple, or a generator
+            of ``(stream, data)`` tuples. See :py:meth:`attach`.
+
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
@@ -137,7 +192,8 @@ class Container(Model):
             privileged=privileged, user=user
         )
         return self.client.api.exec_start(
-            resp['Id'], detach=detach, tty=tty, stream=stream, socket=socket
+            resp['Id'], detach=detach, tty=tty, stream=stream, socket=socket,
+            demux=demux, chunk_size=chunk_size, decode=decode
         )
 
     def export(self):
@@ -153,6 +209,57 @@ class Container(Model):
         """
         return self.client.api.export(self.id)
 
+    def export_to(self, path, chunk_size=DEFAULT_BLOCK_SIZE, progress=None):
+        """
+        Export the contents of the container's filesystem to a tar archive
+        file as it is received. Similar to ``docker export -o``.
+
+        The archive is written next to ``path``, synced to disk and renamed
+        to ``path`` once complete, so that ``path`` never holds a partial
+        archive.
+
+        Args:
+            path (str): The file to write the archive to
+            chunk_size (int): The size of the reads from the response
+            progress (callable): Called as ``progress(received, total)``
+                while the archive is received. ``total`` is ``None`` unless
+                the daemon sent the size of the archive.
+
+        Returns:
+            (dict): The ``size`` of the archive, its ``sha256`` digest in
+            hex, and the ``seconds`` it took to save.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return save_response(
+            self.client.api.export(self.id), path, chunk_size, progress
+        )
+
+    def extract_archive(self, path, dest=None, **kwargs):
+        """
+        Retrieve a file or folder from the container and extract it on the
+        host as it is received, in constant memory.
+
+        Args:
+            path (str): Path to the file or folder to retrieve
+            dest (str): The directory to extract it into
+            callback (callable): Instead of extracting the archive, call
+                ``callback(member, f)`` with each of its members
+            progress (callable): Called as ``progress(received, total)``
+                while the archive is received
+            chunk_size (int): The size of the reads from the response.
+
+        Returns:
+            (dict): The ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.extract_archive(self.id, path, dest, **kwargs)
+
     def get_archive(self, path):
         """
         Retrieve a file or folder from the container in the form of a tar
@@ -203,9 +310,15 @@ class Container(Model):
             since (datetime or int): Show logs since a given datetime or
                 integer epoch (in seconds)
             follow (bool): Follow log output
+            demux (bool): Keep stdout and stderr separate. Default ``False``.
+            chunk_size (int): The size of the reads from the response when
+                streaming the output of a container with a TTY. Default: 64KiB
+            decode (bool): Return the logs as text decoded from UTF-8,
+                rather than bytes. Default ``False``.
 
         Returns:
-            (generator or str): Logs from the container.
+            (generator or str): Logs from the container. See
+            :py:meth:`attach` for the output of ``demux=True``.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -241,6 +354,29 @@ class Container(Model):
         """
         return self.client.api.put_archive(self.id, path, data)
 
+    def put_directory(self, path, src, **kwargs):
+        """
+        Copy the contents of a local directory to this container.
+
+        Args:
+            path (str): Path inside the container where the contents of
+                ``src`` will be extracted. Must exist.
+            src (str): Path to the local directory
+            exclude (list): ``.dockerignore`` style patterns of the files to
+                leave out
+            gzip (bool): Compress the archive with gzip
+            gzip_workers (int): The number of threads compressing the
+                archive. Default ``1``.
+            gzip_level (int): The gzip compression level. Default ``9``.
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`~docker.errors.APIError` If an error occurs.
+        """
+        return self.client.api.put_directory(self.id, path, src, **kwargs)
+
     def remove(self, **kwargs):
         """
         Remove this container. Similar to the ``docker rm`` command.
@@ -321,6 +457,9 @@ class Container(Model):
                 on the fly. False by default.
             stream (bool): If set to false, only the current stats will be
                 returned instead of a stream. True by default.
+            buffered (bool): Read the stream from the socket in large
+                blocks and parse the chunked encoding in the client. False
+                by default.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -716,7 +855,8 @@ class ContainerCollection(Collection):
         resp = self.client.api.inspect_container(container_id)
         return self.prepare_model(resp)
 
-    def list(self, all=False, before=None, filters=None, limit=-1, since=None):
+    def list(self, all=False, before=None, filters=None, limit=-1, since=None,
+             sparse=False, max_workers=DEFAULT_MAX_WORKERS):
         """
         List containers. Similar to the ``docker ps`` command.
 
@@ -750,6 +890,14 @@ class ContainerCollection(Collection):
                 `docker ps
                 <https://docs.docker.com/engine/reference/commandline/ps>`_.
 
+            sparse (bool): Create the containers from the list returned by
+                the server without inspecting them. ``id``, ``name``,
+                ``status`` and ``summary`` are then available without further
+                requests, and each container is inspected the first time its
+                ``attrs`` are accessed.
+            max_workers (int): Unless ``sparse`` is set, the number of
+                containers inspected at the same time. Default ``8``.
+
         Returns:
             (list of :py:class:`Container`)
 
@@ -760,7 +908,9 @@ class ContainerCollection(Collection):
         resp = self.client.api.containers(all=all, before=before,
                                           filters=filters, limit=limit,
                                           since=since)
-        return [self.get(r['Id']) for r in resp]
+        if sparse:
+            return [self.prepare_summary(r) for r in resp]
+        return self._get_many((r['Id'] for r in resp), max_workers)
 
 
 # kwargs to copy straight from run to create
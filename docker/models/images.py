@@ -3,7 +3,9 @@ import re
 import six
 
 from ..api import APIClient
+from ..constants import DEFAULT_BLOCK_SIZE
 from ..errors import BuildError
+from ..utils.archive import save_response
 from ..utils.json_stream import json_stream
 from .resource import Collection, Model
 
@@ -12,6 +14,10 @@ class Image(Model):
     """
     An image on the server.
     """
+    # Created is a timestamp in summaries, and untagged images have
+    # placeholder RepoTags and RepoDigests.
+    summary_keys = frozenset(['Id', 'Size', 'VirtualSize'])
+
     def __repr__(self):
         return "<%s: '%s'>" % (self.__class__.__name__, "', '".join(self.tags))
 
@@ -30,10 +36,11 @@ class Image(Model):
         """
         The image's tags.
         """
-        return [
-            tag for tag in self.attrs.get('RepoTags', [])
-            if tag != '<none>:<none>'
-        ]
+        if self.hydrated:
+            tags = self.attrs.get('RepoTags')
+        else:
+            tags = self.summary.get('RepoTags')
+        return [tag for tag in tags or [] if tag != '<none>:<none>']
 
     def history(self):
         """
@@ -64,12 +71,48 @@ class Image(Model):
 
             >>> image = cli.get("fedora:latest")
             >>> resp = image.save()
-            >>> f = open('/tmp/fedora-latest.tar', 'w')
-            >>> f.write(resp.data)
-            >>> f.close()
+            >>> with open('/tmp/fedora-latest.tar', 'wb') as f:
+            ...     for chunk in resp.stream(64 * 1024):
+            ...         f.write(chunk)
+
+            To write the tarball to a file, use :py:meth:`save_to`.
         """
         return self.client.api.get_image(self.id)
 
+    def save_to(self, path, chunk_size=DEFAULT_BLOCK_SIZE, progress=None):
+        """
+        Write a tarball of the image to a file as it is received. Similar
+        to ``docker save -o``.
+
+        The tarball is written next to ``path``, synced to disk and renamed
+        to ``path`` once complete, so that ``path`` never holds a partial
+        tarball.
+
+        Args:
+            path (str): The file to write the tarball to
+            chunk_size (int): The size of the reads from the response
+            progress (callable): Called as ``progress(received, total)``
+                while the tarball is received. ``total`` is ``None`` unless
+                the daemon sent the size of the tarball.
+
+        Returns:
+            (dict): The ``size`` of the tarball, its ``sha256`` digest in
+            hex, and the ``seconds`` it took to save.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> image = cli.get("fedora:latest")
+            >>> image.save_to('/tmp/fedora-latest.tar')
+            {'size': 211875840, 'sha256': '6f0f...', 'seconds': 1.7}
+        """
+        return save_response(
+            self.client.api.get_image(self.id), path, chunk_size, progress
+        )
+
     def tag(self, repository, tag=None, **kwargs):
         """
         Tag this image into a repository. Similar to the ``docker tag``
@@ -140,6 +183,16 @@ class ImageCollection(Collection):
                     ``"0-3"``, ``"0,1"``
             decode (bool): If set to ``True``, the returned stream will be
                 decoded into dicts on the fly. Default ``False``.
+            stream_context (bool): Send the build context from ``path`` as
+                it is archived, instead of writing it to a temporary file
+                first. Default ``False``.
+            context_cache (BuildContextCache): A
+                :py:class:`~docker.utils.build_cache.BuildContextCache` to
+                reuse unchanged files of the context from.
+            gzip (bool): Compress the build context with gzip.
+            gzip_workers (int): The number of threads compressing the build
+                context. Default ``1``.
+            gzip_level (int): The gzip compression level. Default ``9``.
 
         Returns:
             (:py:class:`Image`): The built image.
@@ -186,7 +239,7 @@ class ImageCollection(Collection):
         """
         return self.prepare_model(self.client.api.inspect_image(name))
 
-    def list(self, name=None, all=False, filters=None):
+    def list(self, name=None, all=False, filters=None, sparse=False):
         """
         List images on the server.
 
@@ -198,6 +251,12 @@ class ImageCollection(Collection):
                 Available filters:
                 - ``dangling`` (bool)
                 - ``label`` (str): format either ``key`` or ``key=value``
+            sparse (bool): Keep the images unhydrated. ``id``, ``tags``,
+                ``summary`` and the keys of ``attrs`` which are the same in
+                the list returned by the server are available without further
+                requests. Looking up another key inspects the image, and
+                :py:meth:`hydrate` inspects many at once. By default,
+                ``attrs`` hold the list returned by the server.
 
         Returns:
             (list of :py:class:`Image`): The images.
@@ -207,6 +266,8 @@ class ImageCollection(Collection):
                 If the server returns an error.
         """
         resp = self.client.api.images(name=name, all=all, filters=filters)
+        if sparse:
+            return [self.prepare_summary(r) for r in resp]
         return [self.prepare_model(r) for r in resp]
 
     def load(self, data):
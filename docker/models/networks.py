@@ -6,6 +6,13 @@ class Network(Model):
     """
     A Docker network.
     """
+    # The list of networks leaves out the containers and services attached
+    # to them from API 1.28.
+    summary_keys = frozenset([
+        'Id', 'Name', 'Created', 'Scope', 'Driver', 'EnableIPv6', 'IPAM',
+        'Internal', 'Attachable', 'Ingress', 'Options', 'Labels'
+    ])
+
     @property
     def name(self):
         """
@@ -18,10 +25,24 @@ class Network(Model):
         """
         The containers that are connected to the network, as a list of
         :py:class:`~docker.models.containers.Container` objects.
-        """
+
+        They are fetched with a single request, from their summaries, and
+        are each inspected the first time their ``attrs`` are accessed.
+        :py:meth:`~docker.models.containers.ContainerCollection.hydrate`
+        inspects them all at once.
+        """
+        ids = list(self.attrs.get('Containers', {}))
+        if not ids:
+            return []
+        resp = self.client.api.containers(
+            all=True, filters={'network': self.id}
+        )
+        summaries = dict((r['Id'], r) for r in resp)
+        # Endpoints which are not containers, like the load balancers of
+        # overlay networks, have no summary.
         return [
-            self.client.containers.get(cid) for cid in
-            self.attrs.get('Containers', {}).keys()
+            self.client.containers.prepare_summary(summaries[cid])
+            for cid in ids if cid in summaries
         ]
 
     def connect(self, container):
@@ -169,6 +190,13 @@ class NetworkCollection(Collection):
         Args:
             names (list): List of names to filter by.
             ids (list): List of ids to filter by.
+            sparse (bool): Keep the networks unhydrated. ``id``, ``name``,
+                ``summary`` and the keys of ``attrs`` which are the same in
+                the list returned by the server are available without further
+                requests. Looking up another key, like ``Containers``,
+                inspects the network, and :py:meth:`hydrate` inspects many at
+                once. By default, ``attrs`` hold the list returned by the
+                server.
 
         Returns:
             (list of :py:class:`Network`) The networks on the server.
@@ -177,5 +205,8 @@ class NetworkCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        sparse = kwargs.pop('sparse', False)
         resp = self.client.api.networks(*args, **kwargs)
+        if sparse:
+            return [self.prepare_summary(item) for item in resp]
         return [self.prepare_model(item) for item in resp]
@@ -1,3 +1,7 @@
+from multiprocessing.pool import ThreadPool
+
+from ..constants import DEFAULT_MAX_WORKERS
+
 
 class Model(object):
     """
@@ -5,17 +9,56 @@ class Model(object):
     """
     id_attribute = 'Id'
 
-    def __init__(self, attrs=None, client=None, collection=None):
+    #: The keys of the summary of an object in a list which have the same
+    #: value as in its full representation. ``attrs`` are read from the
+    #: summary until another key is looked up. If there are none, the object
+    #: is inspected the first time ``attrs`` are accessed.
+    summary_keys = frozenset()
+
+    def __init__(self, attrs=None, client=None, collection=None,
+                 summary=None):
         #: A client pointing at the server that this object is on.
         self.client = client
 
         #: The collection that this model is part of.
         self.collection = collection
 
-        #: The raw representation of this object from the API
-        self.attrs = attrs
-        if self.attrs is None:
-            self.attrs = {}
+        #: The summary of this object from the API, if the model was created
+        #: from a list of objects without inspecting it.
+        self.summary = summary
+
+        self._attrs = attrs
+        self._partial_attrs = None
+        if attrs is None:
+            if summary is None:
+                self._attrs = {}
+            elif self.summary_keys:
+                self._partial_attrs = PartialAttrs(self)
+
+    @property
+    def attrs(self):
+        """
+        The raw representation of this object from the API. If the model was
+        created from a summary, the rest of it is loaded from the server when
+        first needed.
+        """
+        if self._attrs is None:
+            if self._partial_attrs is not None:
+                return self._partial_attrs
+            self.reload()
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = attrs
+
+    @property
+    def hydrated(self):
+        """
+        Whether the full representation of this object has been loaded from
+        the server.
+        """
+        return self._attrs is not None
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__, self.short_id)
@@ -28,7 +71,9 @@ class Model(object):
         """
         The ID of the object.
         """
-        return self.attrs.get(self.id_attribute)
+        if self._attrs is None:
+            return self.summary.get(self.id_attribute)
+        return self._attrs.get(self.id_attribute)
 
     @property
     def short_id(self):
@@ -45,6 +90,49 @@ class Model(object):
         new_model = self.collection.get(self.id)
         self.attrs = new_model.attrs
 
+    def hydrate(self):
+        """
+        Load the full representation of this object from the server, unless
+        it has been already.
+        """
+        if not self.hydrated:
+            self.reload()
+
+
+class PartialAttrs(dict):
+    """
+    The ``attrs`` of a model created from a summary, holding the keys of the
+    summary listed in the model's ``summary_keys``. Looking up another key
+    loads the full representation of the object from the server, then
+    updates this dict with it.
+    """
+    def __init__(self, model):
+        super(PartialAttrs, self).__init__(
+            (k, v) for k, v in model.summary.items()
+            if k in model.summary_keys
+        )
+        self._model = model
+
+    def _load(self):
+        if self._model is not None:
+            self._model.hydrate()
+            self.update(self._model.attrs)
+            self._model = None
+
+    def __missing__(self, key):
+        self._load()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if not dict.__contains__(self, key):
+            self._load()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if not dict.__contains__(self, key):
+            self._load()
+        return dict.get(self, key, default)
+
 
 class Collection(object):
     """
@@ -82,3 +170,47 @@ class Collection(object):
         else:
             raise Exception("Can't create %s from %s" %
                             (self.model.__name__, attrs))
+
+    def prepare_summary(self, summary):
+        """
+        Create a model from the summary of an object in a list, which loads
+        the full representation of the object from the server when needed.
+        """
+        return self.model(summary=summary, client=self.client,
+                          collection=self)
+
+    def hydrate(self, models, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Load the full representation of each of ``models`` which does not
+        have it yet, with up to ``max_workers`` requests at a time.
+
+        Args:
+            models (list): Models of this collection, like those returned by
+                :py:meth:`list`.
+            max_workers (int): The number of objects inspected at the same
+                time. Default ``8``.
+
+        Returns:
+            The same models.
+        """
+        models = list(models)
+        pending = [model for model in models if not model.hydrated]
+        loaded = self._get_many((m.id for m in pending), max_workers)
+        for model, new_model in zip(pending, loaded):
+            model.attrs = new_model.attrs
+        return models
+
+    def _get_many(self, keys, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        :py:meth:`get` each of ``keys``, with up to ``max_workers`` requests
+        at a time, and return the models in the same order.
+        """
+        keys = list(keys)
+        workers = min(max_workers or 1, len(keys))
+        if workers <= 1:
+            return [self.get(key) for key in keys]
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(self.get, keys)
+        finally:
+            pool.terminate()
@@ -7,6 +7,9 @@ import sys
 from distutils.version import StrictVersion
 from requests.adapters import HTTPAdapter
 
+from .transport.pool import MeteredPoolMixin, PoolMetrics
+from .utils.fork import ForkSafeMixin, reset_pool_managers
+
 try:
     import requests.packages.urllib3 as urllib3
 except ImportError:
@@ -22,14 +25,26 @@ if sys.version_info[0] < 3 or sys.version_info[1] < 5:
     urllib3.connection.match_hostname = match_hostname
 
 
-class SSLAdapter(HTTPAdapter):
-    '''An HTTPS Transport Adapter that uses an arbitrary SSL version.'''
+class HTTPSConnectionPool(MeteredPoolMixin,
+                          urllib3.connectionpool.HTTPSConnectionPool):
+    pass
+
+
+class SSLAdapter(ForkSafeMixin, HTTPAdapter):
+    '''An HTTPS Transport Adapter that uses an arbitrary SSL version.
+
+    The size of its pools is set with the ``pool_maxsize`` and
+    ``pool_block`` arguments of :py:class:`requests.adapters.HTTPAdapter`,
+    and its connections are counted in ``metrics``, a
+    :py:class:`~docker.transport.pool.PoolMetrics`.'''
 
     def __init__(self, ssl_version=None, assert_hostname=None,
                  assert_fingerprint=None, **kwargs):
         self.ssl_version = ssl_version
         self.assert_hostname = assert_hostname
         self.assert_fingerprint = assert_fingerprint
+        self.metrics = PoolMetrics()
+        self._init_fork_safety()
         super(SSLAdapter, self).__init__(**kwargs)
 
     def init_poolmanager(self, connections, maxsize, block=False):
@@ -44,6 +59,10 @@ class SSLAdapter(HTTPAdapter):
             kwargs['ssl_version'] = self.ssl_version
 
         self.poolmanager = PoolManager(**kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(
+            self.poolmanager.pool_classes_by_scheme,
+            https=HTTPSConnectionPool
+        )
 
     def get_connection(self, *args, **kwargs):
         """
@@ -53,10 +72,15 @@ class SSLAdapter(HTTPAdapter):
 
         But we still need to take care of when there is a proxy poolmanager
         """
+        self._check_fork()
         conn = super(SSLAdapter, self).get_connection(*args, **kwargs)
         if conn.assert_hostname != self.assert_hostname:
             conn.assert_hostname = self.assert_hostname
-        return conn
+        return self.metrics.attach(conn)
+
+    def _after_fork(self):
+        reset_pool_managers(self)
+        self.metrics = PoolMetrics()
 
     def can_override_ssl_version(self):
         urllib_ver = urllib3.__version__.split('-')[0]
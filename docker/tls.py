@@ -1,7 +1,7 @@
 import os
 import ssl
 
-from . import errors, ssladapter
+from . import constants, errors, ssladapter
 
 
 class TLSConfig(object):
@@ -88,4 +88,8 @@ class TLSConfig(object):
             ssl_version=self.ssl_version,
             assert_hostname=self.assert_hostname,
             assert_fingerprint=self.assert_fingerprint,
+            pool_maxsize=getattr(
+                client, 'max_pool_size', constants.DEFAULT_MAX_POOL_SIZE
+            ),
+            pool_block=getattr(client, 'pool_block', False),
         ))
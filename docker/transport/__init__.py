@@ -1,4 +1,6 @@
 # flake8: noqa
+from .pool import PoolMetrics
+from .tcpconn import TCPAdapter
 from .unixconn import UnixAdapter
 try:
     from .npipeconn import NpipeAdapter
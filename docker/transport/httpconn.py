@@ -0,0 +1,122 @@
+import io
+import os
+import socket
+import stat
+
+import six
+
+if six.PY3:
+    import http.client as httplib
+else:
+    import httplib
+
+SENDFILE_BLOCK_SIZE = 1024 * 1024
+
+
+class UploadMixin(object):
+    """Request body handling shared by the connections of the transports.
+
+    Bodies which are regular files are sent with ``socket.sendfile``, which
+    lets the kernel copy them to the socket without going through Python
+    buffers, where the platform supports it."""
+
+    def request(self, method, url, body=None, headers=None):
+        headers = headers or {}
+        if not is_regular_file(body):
+            return super(UploadMixin, self).request(
+                method, url, body=body, headers=headers
+            )
+        names = set(k.lower() for k in headers)
+        if 'content-length' not in names:
+            if 'transfer-encoding' in names:
+                return self.request_chunked(method, url, body, headers)
+            headers = dict(headers)
+            headers['Content-Length'] = str(remaining_size(body))
+        super(UploadMixin, self).request(method, url, headers=headers)
+        self.send_file(body)
+
+    def request_chunked(self, method, url, body=None, headers=None):
+        """
+        Send a request whose body is an iterable or a file of unknown
+        length, using chunked transfer encoding. Called by urllib3 when
+        ``requests`` is given a generator as ``data``.
+        """
+        headers = headers or {}
+        names = set(k.lower() for k in headers)
+        self.putrequest(
+            method, url, skip_accept_encoding='accept-encoding' in names,
+            skip_host='host' in names
+        )
+        if 'transfer-encoding' not in names:
+            self.putheader('Transfer-Encoding', 'chunked')
+        for header, value in headers.items():
+            self.putheader(header, value)
+        self.endheaders()
+
+        if is_regular_file(body):
+            size = remaining_size(body)
+            if size:
+                self.send('{0:x}\r\n'.format(size).encode('ascii'))
+                self.send_file(body, size)
+                self.send(b'\r\n')
+        elif body is not None:
+            if isinstance(body, (six.binary_type, six.text_type)):
+                body = (body,)
+            for chunk in body:
+                if not chunk:
+                    continue
+                if not isinstance(chunk, six.binary_type):
+                    chunk = chunk.encode('utf-8')
+                self.send('{0:x}\r\n'.format(len(chunk)).encode('ascii'))
+                self.send(chunk)
+                self.send(b'\r\n')
+
+        self.send(b'0\r\n\r\n')
+
+    def send_file(self, fileobj, count=None):
+        """
+        Send ``count`` bytes of ``fileobj``, or all of it, from its current
+        position.
+        """
+        if isinstance(self.sock, socket.socket) and \
+                hasattr(self.sock, 'sendfile'):
+            self.sock.sendfile(fileobj, fileobj.tell(), count)
+            return
+        while count is None or count > 0:
+            size = SENDFILE_BLOCK_SIZE
+            if count is not None:
+                size = min(size, count)
+                count -= size
+            data = fileobj.read(size)
+            if not data:
+                break
+            self.sock.sendall(data)
+
+
+class HTTPConnection(UploadMixin, httplib.HTTPConnection, object):
+    """Base class for the connections made over local sockets, which are
+    not urllib3 connections and lack some of their features."""
+
+
+def is_regular_file(body):
+    """
+    Whether ``body`` is a file object opened in binary mode on a regular
+    file, which can be sent with ``sendfile``.
+    """
+    if body is None or isinstance(body, io.TextIOBase):
+        return False
+    if six.PY2 and isinstance(body, file) and 'b' not in body.mode:  # noqa
+        return False
+    try:
+        fd = body.fileno()
+        body.tell()
+    except (AttributeError, IOError, OSError, ValueError):
+        return False
+    try:
+        return stat.S_ISREG(os.fstat(fd).st_mode)
+    except (OSError, TypeError):
+        return False
+
+
+def remaining_size(fileobj):
+    return max(os.fstat(fileobj.fileno()).st_size - fileobj.tell(), 0)
@@ -2,12 +2,10 @@ import six
 import requests.adapters
 
 from .. import constants
+from .httpconn import HTTPConnection
 from .npipesocket import NpipeSocket
-
-if six.PY3:
-    import http.client as httplib
-else:
-    import httplib
+from .pool import MeteredPoolMixin, PoolMetrics
+from ..utils.fork import ForkSafeMixin, close_inherited_pools
 
 try:
     import requests.packages.urllib3 as urllib3
@@ -17,7 +15,7 @@ except ImportError:
 RecentlyUsedContainer = urllib3._collections.RecentlyUsedContainer
 
 
-class NpipeHTTPConnection(httplib.HTTPConnection, object):
+class NpipeHTTPConnection(HTTPConnection):
     def __init__(self, npipe_path, timeout=60):
         super(NpipeHTTPConnection, self).__init__(
             'localhost', timeout=timeout
@@ -33,9 +31,10 @@ class NpipeHTTPConnection(httplib.HTTPConnection, object):
 
 
 class NpipeHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
-    def __init__(self, npipe_path, timeout=60, maxsize=10):
+    def __init__(self, npipe_path, timeout=60,
+                 maxsize=constants.DEFAULT_MAX_POOL_SIZE, block=False):
         super(NpipeHTTPConnectionPool, self).__init__(
-            'localhost', timeout=timeout, maxsize=maxsize
+            'localhost', timeout=timeout, maxsize=maxsize, block=block
         )
         self.npipe_path = npipe_path
         self.timeout = timeout
@@ -68,25 +67,43 @@ class NpipeHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
         return conn or self._new_conn()
 
 
-class NpipeAdapter(requests.adapters.HTTPAdapter):
+class MeteredNpipeHTTPConnectionPool(MeteredPoolMixin,
+                                     NpipeHTTPConnectionPool):
+    pass
+
+
+class NpipeAdapter(ForkSafeMixin, requests.adapters.HTTPAdapter):
+    """
+    Adapter for ``npipe://`` daemon URLs. It takes the same pool options
+    and has the same ``metrics`` as
+    :py:class:`~docker.transport.unixconn.UnixAdapter`.
+    """
     def __init__(self, base_url, timeout=60,
-                 pool_connections=constants.DEFAULT_NUM_POOLS):
+                 pool_connections=constants.DEFAULT_NUM_POOLS,
+                 pool_maxsize=constants.DEFAULT_MAX_POOL_SIZE,
+                 pool_block=False):
         self.npipe_path = base_url.replace('npipe://', '')
         self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.metrics = PoolMetrics()
         self.pools = RecentlyUsedContainer(
             pool_connections, dispose_func=lambda p: p.close()
         )
+        self._init_fork_safety()
         super(NpipeAdapter, self).__init__()
 
     def get_connection(self, url, proxies=None):
+        self._check_fork()
         with self.pools.lock:
             pool = self.pools.get(url)
             if pool:
                 return pool
 
-            pool = NpipeHTTPConnectionPool(
-                self.npipe_path, self.timeout
-            )
+            pool = self.metrics.attach(MeteredNpipeHTTPConnectionPool(
+                self.npipe_path, self.timeout,
+                maxsize=self.pool_maxsize, block=self.pool_block
+            ))
             self.pools[url] = pool
 
         return pool
@@ -101,3 +118,11 @@ class NpipeAdapter(requests.adapters.HTTPAdapter):
 
     def close(self):
         self.pools.clear()
+
+    def _after_fork(self):
+        inherited = self.pools
+        self.pools = RecentlyUsedContainer(
+            inherited._maxsize, dispose_func=inherited.dispose_func
+        )
+        self.metrics = PoolMetrics()
+        close_inherited_pools(list(inherited._container.values()))
@@ -0,0 +1,120 @@
+import threading
+import time
+import weakref
+
+
+class PoolMetrics(object):
+    """
+    Counters for the connections of the pools of an adapter, to size them
+    from data. Read them from
+    :py:attr:`~docker.api.client.APIClient.pool_metrics`.
+
+    If ``discarded`` keeps growing, more connections are in use at the same
+    time than the pools keep, and ``max_pool_size`` should be raised. If
+    ``wait_seconds`` grows with ``pool_block`` set, requests are waiting for
+    a free connection.
+
+    Attributes:
+        created (int): The number of connections opened.
+        discarded (int): The number of connections closed after use because
+            their pool was full.
+        checkouts (int): The number of times a connection was taken from a
+            pool for a request.
+        wait_seconds (float): The total time spent waiting for a connection
+            from a pool.
+    """
+    def __init__(self):
+        self.created = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self._returns = 0
+        self._lock = threading.Lock()
+        self._pools = weakref.WeakSet()
+
+    @property
+    def active(self):
+        """
+        The number of connections currently in use.
+        """
+        return self.checkouts - self._returns
+
+    @property
+    def idle(self):
+        """
+        The number of open connections waiting in the pools.
+        """
+        idle = 0
+        for pool in list(self._pools):
+            queue = getattr(pool.pool, 'queue', None) or []
+            idle += sum(1 for conn in list(queue) if conn is not None)
+        return idle
+
+    def snapshot(self):
+        """
+        Return all the counters as a dict.
+        """
+        return {
+            'active': self.active,
+            'idle': self.idle,
+            'created': self.created,
+            'discarded': self.discarded,
+            'checkouts': self.checkouts,
+            'wait_seconds': self.wait_seconds,
+        }
+
+    def attach(self, pool):
+        """
+        Make ``pool`` report to these metrics, if it is a
+        :py:class:`MeteredPoolMixin`.
+        """
+        if isinstance(pool, MeteredPoolMixin) and pool.metrics is not self:
+            pool.metrics = self
+            self._pools.add(pool)
+        return pool
+
+    def _created(self):
+        with self._lock:
+            self.created += 1
+
+    def _checked_out(self, waited):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+
+    def _returned(self, discarded):
+        with self._lock:
+            self._returns += 1
+            if discarded:
+                self.discarded += 1
+
+
+class MeteredPoolMixin(object):
+    """
+    A mixin for urllib3 connection pools, reporting to a
+    :py:class:`PoolMetrics`. It wraps ``_new_conn``, ``_get_conn`` and
+    ``_put_conn``, so it must come before the pool classes which define
+    them in the bases of a pool.
+    """
+    def __init__(self, *args, **kwargs):
+        super(MeteredPoolMixin, self).__init__(*args, **kwargs)
+        self.metrics = None
+        PoolMetrics().attach(self)
+
+    def _new_conn(self):
+        conn = super(MeteredPoolMixin, self)._new_conn()
+        self.metrics._created()
+        return conn
+
+    def _get_conn(self, timeout=None):
+        start = time.time()
+        conn = super(MeteredPoolMixin, self)._get_conn(timeout=timeout)
+        self.metrics._checked_out(time.time() - start)
+        return conn
+
+    def _put_conn(self, conn):
+        # The connection is closed instead of being put back when the pool
+        # is full.
+        full = self.pool is not None and self.pool.full()
+        super(MeteredPoolMixin, self)._put_conn(conn)
+        self.metrics._returned(full)
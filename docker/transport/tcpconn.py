@@ -0,0 +1,52 @@
+import requests.adapters
+
+from .. import constants
+from .httpconn import UploadMixin
+from .pool import MeteredPoolMixin, PoolMetrics
+from ..utils.fork import ForkSafeMixin, reset_pool_managers
+
+try:
+    import requests.packages.urllib3 as urllib3
+except ImportError:
+    import urllib3
+
+
+class TCPHTTPConnection(UploadMixin, urllib3.connection.HTTPConnection):
+    pass
+
+
+class TCPHTTPConnectionPool(MeteredPoolMixin,
+                            urllib3.connectionpool.HTTPConnectionPool):
+    ConnectionCls = TCPHTTPConnection
+
+
+class TCPAdapter(ForkSafeMixin, requests.adapters.HTTPAdapter):
+    """
+    Adapter for plain ``http://`` daemon URLs, whose connections send file
+    request bodies with ``sendfile``. Its connections are counted in
+    ``metrics``, a :py:class:`~docker.transport.pool.PoolMetrics`.
+    """
+    def __init__(self, pool_connections=constants.DEFAULT_NUM_POOLS,
+                 **kwargs):
+        self.metrics = PoolMetrics()
+        self._init_fork_safety()
+        super(TCPAdapter, self).__init__(
+            pool_connections=pool_connections, **kwargs
+        )
+
+    def get_connection(self, *args, **kwargs):
+        self._check_fork()
+        return self.metrics.attach(
+            super(TCPAdapter, self).get_connection(*args, **kwargs)
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TCPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(
+            self.poolmanager.pool_classes_by_scheme,
+            http=TCPHTTPConnectionPool
+        )
+
+    def _after_fork(self):
+        reset_pool_managers(self)
+        self.metrics = PoolMetrics()
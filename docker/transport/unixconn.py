@@ -1,13 +1,10 @@
-import six
 import requests.adapters
 import socket
 
 from .. import constants
-
-if six.PY3:
-    import http.client as httplib
-else:
-    import httplib
+from .httpconn import HTTPConnection
+from .pool import MeteredPoolMixin, PoolMetrics
+from ..utils.fork import ForkSafeMixin, close_inherited_pools
 
 try:
     import requests.packages.urllib3 as urllib3
@@ -18,7 +15,7 @@ except ImportError:
 RecentlyUsedContainer = urllib3._collections.RecentlyUsedContainer
 
 
-class UnixHTTPConnection(httplib.HTTPConnection, object):
+class UnixHTTPConnection(HTTPConnection):
     def __init__(self, base_url, unix_socket, timeout=60):
         super(UnixHTTPConnection, self).__init__(
             'localhost', timeout=timeout
@@ -35,9 +32,10 @@ class UnixHTTPConnection(httplib.HTTPConnection, object):
 
 
 class UnixHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
-    def __init__(self, base_url, socket_path, timeout=60, maxsize=10):
+    def __init__(self, base_url, socket_path, timeout=60,
+                 maxsize=constants.DEFAULT_MAX_POOL_SIZE, block=False):
         super(UnixHTTPConnectionPool, self).__init__(
-            'localhost', timeout=timeout, maxsize=maxsize
+            'localhost', timeout=timeout, maxsize=maxsize, block=block
         )
         self.base_url = base_url
         self.socket_path = socket_path
@@ -49,28 +47,58 @@ class UnixHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
         )
 
 
-class UnixAdapter(requests.adapters.HTTPAdapter):
+class MeteredUnixHTTPConnectionPool(MeteredPoolMixin,
+                                    UnixHTTPConnectionPool):
+    pass
+
+
+class UnixAdapter(ForkSafeMixin, requests.adapters.HTTPAdapter):
+    """
+    Adapter for ``http+unix://`` daemon URLs.
+
+    Args:
+        socket_url (str): The URL of the socket.
+        timeout (int): The timeout of the connections, in seconds.
+        pool_connections (int): The number of pools to keep.
+        pool_maxsize (int): The number of connections each pool keeps open
+            for reuse. More can be opened at the same time, unless
+            ``pool_block`` is set, but are closed after use.
+        pool_block (bool): Wait for a connection to be free rather than
+            opening more than ``pool_maxsize``.
+
+    Attributes:
+        metrics (:py:class:`~docker.transport.pool.PoolMetrics`): The
+            counters of the connections of the adapter.
+    """
     def __init__(self, socket_url, timeout=60,
-                 pool_connections=constants.DEFAULT_NUM_POOLS):
+                 pool_connections=constants.DEFAULT_NUM_POOLS,
+                 pool_maxsize=constants.DEFAULT_MAX_POOL_SIZE,
+                 pool_block=False):
         socket_path = socket_url.replace('http+unix://', '')
         if not socket_path.startswith('/'):
             socket_path = '/' + socket_path
         self.socket_path = socket_path
         self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.metrics = PoolMetrics()
         self.pools = RecentlyUsedContainer(
             pool_connections, dispose_func=lambda p: p.close()
         )
+        self._init_fork_safety()
         super(UnixAdapter, self).__init__()
 
     def get_connection(self, url, proxies=None):
+        self._check_fork()
         with self.pools.lock:
             pool = self.pools.get(url)
             if pool:
                 return pool
 
-            pool = UnixHTTPConnectionPool(
-                url, self.socket_path, self.timeout
-            )
+            pool = self.metrics.attach(MeteredUnixHTTPConnectionPool(
+                url, self.socket_path, self.timeout,
+                maxsize=self.pool_maxsize, block=self.pool_block
+            ))
             self.pools[url] = pool
 
         return pool
@@ -85,3 +113,11 @@ class UnixAdapter(requests.adapters.HTTPAdapter):
 
     def close(self):
         self.pools.clear()
+
+    def _after_fork(self):
+        inherited = self.pools
+        self.pools = RecentlyUsedContainer(
+            inherited._maxsize, dispose_func=inherited.dispose_func
+        )
+        self.metrics = PoolMetrics()
+        close_inherited_pools(list(inherited._container.values()))
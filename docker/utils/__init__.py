@@ -1,7 +1,8 @@
 # flake8: noqa
 from .utils import (
     compare_version, convert_port_bindings, convert_volume_binds,
-    mkbuildcontext, tar, exclude_paths, parse_repository_tag, parse_host,
+    mkbuildcontext, tar, tar_stream, exclude_paths, parse_repository_tag,
+    parse_host,
     kwargs_from_env, convert_filters, datetime_to_timestamp,
     create_host_config, create_container_config, parse_bytes, ping_registry,
     parse_env_file, version_lt, version_gte, decode_json_header, split_command,
@@ -11,4 +12,7 @@ from .utils import (
 
 from ..types import LogConfig, Ulimit
 from ..types import SwarmExternalCA, SwarmSpec
+from .build_cache import BuildContextCache, BuildContextStats
+from .image_archive import ImageArchive
+from .image_cache import ImageCache
 from .decorators import check_resource, minimum_version, update_headers
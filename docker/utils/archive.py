@@ -0,0 +1,335 @@
+import hashlib
+import os
+import tarfile
+import time
+
+import six
+
+from .. import constants
+from .. import errors
+
+# Set on directories in the ``mode`` of the path stat sent by the daemon
+STAT_MODE_DIR = 1 << 31
+
+# Whether tarfile has extraction filters (Python 3.12, and security
+# releases of earlier versions)
+_STDLIB_DATA_FILTER = hasattr(tarfile, 'data_filter')
+
+
+class BlockWriter(object):
+    """A write-only file object collecting what is written to it until
+    :py:meth:`getvalue` is called."""
+    def __init__(self):
+        self.blocks = []
+        self.size = 0
+
+    def write(self, data):
+        self.blocks.append(data)
+        self.size += len(data)
+
+    def getvalue(self):
+        data = six.binary_type().join(self.blocks)
+        self.blocks = []
+        self.size = 0
+        return data
+
+
+class ProgressReader(object):
+    """
+    Wrap a file object, counting the bytes read from it and calling
+    ``progress(received, total)`` after each read which returned data.
+    """
+    def __init__(self, fileobj, progress=None, total=None):
+        self.fileobj = fileobj
+        self.progress = progress
+        self.total = total
+        self.received = 0
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if data:
+            self.received += len(data)
+            if self.progress is not None:
+                self.progress(self.received, self.total)
+        return data
+
+
+def stat_size(stat):
+    """
+    The size of the path described by a path stat header, or ``None`` if it
+    is a directory or unknown.
+    """
+    if not stat or stat.get('mode', 0) & STAT_MODE_DIR:
+        return None
+    return stat.get('size')
+
+
+def extract_stream(fileobj, path=None, callback=None,
+                   chunk_size=constants.DEFAULT_BLOCK_SIZE):
+    """
+    Extract a tar archive from a file object as it is read, without seeking,
+    so that only ``chunk_size`` bytes of it are held in memory at a time.
+
+    Args:
+        fileobj: The file object to read the archive from.
+        path (str): The directory to extract the archive into.
+        callback (callable): Instead of extracting the archive, call
+            ``callback(member, f)`` with the
+            :py:class:`~tarfile.TarInfo` of each member, in order. ``f`` is
+            a file object to read the content of regular files from, and
+            ``None`` for other members. It cannot be read once ``callback``
+            returns.
+        chunk_size (int): The size of the reads from ``fileobj``.
+
+    Members are extracted the way the ``'data'`` filter of
+    :py:mod:`tarfile` extracts them, on every Python version: without their
+    owner, setuid bits or write permission for others.
+
+    Raises:
+        :py:class:`docker.errors.DockerException`
+            If a member would be extracted outside of ``path``, links to an
+            absolute path or outside of ``path``, or is a device or a FIFO.
+    """
+    if (path is None) == (callback is None):
+        raise TypeError('Either path or callback needs to be provided.')
+
+    archive = tarfile.open(fileobj=fileobj, mode='r|', bufsize=chunk_size)
+    try:
+        for member in archive:
+            if callback is not None:
+                f = archive.extractfile(member) if member.isfile() else None
+                callback(member, f)
+            else:
+                _extract_member(archive, member, path)
+    finally:
+        archive.close()
+
+
+def read_blocks(fileobj, chunk_size=constants.DEFAULT_BLOCK_SIZE):
+    """
+    A generator of the content of a file object, read ``chunk_size`` bytes
+    at a time.
+    """
+    while True:
+        data = fileobj.read(chunk_size)
+        if not data:
+            return
+        yield data
+
+
+def rewrite_stream(fileobj, rename, chunk_size=constants.DEFAULT_BLOCK_SIZE):
+    """
+    Read a tar archive from a file object and generate it again, in blocks
+    of about ``chunk_size`` bytes, with the names of its members changed.
+    Neither archive is ever held in memory as a whole.
+
+    Args:
+        fileobj: The file object to read the archive from.
+        rename (callable): Called with the name of each member, returns its
+            new name, or ``None`` to leave the member out. The targets of
+            hard links are renamed too.
+        chunk_size (int): The size of the reads from ``fileobj``.
+    """
+    source = tarfile.open(fileobj=fileobj, mode='r|', bufsize=chunk_size)
+    sink = BlockWriter()
+    t = tarfile.open(mode='w|', fileobj=sink, format=tarfile.PAX_FORMAT)
+    try:
+        for member in source:
+            name = rename(member.name)
+            if name is None:
+                continue
+            member.name = name
+            if member.islnk():
+                member.linkname = rename(member.linkname) or member.linkname
+            # Long names read from PAX headers would take precedence over
+            # the new ones.
+            member.pax_headers.pop('path', None)
+            member.pax_headers.pop('linkpath', None)
+
+            header = member.tobuf(t.format, t.encoding, t.errors)
+            t.fileobj.write(header)
+            t.offset += len(header)
+
+            if member.isreg():
+                f = source.extractfile(member)
+                for data in read_blocks(f, chunk_size):
+                    t.fileobj.write(data)
+                    if sink.size >= chunk_size:
+                        yield sink.getvalue()
+                blocks, remainder = divmod(member.size, tarfile.BLOCKSIZE)
+                if remainder:
+                    t.fileobj.write(
+                        tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+                    )
+                    blocks += 1
+                t.offset += blocks * tarfile.BLOCKSIZE
+
+            if sink.size >= chunk_size:
+                yield sink.getvalue()
+        t.close()
+        yield sink.getvalue()
+    finally:
+        source.close()
+
+
+def save_stream(fileobj, path, chunk_size=constants.DEFAULT_BLOCK_SIZE,
+                progress=None, total=None):
+    """
+    Write the content of a file object to ``path`` as it is read, computing
+    its SHA-256 digest on the way.
+
+    The content is written to ``path`` with ``.part`` appended, synced to
+    disk, then renamed to ``path``. ``path`` therefore only ever holds a
+    complete file, and a leftover ``.part`` file is the sign of a save that
+    was interrupted.
+
+    Args:
+        fileobj: The file object to read from.
+        path (str): The path of the file to write.
+        chunk_size (int): The size of the reads from ``fileobj``.
+        progress (callable): Called as ``progress(received, total)`` after
+            each read.
+        total (int): The expected size of the content, if known.
+
+    Returns:
+        (dict): The ``size`` of the content, its ``sha256`` digest in hex,
+        and the ``seconds`` it took to save.
+    """
+    start = time.time()
+    part = path + '.part'
+    digest = hashlib.sha256()
+    reader = ProgressReader(fileobj, progress, total)
+    try:
+        with open(part, 'wb') as f:
+            for data in read_blocks(reader, chunk_size):
+                digest.update(data)
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(part, path)
+    except BaseException:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+    return {
+        'size': reader.received,
+        'sha256': digest.hexdigest(),
+        'seconds': time.time() - start,
+    }
+
+
+def save_response(response, path, chunk_size=constants.DEFAULT_BLOCK_SIZE,
+                  progress=None):
+    """
+    :py:func:`save_stream` for a raw response, which is released afterwards.
+    """
+    total = response.headers.get('Content-Length')
+    try:
+        result = save_stream(
+            response, path, chunk_size, progress,
+            int(total) if total else None
+        )
+    except BaseException:
+        response.close()
+        raise
+    response.release_conn()
+    return result
+
+
+def _replace(src, dst):
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    if os.name == 'nt' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+def _fsync_directory(path):
+    # Makes the rename durable. Directories cannot be opened on Windows.
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _extract_member(archive, member, path):
+    if _STDLIB_DATA_FILTER:
+        try:
+            archive.extract(member, path, filter='data')
+        except tarfile.FilterError as e:
+            raise errors.DockerException(
+                'Cannot extract {0}: {1}'.format(member.name, e)
+            )
+        return
+
+    _data_filter(member, path)
+    archive.extract(member, path)
+
+
+def _data_filter(member, path):
+    # What the stdlib 'data' filter refuses and changes, for versions without
+    # it, so that the same archives are extracted the same way everywhere.
+    member.name = member.name.lstrip('/' + os.sep)
+    root = os.path.realpath(path)
+    if os.path.isabs(member.name) or not _is_within(
+            root, os.path.join(root, member.name)):
+        raise errors.DockerException(
+            'Cannot extract {0}: it is outside of {1}'.format(
+                member.name, path
+            )
+        )
+    if not (member.isreg() or member.islnk() or member.isdir() or
+            member.issym()):
+        raise errors.DockerException(
+            'Cannot extract {0}: it is a special file'.format(member.name)
+        )
+    if member.issym() or member.islnk():
+        if os.path.isabs(member.linkname):
+            raise errors.DockerException(
+                'Cannot extract {0}: it links to an absolute path'.format(
+                    member.name
+                )
+            )
+        if member.issym():
+            target = os.path.join(
+                root, os.path.dirname(member.name), member.linkname
+            )
+        else:
+            target = os.path.join(root, member.linkname)
+        if not _is_within(root, target):
+            raise errors.DockerException(
+                'Cannot extract {0}: it links outside of {1}'.format(
+                    member.name, path
+                )
+            )
+
+    # Drop the setuid, setgid and sticky bits, and write permission for
+    # group and others. The stdlib leaves the mode of directories to the
+    # umask, which older versions cannot do, so they stay writable by their
+    # owner instead.
+    mode = member.mode & 0o755
+    if member.isreg() or member.islnk():
+        if not mode & 0o100:
+            mode &= ~0o111
+        mode |= 0o600
+    elif member.isdir():
+        mode |= 0o700
+    member.mode = mode
+    # Files belong to the user extracting them.
+    member.uname = member.gname = ''
+    if hasattr(os, 'getuid'):
+        member.uid, member.gid = os.getuid(), os.getgid()
+
+
+def _is_within(root, path):
+    path = os.path.realpath(path)
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
@@ -0,0 +1,116 @@
+import re
+from multiprocessing.pool import ThreadPool
+
+from .. import errors
+
+HEX_RE = re.compile(r'^(sha256:)?[0-9a-f]+$')
+
+
+def resource_id(resource):
+    """
+    The ID or name of a resource given as a string, or as a dict with an
+    ``Id`` key like the arguments of the methods decorated with
+    :py:func:`~docker.utils.decorators.check_resource`.
+    """
+    if isinstance(resource, dict):
+        return resource.get('Id', resource.get('ID'))
+    return resource
+
+
+def container_name(summary):
+    """
+    The name of a container, with its leading ``/``, from its summary as
+    returned by :py:meth:`~docker.api.container.ContainerApiMixin.containers`.
+    Containers are also listed under the names their links give them in
+    other containers, like ``/web/db``, which are skipped.
+    """
+    names = summary.get('Names') or []
+    for name in names:
+        if '/' not in name[1:]:
+            return name
+    return names[0] if names else None
+
+
+def map_results(fn, keys, max_workers):
+    """
+    Call ``fn`` with each of ``keys``, with up to ``max_workers`` calls at a
+    time, and return the results in the same order. When a call raises a
+    :py:class:`~docker.errors.DockerException`, the exception takes the
+    place of its result.
+    """
+    def call(key):
+        try:
+            return fn(key)
+        except errors.DockerException as e:
+            return e
+
+    keys = list(keys)
+    workers = min(max_workers or 1, len(keys))
+    if workers <= 1:
+        return [call(key) for key in keys]
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(call, keys)
+    finally:
+        pool.terminate()
+
+
+def match_summaries(keys, summaries, names, not_found):
+    """
+    Find the summary of each of ``keys`` among ``summaries``, the way the
+    daemon resolves a reference: by full ID, then by one of the names
+    returned by ``names(summary)``, then by unique ID prefix.
+
+    Returns:
+        (list): The summaries in the order of ``keys``. When there is no
+        match, the exception returned by ``not_found(key)`` takes its place.
+    """
+    by_id = {}
+    by_name = {}
+    for summary in summaries:
+        by_id[_bare(summary['Id'])] = summary
+        for name in names(summary):
+            by_name.setdefault(name, summary)
+
+    results = []
+    for key in keys:
+        if not key:
+            results.append(errors.NullResource(
+                'image or container param is undefined'
+            ))
+            continue
+        prefix = _bare(key) if HEX_RE.match(key) else None
+        summary = by_id.get(prefix) or by_name.get(key)
+        if summary is not None:
+            results.append(summary)
+            continue
+        matches = [
+            s for i, s in by_id.items() if prefix and i.startswith(prefix)
+        ]
+        if len(matches) == 1:
+            results.append(matches[0])
+        elif matches:
+            results.append(errors.DockerException(
+                'Multiple IDs found with prefix {0}'.format(key)
+            ))
+        else:
+            results.append(not_found(key))
+    return results
+
+
+def from_summaries(results, fields):
+    """
+    Build inspect results out of the summaries among ``results``, which
+    are left alone when they are exceptions. ``fields`` maps the keys of
+    the inspect results to functions taking a summary and returning the
+    value of the key.
+    """
+    return [
+        r if isinstance(r, Exception)
+        else dict((key, fn(r)) for key, fn in fields.items())
+        for r in results
+    ]
+
+
+def _bare(object_id):
+    return object_id.split(':', 1)[-1]
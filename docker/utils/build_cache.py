@@ -0,0 +1,145 @@
+import collections
+import threading
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class BuildContextStats(object):
+    """
+    Describes the files of one archived build context.
+
+    Attributes:
+        manifest (dict): The regular files of the context, mapping their
+            path in the archive to the SHA-256 digest of their content.
+        hits (int): The number of files reused from the cache.
+        misses (int): The number of files read from disk.
+        bytes_reused (int): The size of the segments reused from the cache.
+    """
+    def __init__(self):
+        self.manifest = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reused = 0
+
+    @property
+    def hit_ratio(self):
+        """
+        The fraction of the files that were reused from the cache, between
+        ``0.0`` and ``1.0``.
+        """
+        total = self.hits + self.misses
+        return self.hits / float(total) if total else 0.0
+
+
+class BuildContextCache(object):
+    """
+    Keeps the tar archive segments (content and padding) of the regular
+    files in build contexts, so that files which have not changed since a
+    previous build are not read again. Pass it to
+    :py:meth:`~docker.api.build.BuildApiMixin.build` as ``context_cache``.
+
+    A file is reused if its path, size, modification time, inode, mode and
+    owner are all unchanged. Segments are stored in memory by the SHA-256
+    digest of the file's content, so identical files are only kept once.
+
+    A cache can be shared between threads and build contexts. Each context
+    archived with it is described by its own :py:class:`BuildContextStats`.
+
+    Args:
+        max_size (int): The maximum total size of the segments to keep, in
+            bytes, or ``None`` for no limit. The least recently used segments
+            are evicted first, and files larger than this are never cached.
+            Default: 256MiB
+
+    Attributes:
+        last_build (BuildContextStats): The statistics of the context
+            archived last, or ``None``.
+    """
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.last_build = None
+        self._lock = threading.Lock()
+        # Absolute path -> (key, digest)
+        self._files = {}
+        # Digest -> segment, least recently used first
+        self._segments = collections.OrderedDict()
+        # Digest -> paths referring to it
+        self._paths = collections.defaultdict(set)
+
+    def get(self, path, key, arcname, stats):
+        """
+        Return the segment stored for ``path`` if it was stored with the same
+        ``key``, and record it in ``stats`` as ``arcname``. Return ``None``
+        otherwise.
+        """
+        with self._lock:
+            entry = self._files.get(path)
+            segment = None
+            if entry is not None and entry[0] == key:
+                segment = self._segments.pop(entry[1], None)
+            if segment is None:
+                stats.misses += 1
+                return None
+            self._segments[entry[1]] = segment
+            stats.manifest[arcname] = entry[1]
+            stats.hits += 1
+            stats.bytes_reused += len(segment)
+            return segment
+
+    def put(self, path, key, arcname, digest, stats, segment=None):
+        """
+        Record the content digest of ``path`` in ``stats`` as ``arcname``
+        and store its segment, if given, under ``key``.
+        """
+        with self._lock:
+            stats.manifest[arcname] = digest
+            old = self._files.pop(path, None)
+            if old is not None:
+                self._release(path, old[1])
+            if segment is None or not self.fits(len(segment)):
+                return
+            self._files[path] = (key, digest)
+            self._paths[digest].add(path)
+            existing = self._segments.pop(digest, None)
+            self._segments[digest] = segment
+            if existing is not None:
+                return
+            self.size += len(segment)
+            while self.max_size is not None and self.size > self.max_size:
+                evicted, data = self._segments.popitem(last=False)
+                self.size -= len(data)
+                for evicted_path in self._paths.pop(evicted, ()):
+                    del self._files[evicted_path]
+
+    def finish(self, stats):
+        """
+        Publish ``stats`` as :py:attr:`last_build`, once a context has been
+        archived.
+        """
+        with self._lock:
+            self.last_build = stats
+
+    def fits(self, size):
+        """
+        Whether a segment of ``size`` bytes can be cached.
+        """
+        return self.max_size is None or size <= self.max_size
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._segments.clear()
+            self._paths.clear()
+            self.size = 0
+
+    def _release(self, path, digest):
+        paths = self._paths.get(digest)
+        if paths is None:
+            return
+        paths.discard(path)
+        if not paths:
+            del self._paths[digest]
+            data = self._segments.pop(digest, None)
+            if data is not None:
+                self.size -= len(data)
@@ -0,0 +1,79 @@
+import collections
+import zlib
+from multiprocessing.pool import ThreadPool
+
+import six
+
+DEFAULT_GZIP_BLOCK_SIZE = 1024 * 1024
+
+
+def gzip_stream(blocks, workers=1, level=9,
+                block_size=DEFAULT_GZIP_BLOCK_SIZE):
+    """
+    Compress an iterable of byte blocks with gzip and return a generator of
+    the compressed data.
+
+    With a single worker, the output is one gzip member. With more, the
+    input is cut into ``block_size`` pieces which are compressed in
+    parallel, like ``pigz`` does, and written out in order as consecutive
+    members of a multi-member gzip stream. ``zlib`` releases the GIL while
+    compressing, so this scales with the number of cores. At most two
+    pieces per worker are held in memory.
+
+    Args:
+        blocks (iterable): The data to compress.
+        workers (int): The number of threads compressing data.
+        level (int): The compression level, from 1 (fastest) to 9 (best).
+        block_size (int): The size of the pieces compressed in parallel.
+    """
+    if workers <= 1:
+        compressor = _compressor(level)
+        for data in blocks:
+            data = compressor.compress(data)
+            if data:
+                yield data
+        yield compressor.flush()
+        return
+
+    pool = ThreadPool(workers)
+    try:
+        pending = collections.deque()
+        empty = True
+        for piece in _rechunk(blocks, block_size):
+            empty = False
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_compress, (piece, level)))
+        while pending:
+            yield pending.popleft().get()
+        if empty:
+            yield _compress(b'', level)
+    finally:
+        pool.terminate()
+
+
+def _compressor(level):
+    # wbits=31 makes zlib write a gzip header and trailer.
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _compress(data, level):
+    compressor = _compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _rechunk(blocks, size):
+    buf = []
+    buffered = 0
+    for data in blocks:
+        buf.append(data)
+        buffered += len(data)
+        if buffered >= size:
+            data = six.binary_type().join(buf)
+            for start in range(0, len(data) - size + 1, size):
+                yield data[start:start + size]
+            rest = data[start + size:]
+            buf = [rest] if rest else []
+            buffered = len(rest)
+    if buf:
+        yield six.binary_type().join(buf)
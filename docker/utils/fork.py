@@ -0,0 +1,72 @@
+import os
+import weakref
+
+_objects = weakref.WeakSet()
+
+
+class ForkSafeMixin(object):
+    """
+    A mixin for objects holding state which cannot be shared with a forked
+    child, like open connections or locks. ``_after_fork`` is called in the
+    child to replace that state, right after the fork where
+    ``os.register_at_fork`` exists, and otherwise the next time
+    ``_check_fork`` is called.
+    """
+    def _init_fork_safety(self):
+        self._pid = os.getpid()
+        _objects.add(self)
+
+    def _check_fork(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._after_fork()
+
+    def _after_fork(self):
+        raise NotImplementedError
+
+
+def after_fork_in_child():
+    """
+    Reset the connection pools and other process-local state of the clients
+    inherited from the parent process. Called automatically in forked
+    children on Python 3.7 and above. On older versions, call it in a
+    post-fork hook, like gunicorn's ``post_fork``, to reset the clients
+    right away rather than when they are next used.
+    """
+    for obj in list(_objects):
+        obj._check_fork()
+
+
+def close_inherited_pools(pools):
+    """
+    Close the connections of urllib3 pools inherited from the parent
+    process. Only the descriptors of the child are closed, so the parent
+    can go on using the connections. No lock of the pools is taken, since
+    one could have been held by another thread of the parent when it
+    forked.
+    """
+    for pool in pools:
+        queue = getattr(pool.pool, 'queue', None) or []
+        for conn in list(queue):
+            if conn is not None:
+                conn.close()
+
+
+def reset_pool_managers(adapter):
+    """
+    Replace the pool managers of a :py:class:`requests.adapters.HTTPAdapter`
+    inherited from the parent process, and close their connections.
+    """
+    inherited = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+    adapter.init_poolmanager(
+        adapter._pool_connections, adapter._pool_maxsize,
+        block=adapter._pool_block
+    )
+    adapter.proxy_manager = {}
+    for manager in inherited:
+        close_inherited_pools(list(manager.pools._container.values()))
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=after_fork_in_child)
@@ -0,0 +1,271 @@
+import hashlib
+import io
+import json
+import posixpath
+import tarfile
+
+from .. import constants
+from .. import errors
+from .archive import read_blocks
+
+
+class ImageArchive(object):
+    """
+    An index over a tarball written by ``docker save``, from
+    :py:meth:`~docker.models.images.Image.save_to` for instance. Only the
+    headers of its members are read when it is opened. Their contents,
+    including the layers, can then be read without extracting the tarball.
+
+    Args:
+        path (str): The path of the tarball.
+
+    Attributes:
+        path (str): The path of the tarball.
+        members (dict): The :py:class:`~tarfile.TarInfo` of the members of
+            the tarball, by name.
+    """
+    def __init__(self, path, members=None):
+        self.path = path
+        if members is None:
+            with tarfile.open(path, 'r:') as archive:
+                members = _index(archive)
+        self.members = members
+        self._manifest = None
+        self._configs = {}
+
+    @classmethod
+    def from_stream(cls, fileobj, path,
+                    chunk_size=constants.DEFAULT_BLOCK_SIZE):
+        """
+        Write a tarball from a file object, like the response of
+        :py:meth:`~docker.api.image.ImageApiMixin.get_image`, to ``path``
+        and index it in the same pass.
+
+        Args:
+            fileobj: The file object to read the tarball from.
+            path (str): The path to write the tarball to.
+            chunk_size (int): The size of the reads from ``fileobj``.
+
+        Returns:
+            (:py:class:`ImageArchive`): The archive.
+        """
+        with open(path, 'wb') as f:
+            reader = _TeeReader(fileobj, f)
+            archive = tarfile.open(
+                fileobj=reader, mode='r|', bufsize=chunk_size
+            )
+            members = _index(archive)
+            # Copy whatever follows the end of archive marker too.
+            for _ in read_blocks(reader, chunk_size):
+                pass
+        return cls(path, members)
+
+    @property
+    def manifest(self):
+        """
+        The content of ``manifest.json``, a list with one entry per image
+        in the tarball, or ``None`` if the daemon did not write one.
+        """
+        if self._manifest is None and 'manifest.json' in self.members:
+            self._manifest = json.loads(
+                self.read('manifest.json').decode('utf-8')
+            )
+        return self._manifest
+
+    def config(self, index=0):
+        """
+        The configuration of the ``index``-th image of the manifest.
+        """
+        name = self._image(index)['Config']
+        if name not in self._configs:
+            self._configs[name] = json.loads(self.read(name).decode('utf-8'))
+        return self._configs[name]
+
+    def layers(self, index=0):
+        """
+        The layers of the ``index``-th image of the manifest, from the
+        bottom one up, as a list of ``(name, diff_id)`` tuples. ``name`` is
+        the name of the layer in the tarball, and ``diff_id`` the digest of
+        its content.
+        """
+        names = self._image(index)['Layers']
+        diff_ids = self.config(index).get('rootfs', {}).get('diff_ids', [])
+        if len(diff_ids) != len(names):
+            diff_ids = [None] * len(names)
+        return list(zip(names, diff_ids))
+
+    def open(self, name):
+        """
+        Open a member of the tarball for reading.
+
+        Returns:
+            A seekable, read-only binary file object.
+
+        Raises:
+            KeyError: If there is no member named ``name``.
+        """
+        member = self._resolve(name)
+        return _Section(open(self.path, 'rb'), member.offset_data, member.size)
+
+    def read(self, name):
+        """
+        Read the whole content of a member of the tarball.
+        """
+        with self.open(name) as f:
+            return f.read()
+
+    def open_layer(self, name, verify=True):
+        """
+        Open a layer for reading, from start to end.
+
+        Args:
+            name (str): The name of the layer in the tarball, as returned by
+                :py:meth:`layers`.
+            verify (bool): Check the content against the layer's digest
+                while it is read.
+
+        Returns:
+            A read-only binary file object. If ``verify`` is set, the read
+            that reaches its end raises
+            :py:class:`~docker.errors.DockerException` if the content does
+            not match the layer's digest.
+        """
+        f = self.open(name)
+        if not verify:
+            return f
+        return _VerifyingReader(f, self._diff_id(name), name)
+
+    def verify_layer(self, name, chunk_size=constants.DEFAULT_BLOCK_SIZE):
+        """
+        Check the content of a layer against its digest.
+
+        Raises:
+            :py:class:`~docker.errors.DockerException`
+                If the content does not match the layer's digest.
+        """
+        with self.open_layer(name) as f:
+            for _ in read_blocks(f, chunk_size):
+                pass
+
+    def _image(self, index):
+        if self.manifest is None:
+            raise errors.DockerException(
+                'The archive {0} has no manifest.json'.format(self.path)
+            )
+        return self.manifest[index]
+
+    def _diff_id(self, name):
+        for i in range(len(self.manifest or [])):
+            for layer, diff_id in self.layers(i):
+                if layer == name and diff_id:
+                    return diff_id
+        raise errors.DockerException(
+            'No digest of {0} in {1}'.format(name, self.path)
+        )
+
+    def _resolve(self, name):
+        member = self.members[name]
+        for _ in range(16):
+            if member.issym():
+                name = posixpath.normpath(posixpath.join(
+                    posixpath.dirname(member.name), member.linkname
+                ))
+            elif member.islnk():
+                name = member.linkname
+            else:
+                return member
+            member = self.members[name]
+        raise errors.DockerException(
+            'Too many levels of links at {0}'.format(name)
+        )
+
+
+def _index(archive):
+    members = {}
+    for member in archive:
+        members[member.name] = member
+    return members
+
+
+class _TeeReader(object):
+    def __init__(self, fileobj, out):
+        self.fileobj = fileobj
+        self.out = out
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.out.write(data)
+        return data
+
+
+class _Section(io.RawIOBase):
+    """A read-only view on ``size`` bytes of a file from ``offset``."""
+
+    def __init__(self, fileobj, offset, size):
+        self.fileobj = fileobj
+        self.offset = offset
+        self.size = size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, position, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            position += self.position
+        elif whence == io.SEEK_END:
+            position += self.size
+        self.position = max(position, 0)
+        return self.position
+
+    def readinto(self, b):
+        size = min(len(b), self.size - self.position)
+        if size <= 0:
+            return 0
+        self.fileobj.seek(self.offset + self.position)
+        data = self.fileobj.read(size)
+        b[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self.fileobj.close()
+        super(_Section, self).close()
+
+
+class _VerifyingReader(object):
+    def __init__(self, fileobj, digest, name):
+        algorithm, _, self.expected = digest.partition(':')
+        self.fileobj = fileobj
+        self.name = name
+        self.hash = hashlib.new(algorithm)
+        self.verified = False
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.hash.update(data)
+        if not self.verified and self.fileobj.tell() >= self.fileobj.size:
+            if self.hash.hexdigest() != self.expected:
+                raise errors.DockerException(
+                    'The content of {0} does not match its digest'.format(
+                        self.name
+                    )
+                )
+            self.verified = True
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,260 @@
+import collections
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .archive import _replace
+from .json_stream import json_loads
+from .utils import parse_repository_tag
+
+FULL_ID_RE = re.compile(r'^(sha256:)?([0-9a-f]{64})$')
+
+# Image events after which the image itself is described differently
+_CHANGED_ACTIONS = frozenset(['delete', 'tag', 'untag'])
+# Image events which do not move tags between images
+_NOOP_ACTIONS = frozenset(['push', 'save'])
+
+
+def full_image_id(image):
+    """
+    The ``sha256:`` ID of an image if ``image`` is a full ID, with or
+    without the ``sha256:`` prefix, and ``None`` otherwise.
+    """
+    match = FULL_ID_RE.match(image) if image else None
+    if match is None:
+        return None
+    return 'sha256:' + match.group(2)
+
+
+class ImageCache(object):
+    """
+    Keeps the results of
+    :py:meth:`~docker.api.image.ImageApiMixin.inspect_image` and
+    :py:meth:`~docker.api.image.ImageApiMixin.history` by full image ID.
+    Pass it to :py:class:`~docker.api.client.APIClient` as ``image_cache``.
+
+    An image is identified by the digest of its configuration, so what it
+    is made of never changes, and results can be reused until the image is
+    deleted. Only its ``RepoTags`` and ``RepoDigests`` change, when it is
+    tagged or untagged. Entries are invalidated when the client does so
+    itself, or when an image event is passed to :py:meth:`apply`, which a
+    :py:class:`~docker.mirror.StateMirror` following the same client does.
+
+    Images looked up by name or short ID are resolved through a map to
+    their full ID. Each mapping expires after ``tag_ttl`` seconds, so that a
+    tag moved to another image by someone else is not followed for long.
+
+    A cache can be shared between threads, but not between clients of
+    different daemons.
+
+    Args:
+        max_entries (int): The maximum number of results kept in memory.
+            The least recently used are evicted first. Default: ``1024``
+        path (str): A directory to also keep results in, so that they
+            survive the process. It is created if needed. Default: results
+            are only kept in memory.
+        tag_ttl (float): The number of seconds a name is resolved to the
+            same ID. Default: ``5``
+
+    Attributes:
+        hits (int): The number of results returned from the cache.
+        misses (int): The number of results that were not cached.
+    """
+    def __init__(self, max_entries=1024, path=None, tag_ttl=5):
+        self.max_entries = max_entries
+        self.path = path
+        self.tag_ttl = tag_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (kind, image ID) -> JSON, least recently used first
+        self._entries = collections.OrderedDict()
+        # Name -> (image ID, expiry time)
+        self._names = {}
+        if path is not None and not os.path.isdir(path):
+            os.makedirs(path)
+
+    def resolve(self, image):
+        """
+        The full ID of ``image``, if it is one or if it is a name that was
+        resolved less than ``tag_ttl`` seconds ago, and ``None`` otherwise.
+        """
+        image_id = full_image_id(image)
+        if image_id is not None:
+            return image_id
+        with self._lock:
+            entry = self._names.get(image)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._names[image]
+                return None
+            return entry[0]
+
+    def get(self, kind, image):
+        """
+        Return a copy of the result of ``kind`` (``inspect`` or
+        ``history``) for ``image``, or ``None`` if it is not cached.
+        """
+        image_id = self.resolve(image)
+        data = None
+        if image_id is not None:
+            with self._lock:
+                data = self._entries.pop((kind, image_id), None)
+                if data is not None:
+                    self._entries[(kind, image_id)] = data
+            if data is None:
+                data = self._read(kind, image_id)
+                if data is not None:
+                    self._store(kind, image_id, data)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json_loads(data)
+
+    def put(self, kind, image_id, result, name=None):
+        """
+        Store the result of ``kind`` for the image with the full ID
+        ``image_id``. If it was looked up by ``name``, resolve ``name`` to
+        ``image_id`` from now on.
+        """
+        image_id = full_image_id(image_id)
+        if image_id is None:
+            return
+        if name is not None and full_image_id(name) is None:
+            with self._lock:
+                self._names[name] = (image_id, time.time() + self.tag_ttl)
+        data = json.dumps(result)
+        self._store(kind, image_id, data)
+        self._write(kind, image_id, data)
+
+    def invalidate(self, image):
+        """
+        Forget the results for ``image``, and the names it is known by.
+        """
+        image_id = self.resolve(image)
+        with self._lock:
+            self._names.pop(image, None)
+            if image_id is None:
+                return
+            for key in [k for k in self._entries if k[1] == image_id]:
+                del self._entries[key]
+            for name in [n for n, v in self._names.items()
+                         if v[0] == image_id]:
+                del self._names[name]
+        if self.path is None:
+            return
+        for kind in ('inspect', 'history'):
+            try:
+                os.remove(self._filename(kind, image_id))
+            except OSError:
+                pass
+
+    def apply(self, event):
+        """
+        Update the cache from a decoded event, as returned by
+        :py:meth:`~docker.api.daemon.DaemonApiMixin.events`. Events about
+        anything but images are ignored.
+        """
+        if event.get('Type', 'image') != 'image':
+            return
+        action = (event.get('Action') or event.get('status') or '')
+        action = action.split(':', 1)[0]
+        if action in _NOOP_ACTIONS:
+            return
+        if action in _CHANGED_ACTIONS:
+            actor = event.get('Actor') or {}
+            image = actor.get('ID') or event.get('id')
+            if image:
+                self.invalidate(image)
+        # A tag may now refer to another image.
+        self.forget_names()
+
+    def forget_names(self):
+        """
+        Forget which images names were resolved to.
+        """
+        with self._lock:
+            self._names.clear()
+
+    def forget_tags(self, repositories=None):
+        """
+        Forget which images names were resolved to, and the results for
+        the images that names in ``repositories`` were resolved to, after a
+        tag of these repositories may have been moved to another image.
+
+        Args:
+            repositories (list): The names of the repositories, with or
+                without a tag. Default: all repositories.
+        """
+        if repositories is not None:
+            repositories = set(
+                parse_repository_tag(r)[0] for r in repositories
+            )
+        with self._lock:
+            image_ids = set(
+                image_id for name, (image_id, _) in self._names.items()
+                if repositories is None or
+                parse_repository_tag(name)[0] in repositories
+            )
+            self._names.clear()
+        for image_id in image_ids:
+            self.invalidate(image_id)
+
+    def clear(self):
+        """
+        Forget everything, including the results stored in ``path``.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._names.clear()
+        if self.path is None:
+            return
+        for filename in os.listdir(self.path):
+            if filename.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.path, filename))
+                except OSError:
+                    pass
+
+    def _store(self, kind, image_id, data):
+        with self._lock:
+            self._entries.pop((kind, image_id), None)
+            self._entries[(kind, image_id)] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _filename(self, kind, image_id):
+        return os.path.join(
+            self.path, '{0}-{1}.json'.format(kind, image_id.split(':', 1)[1])
+        )
+
+    def _read(self, kind, image_id):
+        if self.path is None:
+            return None
+        try:
+            with open(self._filename(kind, image_id), 'r') as f:
+                data = f.read()
+            json_loads(data)
+        except (IOError, OSError, ValueError):
+            return None
+        return data
+
+    def _write(self, kind, image_id, data):
+        if self.path is None:
+            return
+        fd, part = tempfile.mkstemp(dir=self.path, suffix='.part')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            _replace(part, self._filename(kind, image_id))
+        except (IOError, OSError):
+            try:
+                os.remove(part)
+            except OSError:
+                pass
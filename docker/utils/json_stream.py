@@ -3,15 +3,69 @@ from __future__ import unicode_literals
 
 import json
 import json.decoder
+import re
 
 import six
 
 from ..errors import StreamParseError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 
 json_decoder = json.JSONDecoder()
 
 
+_WHITESPACE = re.compile(b'[ \t\n\r]*')
+_STRUCTURE = re.compile(b'[][{}"]')
+_STRING_SPECIAL = re.compile(b'["\\\\]')
+_SCALAR_END = re.compile(b'[][{}" \t\n\r]')
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_OPENERS = (ord('{'), ord('['))
+_CLOSERS = (b'}', b']', b'"')
+
+
+def _stdlib_loads(data):
+    if isinstance(data, (six.binary_type, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+if orjson is not None:
+    default_json_loads = orjson.loads
+elif ujson is not None:
+    default_json_loads = ujson.loads
+else:
+    default_json_loads = _stdlib_loads
+
+_json_loads = default_json_loads
+
+
+def set_json_decoder(loads=None):
+    """Set the function used to decode JSON from the Docker API. It is
+    given a UTF-8 encoded ``bytes`` or a text object and must raise
+    ``ValueError`` on invalid input. By default ``orjson`` or ``ujson`` is
+    used if installed, the standard library ``json`` module otherwise.
+    Pass ``None`` to restore the default.
+    """
+    global _json_loads
+    _json_loads = loads or default_json_loads
+
+
+def json_loads(data):
+    """Decode a JSON document with the configured decoder. See
+    :py:func:`set_json_decoder`."""
+    return _json_loads(data)
+
+
 def stream_as_text(stream):
     """Given a stream of bytes or text, if any of the items in the stream
     are bytes convert them to text.
@@ -38,11 +92,157 @@ def json_splitter(buffer):
 
 
 def json_stream(stream):
-    """Given a stream of text, return a stream of json objects.
+    """Given a stream of bytes or text, return a stream of json objects.
     This handles streams which are inconsistently buffered (some entries may
     be newline delimited, and others are not).
+
+    Each line holding one value, as the Docker API sends them, is decoded
+    with :py:func:`json_loads` as is. Lines which do not, because they hold
+    several values or only part of one, are scanned for the end of each
+    value instead.
     """
-    return split_buffer(stream, json_splitter, json_decoder.decode)
+    scanner = _JSONScanner()
+    for data in stream:
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        size = len(data)
+        start = 0
+        while start < size:
+            end = data.find(b'\n', start) + 1 or size
+            line = data[start:end]
+            start = end
+            if not scanner.pending:
+                value = _decode_line(line, end == size)
+                if value is _BLANK:
+                    continue
+                if value is not _SPLIT:
+                    yield value
+                    continue
+            for value in scanner.feed(line):
+                yield value
+    for value in scanner.close():
+        yield value
+
+
+_BLANK = object()
+_SPLIT = object()
+
+
+def _decode_line(line, last):
+    """Decode ``line`` if it holds exactly one value. Return ``_BLANK`` if
+    it is blank, and ``_SPLIT`` if it must be scanned."""
+    value = line.strip()
+    if not value:
+        return _BLANK
+    if last and not line.endswith(b'\n') and value[-1:] not in _CLOSERS:
+        # The rest of a number or keyword may still be on its way.
+        return _SPLIT
+    try:
+        return json_loads(value)
+    except ValueError:
+        return _SPLIT
+
+
+class _JSONScanner(object):
+    """Finds the end of each top-level value in data fed to it, scanning
+    every byte once however the data is split up, and decodes complete
+    values with :py:func:`json_loads`."""
+
+    def __init__(self):
+        self.buf = bytearray()
+        # The current value starts at ``start``, and ``pos`` is where
+        # scanning resumes when more data arrives.
+        self.start = self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.in_scalar = False
+
+    @property
+    def pending(self):
+        """Whether part of a value has been fed."""
+        return bool(self.buf)
+
+    def feed(self, data):
+        buf = self.buf
+        buf += data
+        size = len(buf)
+        start, pos = self.start, self.pos
+        depth = self.depth
+        in_string, in_scalar = self.in_string, self.in_scalar
+        while pos < size:
+            if in_string:
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = size
+                elif buf[match.start()] == _BACKSLASH:
+                    if match.end() == size:
+                        # Wait for the escaped character
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                else:
+                    pos = match.end()
+                    in_string = False
+                    if not depth:
+                        yield _decode(buf, start, pos)
+                        start = pos
+            elif in_scalar:
+                match = _SCALAR_END.search(buf, pos)
+                if match is None:
+                    pos = size
+                else:
+                    pos = match.start()
+                    in_scalar = False
+                    yield _decode(buf, start, pos)
+                    start = pos
+            elif depth:
+                match = _STRUCTURE.search(buf, pos)
+                if match is None:
+                    pos = size
+                    continue
+                pos = match.end()
+                char = buf[match.start()]
+                if char == _QUOTE:
+                    in_string = True
+                elif char in _OPENERS:
+                    depth += 1
+                else:
+                    depth -= 1
+                    if not depth:
+                        yield _decode(buf, start, pos)
+                        start = pos
+            else:
+                start = pos = _WHITESPACE.match(buf, pos).end()
+                if pos == size:
+                    break
+                char = buf[pos]
+                if char in _OPENERS:
+                    depth = 1
+                    pos += 1
+                elif char == _QUOTE:
+                    in_string = True
+                    pos += 1
+                else:
+                    in_scalar = True
+
+        if start:
+            del buf[:start]
+            pos -= start
+            start = 0
+        self.start, self.pos = start, pos
+        self.depth = depth
+        self.in_string, self.in_scalar = in_string, in_scalar
+
+    def close(self):
+        if self.buf.strip():
+            yield _decode(self.buf, 0, len(self.buf))
+
+
+def _decode(buf, start, end):
+    try:
+        return json_loads(bytes(buf[start:end]))
+    except ValueError as e:
+        raise StreamParseError(e)
 
 
 def line_splitter(buffer, separator=u'\n'):
@@ -59,18 +259,34 @@ def split_buffer(stream, splitter=None, decoder=lambda a: a):
     separator, except for the last one if none was found on the end
     of the input.
     """
-    splitter = splitter or line_splitter
-    buffered = six.text_type('')
-
-    for data in stream_as_text(stream):
-        buffered += data
-        while True:
-            buffer_split = splitter(buffered)
-            if buffer_split is None:
-                break
-
-            item, buffered = buffer_split
-            yield item
+    sep = six.text_type('')
+    if splitter is None:
+        # Split on newlines without rescanning or copying the buffered
+        # part of a line each time more data arrives.
+        pending = []
+        for data in stream_as_text(stream):
+            start = 0
+            index = data.find('\n')
+            while index != -1:
+                pending.append(data[start:index + 1])
+                yield sep.join(pending)
+                pending = []
+                start = index + 1
+                index = data.find('\n', start)
+            if start < len(data):
+                pending.append(data[start:])
+        buffered = sep.join(pending)
+    else:
+        buffered = sep
+        for data in stream_as_text(stream):
+            buffered += data
+            while True:
+                buffer_split = splitter(buffered)
+                if buffer_split is None:
+                    break
+
+                item, buffered = buffer_split
+                yield item
 
     if buffered:
         try:
@@ -0,0 +1,76 @@
+import copy
+import sys
+import threading
+
+import six
+
+from .fork import ForkSafeMixin
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(ForkSafeMixin):
+    """
+    Makes calls with the same key which overlap in time share one execution.
+    The first caller runs the call, and those which arrive before it returns
+    wait for it and get its result, or its exception, instead of running the
+    call again.
+
+    A result which is shared is deep-copied for each caller, so that they
+    can modify it independently.
+
+    Attributes:
+        hits (int): The number of calls that waited for another one.
+        misses (int): The number of calls that were run.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._init_fork_safety()
+
+    def do(self, key, fn):
+        """
+        Return the result of ``fn()``, or of the call with the same ``key``
+        that is already running.
+        """
+        self._check_fork()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.misses += 1
+            else:
+                call.followers += 1
+                self.hits += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                six.reraise(*call.error)
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException:
+            call.error = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.followers > 0
+            call.done.set()
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def _after_fork(self):
+        # The calls in progress were made by threads of the parent, which
+        # the child does not have.
+        self._lock = threading.Lock()
+        self._calls = {}
@@ -5,12 +5,18 @@ import struct
 
 import six
 
+from ..constants import DEFAULT_BLOCK_SIZE, STREAM_HEADER_SIZE_BYTES
+
 try:
     from ..transport import NpipeSocket
 except ImportError:
     NpipeSocket = type(None)
 
 
+STDOUT = 1
+STDERR = 2
+
+
 class SocketError(Exception):
     pass
 
@@ -40,13 +46,15 @@ def read_exactly(socket, n):
     Reads exactly n bytes from socket
     Raises SocketError if there isn't enough data
     """
-    data = six.binary_type()
-    while len(data) < n:
-        next_data = read(socket, n - len(data))
+    data = []
+    missing = n
+    while missing > 0:
+        next_data = read(socket, missing)
         if not next_data:
             raise SocketError("Unexpected EOF")
-        data += next_data
-    return data
+        data.append(next_data)
+        missing -= len(next_data)
+    return six.binary_type().join(data)
 
 
 def next_frame_size(socket):
@@ -65,11 +73,83 @@ def next_frame_size(socket):
     return actual
 
 
-def frames_iter(socket):
+def read_into(socket, view):
+    """
+    Reads at most len(view) bytes from socket into view and returns the
+    number of bytes read. Only waits on select for non-blocking sockets.
+    """
+    recoverable_errors = (errno.EINTR, errno.EDEADLK, errno.EWOULDBLOCK)
+    wait = _is_nonblocking(socket)
+
+    while True:
+        if wait:
+            select.select([socket], [], [])
+        try:
+            if hasattr(socket, 'recv_into'):
+                n = socket.recv_into(view)
+            else:
+                n = socket.readinto(view)
+        except EnvironmentError as e:
+            if e.errno not in recoverable_errors:
+                raise
+            n = None
+        if n is not None:
+            return n
+        wait = not isinstance(socket, NpipeSocket)
+
+
+def _is_nonblocking(socket):
+    if isinstance(socket, NpipeSocket):
+        return False
+    try:
+        return getattr(socket, '_sock', socket).gettimeout() == 0
+    except AttributeError:
+        return False
+
+
+def frames_iter(socket, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Returns a generator of ``(stream, data)`` tuples for the frames read
+    from socket, where ``stream`` is ``STDOUT`` or ``STDERR``.
+
+    Data is read into a reusable buffer of ``block_size`` bytes, grown when
+    a single frame does not fit, and only whole frames are yielded.
+    """
+    buf = bytearray(block_size)
+    start = end = 0
+    required = STREAM_HEADER_SIZE_BYTES
+    while True:
+        while end - start >= STREAM_HEADER_SIZE_BYTES:
+            stream, length = struct.unpack_from('>BxxxL', buf, start)
+            required = STREAM_HEADER_SIZE_BYTES + length
+            if end - start < required:
+                break
+            data_start = start + STREAM_HEADER_SIZE_BYTES
+            start += required
+            required = STREAM_HEADER_SIZE_BYTES
+            yield stream, bytes(buf[data_start:start])
+
+        if start:
+            buf[:end - start] = buf[start:end]
+            end -= start
+            start = 0
+        if required > len(buf):
+            buf.extend(bytearray(required - len(buf)))
+
+        n = read_into(socket, memoryview(buf)[end:])
+        if not n:
+            return
+        end += n
+
+
+def chunks_iter(socket, block_size=DEFAULT_BLOCK_SIZE):
     """
-    Returns a generator of frames read from socket
+    Returns a generator of the data read from socket as it arrives, for
+    connections that are not multiplexed (e.g. when a TTY is allocated).
     """
-    n = next_frame_size(socket)
-    while n > 0:
-        yield read(socket, n)
-        n = next_frame_size(socket)
+    buf = bytearray(block_size)
+    while True:
+        n = read_into(socket, memoryview(buf))
+        if not n:
+            return
+        yield bytes(buf[:n])
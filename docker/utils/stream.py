@@ -0,0 +1,171 @@
+import codecs
+import struct
+
+import six
+
+from ..constants import DEFAULT_BLOCK_SIZE, STREAM_HEADER_SIZE_BYTES
+from .socket import STDERR
+
+
+def read_chunked(fp, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Read a body using the chunked transfer encoding from ``fp`` and return a
+    generator of its decoded payload.
+
+    ``fp`` must provide ``read1``, so that each read returns whatever is
+    already available (up to ``block_size`` bytes) with at most one system
+    call. The chunk framing is parsed here rather than by ``httplib``, and
+    every complete chunk received in a single read is yielded as one block.
+    Payload from a large chunk is yielded as it arrives.
+    """
+    buf = bytearray()
+    pos = 0
+    # Payload bytes left in the current chunk, and whether the CRLF that
+    # terminates it still has to be skipped.
+    left = 0
+    crlf = False
+    done = False
+
+    while not done:
+        data = fp.read1(block_size)
+        if not data:
+            break
+        buf += data
+        out = []
+        while True:
+            if left:
+                take = min(left, len(buf) - pos)
+                if not take:
+                    break
+                out.append(bytes(buf[pos:pos + take]))
+                pos += take
+                left -= take
+                if left:
+                    break
+                crlf = True
+            if crlf:
+                if len(buf) - pos < 2:
+                    break
+                pos += 2
+                crlf = False
+            end = buf.find(b'\r\n', pos)
+            if end < 0:
+                break
+            size = int(bytes(buf[pos:end]).split(b';', 1)[0], 16)
+            pos = end + 2
+            if size == 0:
+                done = True
+                break
+            left = size
+        del buf[:pos]
+        pos = 0
+        if out:
+            yield six.binary_type().join(out)
+
+
+def decode_blocks(blocks):
+    """
+    Given an iterable of UTF-8 encoded byte blocks, return a generator of
+    their text. Characters split across blocks are decoded whole, and
+    invalid sequences are replaced.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    for block in blocks:
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b'', True)
+    if text:
+        yield text
+
+
+def decode_frames(frames):
+    """
+    Like :py:func:`decode_blocks`, for an iterable of ``(stream, data)``
+    tuples. The data of each stream is decoded separately.
+    """
+    decoders = {}
+    for stream, data in frames:
+        decoder = decoders.get(stream)
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder('utf-8')('replace')
+            decoders[stream] = decoder
+        text = decoder.decode(data)
+        if text:
+            yield stream, text
+    for stream, decoder in decoders.items():
+        text = decoder.decode(b'', True)
+        if text:
+            yield stream, text
+
+
+def decode_output(output):
+    """
+    Decode the output returned by ``logs``, ``attach`` or ``exec_start``
+    without streaming: either bytes, or a ``(stdout, stderr)`` tuple of
+    bytes.
+    """
+    if isinstance(output, tuple):
+        return tuple(o.decode('utf-8', 'replace') for o in output)
+    return output.decode('utf-8', 'replace')
+
+
+def iter_lines(blocks):
+    """
+    Given an iterable of byte blocks, return a generator of the complete
+    newline-terminated lines they contain, without the line terminator. A
+    trailing line without a terminator is yielded at the end.
+    """
+    pending = []
+    for block in blocks:
+        start = 0
+        while True:
+            end = block.find(b'\n', start)
+            if end < 0:
+                break
+            pending.append(block[start:end])
+            yield six.binary_type().join(pending)
+            pending = []
+            start = end + 1
+        if start < len(block):
+            pending.append(block[start:])
+    if pending:
+        yield six.binary_type().join(pending)
+
+
+def demux_buffer(buf, separate=False):
+    """
+    Strip the stream headers from a multiplexed ``buf`` (as sent by
+    ``attach`` and ``logs`` for containers without a TTY) and return its
+    payload.
+
+    Headers are unpacked in place and the payload of every frame is
+    referenced through a ``memoryview``, so the only copy made is the one
+    of the returned bytes.
+
+    If ``separate`` is ``True``, return a ``(stdout, stderr)`` tuple
+    instead, each holding the payload of the frames sent on that stream.
+    """
+    view = memoryview(buf)
+    size = len(buf)
+    out = []
+    err = []
+    walker = 0
+    while size - walker >= STREAM_HEADER_SIZE_BYTES:
+        stream, length = struct.unpack_from('>BxxxL', buf, walker)
+        start = walker + STREAM_HEADER_SIZE_BYTES
+        walker = start + length
+        if separate and stream == STDERR:
+            err.append(view[start:walker])
+        else:
+            out.append(view[start:walker])
+
+    if separate:
+        return _join(out), _join(err)
+    return _join(out)
+
+
+def _join(views):
+    if six.PY2:
+        return six.binary_type().join(v.tobytes() for v in views)
+    return six.binary_type().join(views)
@@ -1,7 +1,9 @@
 import base64
+import hashlib
 import io
 import os
 import os.path
+import re
 import json
 import shlex
 import sys
@@ -10,15 +12,26 @@ import tempfile
 import warnings
 from distutils.version import StrictVersion
 from datetime import datetime
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate as fnmatch_translate
 
 import requests
 import six
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 from .. import constants
 from .. import errors
 from .. import tls
 from ..types import Ulimit, LogConfig, Healthcheck
+from .archive import BlockWriter
+from .build_cache import BuildContextStats
+from .compression import gzip_stream
 
 if six.PY2:
     from urllib import splitnport
@@ -135,34 +148,134 @@ def decode_json_header(header):
     return json.loads(data)
 
 
-def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
+def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False,
+        cache=None, gzip_workers=1, gzip_level=9, cache_stats=None):
     if not fileobj:
         fileobj = tempfile.NamedTemporaryFile()
-    t = tarfile.open(mode='w:gz' if gzip else 'w', fileobj=fileobj)
+    for block in tar_stream(path, exclude=exclude, dockerfile=dockerfile,
+                            gzip=gzip, cache=cache, gzip_workers=gzip_workers,
+                            gzip_level=gzip_level, cache_stats=cache_stats):
+        fileobj.write(block)
+    fileobj.seek(0)
+    return fileobj
+
+
+def tar_stream(path, exclude=None, dockerfile=None, gzip=False,
+               chunk_size=constants.DEFAULT_BLOCK_SIZE, cache=None,
+               gzip_workers=1, gzip_level=9, cache_stats=None):
+    """
+    Like :py:func:`tar`, but returns a generator of blocks of the archive
+    instead of a file. The archive is created as the generator is consumed,
+    so nothing is written to disk and memory use is bounded by
+    ``chunk_size``, whatever the size of the files.
+
+    If ``cache`` is a :py:class:`~docker.utils.build_cache.BuildContextCache`,
+    unchanged regular files are copied from it instead of being read. The
+    files of the context are recorded in ``cache_stats``, a
+    :py:class:`~docker.utils.build_cache.BuildContextStats`, if given, which
+    becomes the cache's ``last_build`` once the archive is complete.
+
+    If ``gzip`` is set, the archive is compressed at ``gzip_level`` by
+    ``gzip_workers`` threads, see
+    :py:func:`~docker.utils.compression.gzip_stream`.
+    """
+    blocks = _tar_blocks(
+        path, exclude, dockerfile, chunk_size, cache, cache_stats
+    )
+    if gzip:
+        return gzip_stream(blocks, workers=gzip_workers, level=gzip_level)
+    return blocks
+
+
+def _tar_blocks(path, exclude, dockerfile, chunk_size, cache, stats):
+    sink = BlockWriter()
+    t = tarfile.open(mode='w|', fileobj=sink)
 
     root = os.path.abspath(path)
     exclude = exclude or []
+    if cache is not None and stats is None:
+        stats = BuildContextStats()
 
     for path in sorted(exclude_paths(root, exclude, dockerfile=dockerfile)):
-        i = t.gettarinfo(os.path.join(root, path), arcname=path)
+        full_path = os.path.join(root, path)
+        i = t.gettarinfo(full_path, arcname=path)
 
         if sys.platform == 'win32':
             # Windows doesn't keep track of the execute bit, so we make files
             # and directories executable by default.
             i.mode = i.mode & 0o755 | 0o111
 
-        try:
-            # We open the file object in binary mode for Windows support.
-            f = open(os.path.join(root, path), 'rb')
-        except IOError:
-            # When we encounter a directory the file object is set to None.
-            f = None
+        key = segment = None
+        if cache is not None and i.isreg():
+            st = os.lstat(full_path)
+            key = (
+                i.size, getattr(st, 'st_mtime_ns', st.st_mtime), st.st_ino,
+                i.mode, i.uid, i.gid
+            )
+            segment = cache.get(full_path, key, path, stats)
+
+        # Write the header through tarfile, and the content separately so
+        # that large files can be handed out as they are read.
+        header = i.tobuf(t.format, t.encoding, t.errors)
+        t.fileobj.write(header)
+        t.offset += len(header)
+        t.members.append(i)
+
+        if segment is not None:
+            # The segment holds the content and padding of the file.
+            t.offset += len(segment)
+            for offset in range(0, len(segment), chunk_size):
+                t.fileobj.write(segment[offset:offset + chunk_size])
+                if sink.size >= chunk_size:
+                    yield sink.getvalue()
+        elif i.isreg():
+            parts = None
+            if key is not None:
+                digest = hashlib.sha256()
+                records = -(-i.size // tarfile.BLOCKSIZE)
+                if cache.fits(records * tarfile.BLOCKSIZE):
+                    parts = []
+            with open(full_path, 'rb') as f:
+                left = i.size
+                while left:
+                    data = f.read(min(chunk_size, left))
+                    if not data:
+                        raise IOError(
+                            '{0} was truncated while being archived'.format(
+                                full_path
+                            )
+                        )
+                    t.fileobj.write(data)
+                    left -= len(data)
+                    if key is not None:
+                        digest.update(data)
+                        if parts is not None:
+                            parts.append(data)
+                    if sink.size >= chunk_size:
+                        yield sink.getvalue()
+            blocks, remainder = divmod(i.size, tarfile.BLOCKSIZE)
+            if remainder:
+                padding = tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+                t.fileobj.write(padding)
+                blocks += 1
+                if parts is not None:
+                    parts.append(padding)
+            t.offset += blocks * tarfile.BLOCKSIZE
+            if key is not None:
+                cache.put(
+                    full_path, key, path, digest.hexdigest(), stats,
+                    None if parts is None else
+                    six.binary_type().join(parts)
+                )
 
-        t.addfile(i, f)
+        if sink.size >= chunk_size:
+            yield sink.getvalue()
 
     t.close()
-    fileobj.seek(0)
-    return fileobj
+    if cache is not None:
+        cache.finish(stats)
+    if sink.size:
+        yield sink.getvalue()
 
 
 def exclude_paths(root, patterns, dockerfile=None):
@@ -215,46 +328,164 @@ def should_include(path, exclude_patterns, include_patterns):
 
 
 def get_paths(root, exclude_patterns, include_patterns, has_exceptions=False):
-    paths = []
+    """
+    Return the paths under ``root`` that :py:func:`should_include` accepts.
 
-    for parent, dirs, files in os.walk(root, topdown=True, followlinks=False):
-        parent = os.path.relpath(parent, root)
-        if parent == '.':
-            parent = ''
-
-        # If exception rules exist, we can't skip recursing into ignored
-        # directories, as we need to look for exceptions in them.
-        #
-        # It may be possible to optimize this further for exception patterns
-        # that *couldn't* match within ignored directores.
-        #
-        # This matches the current docker logic (as of 2015-11-24):
-        # https://github.com/docker/docker/blob/37ba67bf636b34dc5c0c0265d62a089d0492088f/pkg/archive/archive.go#L555-L557
-
-        if not has_exceptions:
-
-            # Remove excluded patterns from the list of directories to traverse
-            # by mutating the dirs we're iterating over.
-            # This looks strange, but is considered the correct way to skip
-            # traversal. See https://docs.python.org/2/library/os.html#os.walk
-
-            dirs[:] = [d for d in dirs if
-                       should_include(os.path.join(parent, d),
-                                      exclude_patterns, include_patterns)]
-
-        for path in dirs:
-            if should_include(os.path.join(parent, path),
-                              exclude_patterns, include_patterns):
-                paths.append(os.path.join(parent, path))
-
-        for path in files:
-            if should_include(os.path.join(parent, path),
-                              exclude_patterns, include_patterns):
-                paths.append(os.path.join(parent, path))
+    Excluded directories are not walked into unless one of the
+    ``include_patterns`` could match something below them, whether or not
+    ``has_exceptions`` is set.
+    """
+    matcher = PatternMatcher(exclude_patterns, include_patterns)
+    paths = []
+    # Directories still to walk, with their path relative to root as a list
+    # of components.
+    stack = [[]]
+    while stack:
+        components = stack.pop()
+        for name, is_dir, is_link in _list_dir(
+            os.path.join(root, *components)
+        ):
+            path_components = components + [name]
+            included = matcher.includes(path_components)
+            if included:
+                paths.append(os.path.join(*path_components))
+            # os.walk(followlinks=False) semantics: symbolic links to
+            # directories are returned but not walked into.
+            if is_dir and not is_link and (
+                included or matcher.may_include_below(path_components)
+            ):
+                stack.append(path_components)
 
     return paths
 
 
+def _list_dir(path):
+    """
+    Return a ``(name, is_dir, is_symlink)`` tuple for each entry of the
+    directory at ``path``, using ``scandir`` where available to avoid a
+    ``stat`` call per entry.
+    """
+    if scandir is not None:
+        try:
+            entries = list(scandir(path))
+        except OSError:
+            return []
+        return [(e.name, _is_dir(e), e.is_symlink()) for e in entries]
+
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return []
+    result = []
+    for name in names:
+        full_path = os.path.join(path, name)
+        result.append(
+            (name, os.path.isdir(full_path), os.path.islink(full_path))
+        )
+    return result
+
+
+def _is_dir(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _normalize_pattern(pattern):
+    pattern = pattern.rstrip('/')
+    if pattern:
+        pattern = os.path.relpath(pattern)
+    return pattern
+
+
+class PatternMatcher(object):
+    """
+    The rules of :py:func:`should_include`, compiled once. A pattern matches
+    a path if it matches its first components, as many as the pattern has
+    (see :py:func:`match_path`). Patterns are grouped by their number of
+    components and each group is compiled into a single regular expression.
+    """
+    def __init__(self, exclude_patterns, include_patterns):
+        self.exclude = self._compile(exclude_patterns)
+        self.include = self._compile(include_patterns)
+        # Per include pattern, one regular expression for each of its
+        # components, used to tell whether it could match below a
+        # directory. None when that can't be decided component by component.
+        self.include_components = []
+        for pattern in include_patterns:
+            pattern = _normalize_pattern(pattern)
+            if '[' in pattern:
+                self.include_components.append(None)
+            else:
+                self.include_components.append([
+                    re.compile(_translate(component))
+                    for component in pattern.split(os.path.sep)
+                ])
+
+    @staticmethod
+    def _compile(patterns):
+        groups = {}
+        for pattern in patterns:
+            pattern = _normalize_pattern(pattern)
+            count = len(pattern.split(os.path.sep))
+            groups.setdefault(count, []).append(_translate(pattern))
+        return [
+            (count, re.compile(
+                _FNMATCH_FLAGS + '|'.join(
+                    '(?:{0})'.format(p) for p in sorted(set(regexes))
+                )
+            ))
+            for count, regexes in sorted(groups.items())
+        ]
+
+    @staticmethod
+    def _matches(groups, components):
+        for count, regex in groups:
+            if regex.match(os.path.normcase('/'.join(components[:count]))):
+                return True
+        return False
+
+    def includes(self, components):
+        """
+        Whether the path made of ``components`` is included.
+        """
+        if not self._matches(self.exclude, components):
+            return True
+        return self._matches(self.include, components)
+
+    def may_include_below(self, components):
+        """
+        Whether an include pattern could match a path below the directory
+        made of ``components``.
+        """
+        depth = len(components)
+        for regexes in self.include_components:
+            if regexes is None:
+                return True
+            # Both the pattern and the path prefix it is matched against have
+            # as many separators, so wildcards never match one and the
+            # pattern can be matched component by component.
+            if len(regexes) > depth and all(
+                regex.match(os.path.normcase(component))
+                for regex, component in zip(regexes, components)
+            ):
+                return True
+        return False
+
+
+def _translate(pattern):
+    regex = fnmatch_translate(os.path.normcase(pattern))
+    # Python 2 appends the flags to the expression, which can't be done
+    # inside of a group. They are added once to the combined expression.
+    if regex.endswith(_FNMATCH_FLAGS):
+        regex = regex[:-len(_FNMATCH_FLAGS)]
+    return regex
+
+
+_FNMATCH_FLAGS = '(?ms)'
+
+
 def match_path(path, pattern):
     pattern = pattern.rstrip('/')
     if pattern:
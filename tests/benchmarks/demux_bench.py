@@ -0,0 +1,53 @@
+"""
+Measure the time and peak memory needed to strip the stream headers from a
+synthetic multiplexed ``logs`` body, as done for ``logs(stream=False)`` on a
+container without a TTY.
+
+Usage: python tests/benchmarks/demux_bench.py [size_mb] [frame_size]
+"""
+import struct
+import sys
+import time
+import tracemalloc
+
+from docker.utils.stream import demux_buffer
+
+
+def make_body(size, frame_size):
+    payload = b'x' * (frame_size - 1) + b'\n'
+    frames = []
+    for i in range(size // frame_size):
+        frames.append(struct.pack('>BxxxL', 1 + i % 2, frame_size))
+        frames.append(payload)
+    return b''.join(frames)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.time()
+    result = func(*args)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    size = int(sys.argv[1] if len(sys.argv) > 1 else 500) * 1024 * 1024
+    frame_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    body = make_body(size, frame_size)
+    mb = len(body) / 1024.0 / 1024.0
+    print('body: {0:.0f} MB, {1} frames'.format(mb, size // frame_size))
+
+    for separate in (False, True):
+        result, elapsed, peak = measure(demux_buffer, body, separate)
+        print('separate={0!s:<5} {1:8.2f} s {2:10.1f} MB/s '
+              'peak {3:8.1f} MB'.format(
+                  separate, elapsed, mb / elapsed, peak / 1024.0 / 1024.0
+              ))
+        del result
+
+
+if __name__ == '__main__':
+    main()
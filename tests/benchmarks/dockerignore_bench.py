@@ -0,0 +1,79 @@
+"""
+Measure how long ``exclude_paths`` takes on a synthetic build context of
+about 200k files, most of them under an ignored ``node_modules`` directory,
+with a ``.dockerignore`` that contains an exception rule. The legacy
+algorithm (``os.walk`` and ``should_include`` for every path, without
+pruning) is timed for comparison.
+
+Usage: python tests/benchmarks/dockerignore_bench.py [files]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from docker.utils.utils import exclude_paths, should_include
+
+PATTERNS = ['node_modules', '*.log', '**/*.tmp', '!src/keep.log']
+
+
+def make_tree(base, count):
+    per_dir = 100
+    for i in range(count // per_dir):
+        if i % 20 == 0:
+            parent = os.path.join(base, 'src', 'pkg{0}'.format(i))
+        else:
+            parent = os.path.join(
+                base, 'node_modules', 'mod{0}'.format(i // 10), str(i)
+            )
+        os.makedirs(parent)
+        for j in range(per_dir):
+            open(os.path.join(parent, 'f{0}.js'.format(j)), 'w').close()
+    open(os.path.join(base, 'src', 'keep.log'), 'w').close()
+    open(os.path.join(base, 'Dockerfile'), 'w').close()
+
+
+def legacy_exclude_paths(root, patterns):
+    exceptions = [p for p in patterns if p.startswith('!')]
+    include_patterns = [p[1:] for p in exceptions]
+    include_patterns += ['Dockerfile', '.dockerignore']
+    exclude_patterns = list(set(patterns) - set(exceptions))
+    paths = []
+    for parent, dirs, files in os.walk(root):
+        parent = os.path.relpath(parent, root)
+        if parent == '.':
+            parent = ''
+        for path in dirs + files:
+            path = os.path.join(parent, path)
+            if should_include(path, exclude_patterns, include_patterns):
+                paths.append(path)
+    return set(paths)
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    base = tempfile.mkdtemp()
+    try:
+        make_tree(base, count)
+        paths, elapsed = timed(exclude_paths, base, PATTERNS)
+        print('exclude_paths: {0:8.2f} s ({1} paths)'.format(
+            elapsed, len(paths)
+        ))
+        legacy, elapsed = timed(legacy_exclude_paths, base, PATTERNS)
+        print('legacy:        {0:8.2f} s ({1} paths)'.format(
+            elapsed, len(legacy)
+        ))
+        assert paths == legacy
+    finally:
+        shutil.rmtree(base)
+
+
+if __name__ == '__main__':
+    main()
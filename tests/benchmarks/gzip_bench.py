@@ -0,0 +1,46 @@
+"""
+Measure the throughput of ``gzip_stream`` with an increasing number of
+workers, on synthetic data about as compressible as source code.
+
+Usage: python tests/benchmarks/gzip_bench.py [size_mb] [level]
+"""
+import os
+import random
+import sys
+import time
+
+from docker.utils.compression import gzip_stream
+
+
+def make_data(size):
+    words = [os.urandom(3).hex().encode('ascii') for _ in range(4096)]
+    rand = random.Random(0)
+    data = []
+    total = 0
+    while total < size:
+        word = rand.choice(words) + b' '
+        data.append(word)
+        total += len(word)
+    return b''.join(data)
+
+
+def main():
+    size = int(sys.argv[1] if len(sys.argv) > 1 else 200) * 1024 * 1024
+    level = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+
+    data = make_data(size)
+    blocks = [data[i:i + 65536] for i in range(0, len(data), 65536)]
+    mb = len(data) / 1024.0 / 1024.0
+    for workers in (1, 2, 4, 8):
+        start = time.time()
+        compressed = sum(
+            len(b) for b in gzip_stream(blocks, workers=workers, level=level)
+        )
+        elapsed = time.time() - start
+        print('workers={0:<2} {1:8.2f} s {2:8.1f} MB/s ratio {3:.3f}'.format(
+            workers, elapsed, mb / elapsed, compressed / float(len(data))
+        ))
+
+
+if __name__ == '__main__':
+    main()
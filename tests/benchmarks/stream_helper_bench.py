@@ -0,0 +1,85 @@
+"""
+Measure how many decoded events per second ``APIClient.events`` yields with
+and without ``buffered=True``, against a fake daemon on a UNIX socket that
+sends each event as its own HTTP chunk.
+
+Usage: python tests/benchmarks/stream_helper_bench.py [events] [rounds]
+"""
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import docker
+
+
+def make_body(count):
+    event = json.dumps({
+        'status': 'start', 'id': 'a' * 64, 'from': 'busybox:latest',
+        'Type': 'container', 'Action': 'start', 'time': 1480000000,
+    }).encode('ascii') + b'\n'
+    chunk = '{0:x}\r\n'.format(len(event)).encode('ascii') + event + b'\r\n'
+    return (
+        b'HTTP/1.1 200 OK\r\n'
+        b'Content-Type: application/json\r\n'
+        b'Transfer-Encoding: chunked\r\n\r\n'
+    ) + chunk * count + b'0\r\n\r\n'
+
+
+def serve(sock, body):
+    while True:
+        try:
+            conn, _ = sock.accept()
+        except socket.error:
+            return
+        data = b''
+        while b'\r\n\r\n' not in data:
+            data += conn.recv(4096)
+        conn.sendall(body)
+        conn.close()
+
+
+def run(client, count, buffered):
+    start = time.time()
+    received = 0
+    for event in client.events(decode=True, buffered=buffered):
+        received += 1
+    elapsed = time.time() - start
+    assert received == count, (received, count)
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    socket_dir = tempfile.mkdtemp()
+    socket_file = os.path.join(socket_dir, 'docker.sock')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_file)
+    sock.listen(8)
+    thread = threading.Thread(target=serve, args=(sock, make_body(count)))
+    thread.daemon = True
+    thread.start()
+
+    try:
+        client = docker.APIClient(
+            base_url='unix://' + socket_file,
+            version=docker.constants.DEFAULT_DOCKER_API_VERSION
+        )
+        for buffered in (False, True):
+            best = max(run(client, count, buffered) for _ in range(rounds))
+            print('buffered={0!s:<5} {1:>12,.0f} events/s'.format(
+                buffered, best
+            ))
+    finally:
+        sock.close()
+        shutil.rmtree(socket_dir)
+
+
+if __name__ == '__main__':
+    main()
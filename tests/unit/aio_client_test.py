@@ -0,0 +1,266 @@
+import json
+import os
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import unittest
+
+import docker
+import pytest
+
+if sys.version_info >= (3, 6):
+    import asyncio
+    from docker.aio import AsyncAPIClient
+
+from . import fake_api
+
+pytestmark = [
+    pytest.mark.skipif(
+        sys.version_info < (3, 6), reason='asyncio client requires 3.6+'
+    ),
+    pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    ),
+]
+
+url_prefix = '/v{0}/'.format(docker.constants.DEFAULT_DOCKER_API_VERSION)
+
+
+def http_response(body, status='200 OK', content_type='application/json',
+                  chunks=None):
+    head = 'HTTP/1.1 {0}\r\nContent-Type: {1}\r\n'.format(
+        status, content_type
+    ).encode('ascii')
+    if chunks is None:
+        return head + 'Content-Length: {0}\r\n\r\n'.format(
+            len(body)
+        ).encode('ascii') + body
+    data = b''
+    for chunk in chunks:
+        data += '{0:x}\r\n'.format(len(chunk)).encode('ascii') + chunk
+        data += b'\r\n'
+    return head + b'Transfer-Encoding: chunked\r\n\r\n' + data + b'0\r\n\r\n'
+
+
+class FakeDaemon(object):
+    """
+    A minimal keep-alive HTTP server on a UNIX socket, answering requests
+    from a ``{(method, path): response_bytes}`` mapping.
+    """
+    def __init__(self, socket_file, responses):
+        self.responses = responses
+        self.requests = []
+        self.connections = 0
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(socket_file)
+        self.sock.listen(64)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.error:
+                return
+            self.connections += 1
+            t = threading.Thread(target=self.handle, args=(conn,))
+            t.daemon = True
+            t.start()
+
+    def handle(self, conn):
+        data = b''
+        try:
+            while True:
+                while b'\r\n\r\n' not in data:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        return
+                    data += chunk
+                head, data = data.split(b'\r\n\r\n', 1)
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, _ = lines[0].split(' ')
+                length = 0
+                for line in lines[1:]:
+                    key, _, value = line.partition(':')
+                    if key.lower() == 'content-length':
+                        length = int(value)
+                while len(data) < length:
+                    data += conn.recv(4096)
+                data = data[length:]
+                self.requests.append((method, path))
+                conn.sendall(self.responses[(method, path.split('?')[0])])
+        finally:
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+class AsyncAPIClientTest(unittest.TestCase):
+    def setUp(self):
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        self.socket_file = os.path.join(socket_dir, 'docker.sock')
+        self.responses = {}
+        self.daemon = FakeDaemon(self.socket_file, self.responses)
+        self.addCleanup(self.daemon.close)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.addCleanup(self.loop.close)
+        self.client = AsyncAPIClient(
+            base_url='unix://' + self.socket_file, max_pool_size=4
+        )
+        self.addCleanup(self.client.close)
+
+    def run_coroutine(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def collect(self, agen):
+        items = []
+        while True:
+            try:
+                items.append(self.run_coroutine(agen.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    def respond(self, method, path, *args, **kwargs):
+        self.responses[(method, url_prefix + path)] = http_response(
+            *args, **kwargs
+        )
+
+    def test_inspect_container(self):
+        inspect = fake_api.get_fake_inspect_container()[1]
+        self.respond(
+            'GET', 'containers/3cc2351ab11b/json',
+            json.dumps(inspect).encode('utf-8')
+        )
+        result = self.run_coroutine(
+            self.client.inspect_container('3cc2351ab11b')
+        )
+        self.assertEqual(result, inspect)
+
+    def test_not_found(self):
+        self.respond(
+            'GET', 'containers/nope/json',
+            b'{"message": "No such container: nope"}',
+            status='404 Not Found'
+        )
+        with pytest.raises(docker.errors.NotFound) as excinfo:
+            self.run_coroutine(self.client.inspect_container('nope'))
+        assert 'No such container' in str(excinfo.value)
+
+    def test_connection_reuse(self):
+        self.respond('GET', '_ping', b'OK', content_type='text/plain')
+        for _ in range(3):
+            self.assertTrue(self.run_coroutine(self.client.ping()))
+        self.assertEqual(self.daemon.connections, 1)
+        self.assertEqual(len(self.daemon.requests), 3)
+
+    def test_concurrent_requests_share_bounded_pool(self):
+        self.respond('GET', '_ping', b'OK', content_type='text/plain')
+        results = self.run_coroutine(asyncio.gather(
+            *[self.client.ping() for _ in range(20)]
+        ))
+        self.assertEqual(results, [True] * 20)
+        self.assertLessEqual(self.daemon.connections, 4)
+
+    def test_empty_responses_keep_the_connection(self):
+        self.respond('POST', 'containers/3cc2351ab11b/start', b'',
+                     status='204 No Content')
+        self.respond('POST', 'containers/3cc2351ab11b/stop', b'',
+                     status='304 Not Modified')
+        for _ in range(2):
+            self.run_coroutine(self.client.start('3cc2351ab11b'))
+            self.run_coroutine(self.client.stop('3cc2351ab11b'))
+        self.assertEqual(self.daemon.connections, 1)
+
+    def test_timeout_applies_to_the_body(self):
+        self.responses[('GET', url_prefix + '_ping')] = (
+            b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nOK'
+        )
+        client = AsyncAPIClient(
+            base_url='unix://' + self.socket_file, timeout=0.1
+        )
+        self.addCleanup(client.close)
+        with pytest.raises(asyncio.TimeoutError):
+            self.run_coroutine(client.ping())
+
+    def test_create_container_detects_the_version(self):
+        self.responses[('GET', '/version')] = http_response(json.dumps({
+            'ApiVersion': docker.constants.DEFAULT_DOCKER_API_VERSION
+        }).encode('utf-8'))
+        self.respond(
+            'POST', 'containers/create',
+            json.dumps(fake_api.post_fake_create_container()[1]).encode(
+                'utf-8'
+            )
+        )
+        client = AsyncAPIClient(
+            base_url='unix://' + self.socket_file, version='auto'
+        )
+        self.addCleanup(client.close)
+        with pytest.raises(docker.errors.DockerException):
+            client.create_host_config(mem_limit='1g')
+
+        result = self.run_coroutine(client.create_container(
+            'busybox', host_config={'Memory': 1024}
+        ))
+        self.assertEqual(result, {'Id': fake_api.FAKE_CONTAINER_ID})
+        self.assertEqual(self.daemon.requests[0], ('GET', '/version'))
+        self.assertEqual(
+            client.create_host_config(mem_limit='1g'),
+            {'Memory': 1024 ** 3, 'NetworkMode': 'default'}
+        )
+
+    def test_events_decode(self):
+        events = [{'status': 'start', 'id': 'a'}, {'status': 'die', 'id': 'b'}]
+        body = b''.join(
+            json.dumps(e).encode('utf-8') + b'\n' for e in events
+        )
+        self.respond(
+            'GET', 'events', None,
+            chunks=[body[:10], body[10:30], body[30:]]
+        )
+        result = self.collect(self.client.events(decode=True))
+        self.assertEqual(result, events)
+
+    def test_events_decode_long_lines(self):
+        events = [{'id': 'a' * 10000}, {'id': 'b'}, {'id': 'c'}]
+        body = b''.join(
+            json.dumps(e).encode('utf-8') + b'\n' for e in events
+        )[:-1]
+        self.respond(
+            'GET', 'events', None,
+            chunks=[body[i:i + 100] for i in range(0, len(body), 100)]
+        )
+        result = self.collect(self.client.events(decode=True))
+        self.assertEqual(result, events)
+
+    def test_logs_stream_multiplexed(self):
+        inspect = fake_api.get_fake_inspect_container(tty=False)[1]
+        self.respond(
+            'GET', 'containers/3cc2351ab11b/json',
+            json.dumps(inspect).encode('utf-8')
+        )
+        frames = b''.join(
+            struct.pack('>BxxxL', stream, len(data)) + data
+            for stream, data in [(1, b'hello '), (2, b'world'), (1, b'!\n')]
+        )
+        self.respond(
+            'GET', 'containers/3cc2351ab11b/logs', None,
+            content_type='application/vnd.docker.raw-stream',
+            chunks=[frames[:5], frames[5:17], frames[17:]]
+        )
+        result = self.collect(
+            self.client.logs('3cc2351ab11b', stream=True)
+        )
+        self.assertEqual(result, [b'hello ', b'world', b'!\n'])
+
+        result = self.run_coroutine(self.client.logs('3cc2351ab11b'))
+        self.assertEqual(result, b'hello world!\n')
@@ -2,14 +2,16 @@
 
 import datetime
 import json
+import shutil
 import signal
+import tarfile
 
 import docker
 import pytest
 import six
 
 from . import fake_api
-from ..helpers import requires_api_version
+from ..helpers import make_tree, requires_api_version
 from .api_test import (
     BaseAPIClientTest, url_prefix, fake_request, DEFAULT_TIMEOUT_SECONDS,
     fake_inspect_container
@@ -1238,6 +1240,42 @@ class ContainerTest(BaseAPIClientTest):
             'Flowering Nights\n(Sakuya Iyazoi)\n'.encode('ascii')
         )
 
+    def test_logs_demux(self):
+        with mock.patch('docker.api.client.APIClient.inspect_container',
+                        fake_inspect_container):
+            logs = self.client.logs(fake_api.FAKE_CONTAINER_ID, demux=True)
+
+        self.assertEqual(
+            logs,
+            ('Flowering Nights\n(Sakuya Iyazoi)\n'.encode('ascii'), b'')
+        )
+
+    def test_logs_decode(self):
+        with mock.patch('docker.api.client.APIClient.inspect_container',
+                        fake_inspect_container):
+            logs = self.client.logs(
+                fake_api.FAKE_CONTAINER_ID, demux=True, decode=True
+            )
+
+        self.assertEqual(
+            logs, (u'Flowering Nights\n(Sakuya Iyazoi)\n', u'')
+        )
+
+    @mock.patch('docker.api.client.APIClient._post')
+    def test_attach_inspects_only_to_demux(self, _post):
+        inspect = mock.Mock(return_value={'Config': {'Tty': True}})
+        with mock.patch('docker.api.client.APIClient.inspect_container',
+                        inspect), \
+                mock.patch('docker.api.client.APIClient._read_from_socket',
+                           return_value=(b'', b'')) as read:
+            self.client.attach(fake_api.FAKE_CONTAINER_ID)
+            self.assertFalse(inspect.called)
+            self.assertEqual(read.call_args[0][1:4], (False, False, False))
+
+            self.client.attach(fake_api.FAKE_CONTAINER_ID, demux=True)
+            inspect.assert_called_once_with(fake_api.FAKE_CONTAINER_ID)
+            self.assertEqual(read.call_args[0][1:4], (False, True, True))
+
     def test_logs_with_dict_instead_of_id(self):
         with mock.patch('docker.api.client.APIClient.inspect_container',
                         fake_inspect_container):
@@ -1562,6 +1600,65 @@ class ContainerTest(BaseAPIClientTest):
                 excinfo.value.args[0], 'image or container param is undefined'
             )
 
+    def test_inspect_containers_with_summary_fields(self):
+        web = {'Id': 'ab' * 32, 'Names': ['/web', '/cafe/db'],
+               'ImageID': 'sha256:' + 'ef' * 32, 'State': 'running'}
+        cafe = {'Id': 'cd' * 32, 'Names': ['/cafe'],
+                'ImageID': 'sha256:' + 'ef' * 32, 'State': 'exited'}
+
+        def containers(all=False, filters=None):
+            assert all
+            if 'id' in filters:
+                return [c for c in (web, cafe)
+                        if any(c['Id'].startswith(i) for i in filters['id'])]
+            return [c for c in (web, cafe)
+                    if c['Names'][0][1:] in filters['name']]
+
+        with mock.patch.object(self.client, 'containers',
+                               side_effect=containers) as list_containers:
+            results = self.client.inspect_containers(
+                ['abab', 'cafe', 'web', 'missing', None],
+                fields=['Id', 'Name']
+            )
+
+        web_result = {'Id': web['Id'], 'Name': '/web',
+                      'Image': web['ImageID']}
+        cafe_result = {'Id': cafe['Id'], 'Name': '/cafe',
+                       'Image': cafe['ImageID']}
+        assert results[:3] == [web_result, cafe_result, web_result]
+        assert isinstance(results[3], docker.errors.NotFound)
+        assert isinstance(results[4], docker.errors.NullResource)
+        assert list_containers.call_args_list == [
+            mock.call(all=True, filters={'id': ['abab', 'cafe']}),
+            mock.call(all=True, filters={'name': ['cafe', 'missing']}),
+        ]
+
+    def test_inspect_containers_state_is_inspected(self):
+        with mock.patch.object(self.client, 'containers') as list_containers:
+            with mock.patch.object(self.client, 'inspect_container',
+                                   return_value={'State': {}}):
+                results = self.client.inspect_containers(
+                    ['web'], fields=['Id', 'State']
+                )
+        assert results == [{'State': {}}]
+        assert not list_containers.called
+
+    def test_inspect_containers_fans_out(self):
+        def inspect(container):
+            if container == 'missing':
+                raise docker.errors.NotFound('No such container')
+            return {'Id': container, 'Config': {}}
+
+        with mock.patch.object(self.client, 'inspect_container',
+                               side_effect=inspect):
+            results = self.client.inspect_containers(
+                ['a', 'missing', 'b'], fields=['Config'], max_workers=2
+            )
+
+        assert results[0] == {'Id': 'a', 'Config': {}}
+        assert isinstance(results[1], docker.errors.NotFound)
+        assert results[2] == {'Id': 'b', 'Config': {}}
+
     def test_container_stats(self):
         self.client.stats(fake_api.FAKE_CONTAINER_ID)
 
@@ -1609,3 +1706,22 @@ class ContainerTest(BaseAPIClientTest):
         self.assertEqual(
             args[1]['headers']['Content-Type'], 'application/json'
         )
+
+    def test_put_directory(self):
+        base = make_tree(['foo'], ['Dockerfile', 'foo/a.py'])
+        self.addCleanup(shutil.rmtree, base)
+        with mock.patch.object(
+            self.client, 'put_archive', return_value=True
+        ) as put_archive:
+            result = self.client.put_directory(
+                fake_api.FAKE_CONTAINER_ID, '/app', base, exclude=['foo'],
+                gzip=True, gzip_workers=2
+            )
+        assert result is True
+        container, path, data = put_archive.call_args[0]
+        assert container == fake_api.FAKE_CONTAINER_ID
+        assert path == '/app'
+        archive = tarfile.open(
+            fileobj=six.BytesIO(b''.join(data)), mode='r:gz'
+        )
+        assert archive.getnames() == ['Dockerfile']
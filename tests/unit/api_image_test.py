@@ -3,9 +3,10 @@ import pytest
 
 from . import fake_api
 from docker import auth
+from docker.utils import ImageCache
 from .api_test import (
     BaseAPIClientTest, fake_request, DEFAULT_TIMEOUT_SECONDS, url_prefix,
-    fake_resolve_authconfig
+    fake_resolve_authconfig, response
 )
 
 try:
@@ -207,6 +208,60 @@ class ImageTest(BaseAPIClientTest):
                 excinfo.value.args[0], 'image or container param is undefined'
             )
 
+    def test_inspect_images_with_summary_fields(self):
+        busybox = {'Id': 'sha256:' + 'ab' * 32, 'ParentId': '',
+                   'RepoTags': ['busybox:latest'],
+                   'RepoDigests': ['<none>@<none>'],
+                   'Size': 1, 'VirtualSize': 1, 'Created': 0}
+        inspected = {'Id': 'sha256:' + 'ac' * 32, 'Parent': '',
+                     'RepoTags': [], 'RepoDigests': [],
+                     'Size': 2, 'VirtualSize': 2, 'Created': '2016'}
+
+        def inspect(image):
+            if image == 'nope':
+                raise docker.errors.ImageNotFound('No such image')
+            return inspected
+
+        self.client._version = '1.25'
+        with mock.patch.object(self.client, 'images',
+                               return_value=[busybox]) as images:
+            with mock.patch.object(self.client, 'inspect_image',
+                                   side_effect=inspect) as inspect_image:
+                results = self.client.inspect_images(
+                    ['busybox', 'aca', 'nope', None],
+                    fields=['Id', 'RepoTags']
+                )
+
+        images.assert_called_once_with(
+            filters={'reference': ['busybox', 'nope']}
+        )
+        assert sorted(c[0][0] for c in inspect_image.call_args_list) == [
+            'aca', 'nope'
+        ]
+        assert results[0] == {
+            'Id': busybox['Id'], 'Parent': '', 'RepoTags': ['busybox:latest'],
+            'RepoDigests': [], 'Size': 1, 'VirtualSize': 1,
+        }
+        del inspected['Created']
+        assert results[1] == inspected
+        assert isinstance(results[2], docker.errors.ImageNotFound)
+        assert isinstance(results[3], docker.errors.NullResource)
+
+    def test_inspect_images_without_reference_filter(self):
+        self.client._version = '1.24'
+        with mock.patch.object(self.client, 'images') as images:
+            results = self.client.inspect_images(
+                [fake_api.FAKE_IMAGE_NAME], fields=['Id']
+            )
+        assert not images.called
+        assert results[0]['Id'] == fake_api.FAKE_IMAGE_ID
+
+    def test_inspect_images_fans_out(self):
+        results = self.client.inspect_images(
+            [fake_api.FAKE_IMAGE_NAME, fake_api.FAKE_IMAGE_NAME]
+        )
+        assert [r['Id'] for r in results] == [fake_api.FAKE_IMAGE_ID] * 2
+
     def test_insert_image(self):
         try:
             self.client.insert(fake_api.FAKE_IMAGE_NAME,
@@ -371,3 +426,122 @@ class ImageTest(BaseAPIClientTest):
             data='Byte Stream....',
             timeout=DEFAULT_TIMEOUT_SECONDS
         )
+
+
+class ImageCacheTest(BaseAPIClientTest):
+    image_id = 'sha256:' + 'a' * 64
+
+    def setUp(self):
+        super(ImageCacheTest, self).setUp()
+        self.client.image_cache = ImageCache()
+        self.requests = []
+        self.responses = {
+            'images/busybox/json': {'Id': self.image_id},
+            'images/{0}/json'.format(self.image_id): {'Id': self.image_id},
+            'images/{0}/history'.format(self.image_id): [
+                {'Id': self.image_id, 'CreatedBy': '/bin/sh'}
+            ],
+            'images/busybox': [
+                {'Untagged': 'busybox:latest'}, {'Deleted': self.image_id}
+            ],
+        }
+
+        def request(url, *args, **kwargs):
+            path = url[len(url_prefix):]
+            self.requests.append(path)
+            return response(content=self.responses[path])
+
+        self.client._get = request
+        self.client._delete = request
+        self.client._post = mock.Mock(return_value=response(201))
+
+    def test_inspect_image_by_id(self):
+        for _ in range(3):
+            result = self.client.inspect_image(self.image_id)
+        assert result == {'Id': self.image_id}
+        assert self.requests == ['images/{0}/json'.format(self.image_id)]
+
+    def test_inspect_image_by_name(self):
+        self.client.inspect_image('busybox')
+        self.client.inspect_image('busybox')
+        self.client.inspect_image(self.image_id)
+        assert self.requests == ['images/busybox/json']
+
+    def test_history_by_name(self):
+        self.client.history('busybox')
+        history = self.client.history('busybox')
+        assert history[0]['CreatedBy'] == '/bin/sh'
+        assert self.requests == [
+            'images/busybox/json',
+            'images/{0}/history'.format(self.image_id),
+        ]
+
+    def test_remove_image_invalidates(self):
+        self.client.inspect_image(self.image_id)
+        self.client.remove_image('busybox')
+        self.client.inspect_image(self.image_id)
+        assert self.requests == [
+            'images/{0}/json'.format(self.image_id),
+            'images/busybox/json',
+            'images/busybox',
+            'images/{0}/json'.format(self.image_id),
+        ]
+
+    def test_untag_invalidates_the_resolved_id(self):
+        # Only a tag is removed, so the response names no ID.
+        self.responses['images/busybox'] = [{'Untagged': 'busybox:latest'}]
+        self.client.inspect_image('busybox')
+        self.client.remove_image('busybox')
+        self.client.inspect_image(self.image_id)
+        assert self.requests == [
+            'images/busybox/json',
+            'images/busybox',
+            'images/{0}/json'.format(self.image_id),
+        ]
+
+    def test_tag_invalidates(self):
+        self.client.inspect_image('busybox')
+        self.client.tag(self.image_id, 'busybox', 'v1')
+        self.client.inspect_image('busybox')
+        assert self.requests == ['images/busybox/json'] * 2
+
+    def test_tag_by_expired_name_invalidates(self):
+        self.client.inspect_image('busybox')
+        self.client.image_cache.forget_names()
+        self.client.tag('busybox', 'busybox', 'v1')
+        self.client.inspect_image(self.image_id)
+        assert self.requests == [
+            'images/busybox/json',
+            'images/busybox/json',
+            'images/{0}/json'.format(self.image_id),
+        ]
+
+    def test_pull_forgets_the_moved_tag(self):
+        other_id = 'sha256:' + 'b' * 64
+        self.responses['images/busybox:1.36/json'] = {'Id': self.image_id}
+        self.client.inspect_image('busybox:1.36')
+        self.client.pull('busybox:1.36')
+        self.responses['images/busybox:1.36/json'] = {'Id': other_id}
+        assert self.client.inspect_image('busybox:1.36')['Id'] == other_id
+        # The image which had the tag does not have it anymore.
+        self.client.inspect_image(self.image_id)
+        assert self.requests == [
+            'images/busybox:1.36/json',
+            'images/busybox:1.36/json',
+            'images/{0}/json'.format(self.image_id),
+        ]
+
+    def test_streamed_pull_forgets_tags_when_done(self):
+        self.client.inspect_image('busybox')
+        with mock.patch.object(self.client, '_stream_helper',
+                               return_value=iter([b'{}'])):
+            stream = self.client.pull('busybox', stream=True)
+            assert self.client.image_cache.resolve('busybox') is not None
+            assert list(stream) == [b'{}']
+        assert self.client.image_cache.resolve('busybox') is None
+
+    def test_load_image_forgets_all_tags(self):
+        self.client.inspect_image('busybox')
+        self.client.load_image(b'Byte Stream....')
+        assert self.client.image_cache.resolve('busybox') is None
+        assert self.client.image_cache.get('inspect', self.image_id) is None
@@ -1,3 +1,4 @@
+import base64
 import datetime
 import json
 import io
@@ -5,6 +6,7 @@ import os
 import re
 import shutil
 import socket
+import tarfile
 import tempfile
 import threading
 import time
@@ -83,7 +85,8 @@ def fake_delete(self, url, *args, **kwargs):
     return fake_request('DELETE', url, *args, **kwargs)
 
 
-def fake_read_from_socket(self, response, stream):
+def fake_read_from_socket(self, response, stream, tty=False, demux=False,
+                          chunk_size=None, decode=False):
     return six.binary_type()
 
 
@@ -421,6 +424,222 @@ class StreamTest(unittest.TestCase):
 
             data += connection.recv(2048)
 
+    def response_sending_handler(self, connection):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            data += connection.recv(2048)
+        connection.sendall(self.response)
+
+    def chunked_request_handler(self, connection):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            data += connection.recv(2048)
+        headers, data = data.split(b'\r\n\r\n', 1)
+        self.request_headers = headers
+        body = b''
+        while True:
+            while b'\r\n' not in data:
+                data += connection.recv(65536)
+            size, data = data.split(b'\r\n', 1)
+            size = int(size, 16)
+            while len(data) < size + 2:
+                data += connection.recv(65536)
+            if not size:
+                break
+            body += data[:size]
+            data = data[size + 2:]
+        self.request_body = body
+        connection.sendall(self.response)
+
+    def content_length_request_handler(self, connection):
+        data = b''
+        while b'\r\n\r\n' not in data:
+            data += connection.recv(2048)
+        headers, data = data.split(b'\r\n\r\n', 1)
+        self.request_headers = headers
+        mo = re.search(r'Content-Length: ([0-9]+)', headers.decode())
+        content_length = int(mo.group(1))
+        while len(data) < content_length:
+            data += connection.recv(65536)
+        self.request_body = data
+        connection.sendall(self.response)
+
+    @pytest.mark.skipif(
+        not hasattr(socket.socket, 'sendfile'), reason='No sendfile support'
+    )
+    def test_load_image_sendfile(self):
+        self.request_handler = self.content_length_request_handler
+        self.response = (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Length: 0\r\n'
+            b'\r\n'
+        )
+        content = b''.join(six.int2byte(i % 256) for i in range(300000))
+        path = os.path.join(self.build_context, 'image.tar')
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        with mock.patch.object(
+            socket.socket, 'sendfile', autospec=True,
+            side_effect=socket.socket.sendfile
+        ) as sendfile:
+            with APIClient(base_url="http+unix://" + self.socket_file) \
+                    as client:
+                with open(path, 'rb') as f:
+                    f.read(100)
+                    client.load_image(f)
+
+        assert sendfile.call_count == 1
+        self.assertIn(b'Content-Length: 299900', self.request_headers)
+        self.assertEqual(self.request_body, content[100:])
+
+    def archive_response(self, content):
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            info = tarfile.TarInfo('data')
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+        body = archive.getvalue()
+        stat = {'name': 'data', 'size': len(content), 'mode': 0o644}
+        return body, stat, (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: application/x-tar\r\n'
+            b'X-Docker-Container-Path-Stat: ' +
+            base64.b64encode(json.dumps(stat).encode('ascii')) + b'\r\n'
+            b'Content-Length: ' + str(len(body)).encode('ascii') + b'\r\n'
+            b'\r\n'
+        ) + body
+
+    def test_extract_archive(self):
+        content = b'0123456789' * 50000
+        body, stat, self.response = self.archive_response(content)
+        self.request_handler = self.response_sending_handler
+        progress = []
+
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            result = client.extract_archive(
+                'container', '/data', self.build_context,
+                progress=lambda *args: progress.append(args),
+                chunk_size=16384
+            )
+
+        assert result == stat
+        with open(os.path.join(self.build_context, 'data'), 'rb') as f:
+            assert f.read() == content
+        assert progress[-1] == (len(body), len(content))
+        assert all(
+            b - a <= 16384 for (a, _), (b, _) in zip(progress, progress[1:])
+        )
+
+    def test_copy_archive(self):
+        content = b'0123456789' * 2000
+        body, stat, archive_response = self.archive_response(content)
+        put_response = b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n'
+
+        def handler(connection):
+            if connection.recv(3, socket.MSG_PEEK) == b'GET':
+                self.response = archive_response
+                self.response_sending_handler(connection)
+            else:
+                self.response = put_response
+                self.chunked_request_handler(connection)
+
+        self.request_handler = handler
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            assert client.copy_archive(
+                'source', '/data', 'dest', '/', chunk_size=4096,
+                rename=lambda name: 'copy/' + name
+            )
+
+        self.assertIn(b'PUT ', self.request_headers)
+        self.assertIn(b'path=%2F', self.request_headers)
+        archive = tarfile.open(fileobj=io.BytesIO(self.request_body))
+        assert archive.getnames() == ['copy/data']
+        assert archive.extractfile('copy/data').read() == content
+
+    @pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    )
+    def test_build_stream_context(self):
+        self.request_handler = self.chunked_request_handler
+        self.response = (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Transfer-Encoding: chunked\r\n'
+            b'\r\n'
+            b'0\r\n\r\n'
+        )
+        with open(os.path.join(self.build_context, 'Dockerfile'), 'w') as f:
+            f.write('FROM busybox\n')
+        with open(os.path.join(self.build_context, 'data'), 'wb') as f:
+            f.write(b'x' * 200000)
+
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            list(client.build(path=self.build_context, stream_context=True))
+
+        self.assertIn(b'Transfer-Encoding: chunked', self.request_headers)
+        with docker.utils.tar(self.build_context) as archive:
+            self.assertEqual(self.request_body, archive.read())
+
+    def stream_raw_result(self, **kwargs):
+        text = u'caf\xe9 au lait\n'.encode('utf-8') * 1000
+        self.request_handler = self.response_sending_handler
+        self.response = (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Transfer-Encoding: chunked\r\n'
+            b'\r\n'
+        ) + b''.join(
+            ('%x\r\n' % len(text[i:i + 7])).encode() + text[i:i + 7] +
+            b'\r\n' for i in range(0, len(text), 7)
+        ) + b'0\r\n\r\n'
+
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            res = client._get(client._url('/containers/abc/logs'), stream=True)
+            return text, list(client._stream_raw_result(res, **kwargs))
+
+    @pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    )
+    def test_stream_raw_result(self):
+        text, output = self.stream_raw_result(chunk_size=1024)
+        self.assertEqual(b''.join(output), text)
+        self.assertTrue(all(len(x) <= 1024 for x in output))
+        self.assertLess(len(output), len(text) // 7)
+
+    @pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    )
+    def test_stream_raw_result_decode(self):
+        text, output = self.stream_raw_result(decode=True)
+        self.assertEqual(u''.join(output), text.decode('utf-8'))
+
+    @pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    )
+    def test_stream_raw_result_not_chunked(self):
+        received = threading.Event()
+
+        def handler(connection):
+            self.response_sending_handler(connection)
+            connection.sendall(b'first\n')
+            received.wait(5)
+            connection.sendall(b'second\n')
+
+        self.request_handler = handler
+        self.response = b'HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n'
+
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            res = client._get(client._url('/containers/abc/logs'), stream=True)
+            output = client._stream_raw_result(res)
+            # The first line is not held back until 64KiB have arrived.
+            self.assertEqual(next(output), b'first\n')
+            received.set()
+            self.assertEqual(b''.join(output), b'second\n')
+
     @pytest.mark.skipif(
         docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
     )
@@ -455,6 +674,133 @@ class StreamTest(unittest.TestCase):
             self.assertEqual(list(stream), [
                 str(i).encode() for i in range(50)])
 
+    @pytest.mark.skipif(
+        docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+    )
+    def test_buffered_stream_response(self):
+        self.request_handler = self.early_response_sending_handler
+        events = [{'id': str(i), 'status': 'start'} for i in range(50)]
+        lines = []
+        for event in events:
+            line = json.dumps(event).encode() + b'\r\n'
+            lines += [('%x' % len(line)).encode(), line]
+        lines.append(b'0')
+        lines.append(b'')
+
+        self.response = (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Transfer-Encoding: chunked\r\n'
+            b'\r\n'
+        ) + b'\r\n'.join(lines)
+
+        with APIClient(base_url="http+unix://" + self.socket_file) \
+                as client:
+            for i in range(5):
+                try:
+                    stream = client.build(
+                        path=self.build_context,
+                        stream=True, decode=True, buffered=True
+                    )
+                    break
+                except requests.ConnectionError as e:
+                    if i == 4:
+                        raise e
+
+            self.assertEqual(list(stream), events)
+
+
+@pytest.mark.skipif(
+    docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+)
+class ReadFromSocketTest(unittest.TestCase):
+    frames = (
+        b'\x01\x00\x00\x00\x00\x00\x00\x04out\n'
+        b'\x02\x00\x00\x00\x00\x00\x00\x04err\n'
+        b'\x01\x00\x00\x00\x00\x00\x00\x05more\n'
+    )
+
+    def read(self, data, *args):
+        reader, writer = socket.socketpair()
+        writer.sendall(data)
+        writer.close()
+        self.addCleanup(reader.close)
+        client = APIClient()
+        with mock.patch.object(
+            client, '_get_raw_response_socket', return_value=reader
+        ):
+            result = client._read_from_socket(None, *args)
+            if not isinstance(result, (six.binary_type, tuple)):
+                result = list(result)
+        return result
+
+    def test_multiplexed(self):
+        self.assertEqual(self.read(self.frames, False), b'out\nerr\nmore\n')
+        self.assertEqual(
+            self.read(self.frames, True), [b'out\n', b'err\n', b'more\n']
+        )
+
+    def test_multiplexed_demux(self):
+        self.assertEqual(
+            self.read(self.frames, False, False, True),
+            (b'out\nmore\n', b'err\n')
+        )
+        self.assertEqual(
+            self.read(self.frames, True, False, True),
+            [(1, b'out\n'), (2, b'err\n'), (1, b'more\n')]
+        )
+
+    def test_tty_demux(self):
+        self.assertEqual(
+            self.read(b'raw output', False, True, True),
+            (b'raw output', b'')
+        )
+
+    def test_decode(self):
+        frames = (
+            b'\x01\x00\x00\x00\x00\x00\x00\x01\xc3'
+            b'\x02\x00\x00\x00\x00\x00\x00\x04err\n'
+            b'\x01\x00\x00\x00\x00\x00\x00\x02\xa9\n'
+        )
+        self.assertEqual(
+            self.read(frames, False, False, True, 1024, True),
+            (u'\xe9\n', u'err\n')
+        )
+        self.assertEqual(
+            self.read(frames, True, False, True, 1024, True),
+            [(2, u'err\n'), (1, u'\xe9\n')]
+        )
+
+    def test_tty_chunk_size(self):
+        self.assertEqual(
+            self.read(b'raw \xc3\xa9', True, True, False, 5, True),
+            [u'raw ', u'\xe9']
+        )
+
+    def test_pause_longer_than_the_timeout(self):
+        for tty in (False, True):
+            reader, writer = socket.socketpair()
+            self.addCleanup(reader.close)
+            reader.settimeout(0.1)
+
+            def write(writer=writer):
+                time.sleep(0.3)
+                writer.sendall(self.frames)
+                writer.close()
+
+            thread = threading.Thread(target=write)
+            thread.start()
+            self.addCleanup(thread.join)
+            client = APIClient()
+            self.addCleanup(client.close)
+            with mock.patch.object(
+                client, '_get_raw_response_socket', return_value=reader
+            ):
+                result = b''.join(client._read_from_socket(None, True, tty))
+            if tty:
+                assert result == self.frames
+            else:
+                assert result == b'out\nerr\nmore\n'
+
 
 class UserAgentTest(unittest.TestCase):
     def setUp(self):
@@ -528,3 +874,53 @@ class DisableSocketTest(unittest.TestCase):
 
         self.assertEqual(socket.timeout, None)
         self.assertEqual(socket._sock.timeout, 0.0)
+
+
+class SingleFlightTest(BaseAPIClientTest):
+    def setUp(self):
+        super(SingleFlightTest, self).setUp()
+        self.client.close()
+        self.client = APIClient(single_flight=True)
+        self.client._cfg = {'Configs': {}}
+
+    def test_concurrent_inspects_share_one_request(self):
+        release = threading.Event()
+        requests_made = []
+
+        def get(url, **kwargs):
+            requests_made.append(url)
+            release.wait(5)
+            return response(content={'Id': fake_api.FAKE_CONTAINER_ID})
+
+        results = []
+        self.client._get = get
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.client.inspect_container(fake_api.FAKE_CONTAINER_ID)
+            ))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.client.single_flight.hits < 3 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(requests_made) == 1
+        assert self.client.single_flight.hits == 3
+        assert self.client.single_flight.misses == 1
+        assert results == [{'Id': fake_api.FAKE_CONTAINER_ID}] * 4
+        assert len(set(id(r) for r in results)) == 4
+
+    def test_disabled_by_default(self):
+        client = APIClient()
+        self.addCleanup(client.close)
+        assert client.single_flight is None
+        client.inspect_container(fake_api.FAKE_CONTAINER_ID)
+        fake_request.assert_called_with(
+            'GET', url_prefix + 'containers/3cc2351ab11b/json',
+            timeout=DEFAULT_TIMEOUT_SECONDS
+        )
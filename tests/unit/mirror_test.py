@@ -0,0 +1,251 @@
+import threading
+import time
+import unittest
+
+import six
+
+import docker
+from docker.mirror import StateMirror
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+def container(id, name, state='running', image='busybox', labels=None,
+              networks=('bridge',)):
+    return {
+        'Id': id, 'Names': ['/' + name], 'State': state, 'Image': image,
+        'ImageID': 'sha256:' + image, 'Labels': labels or {},
+        'NetworkSettings': {'Networks': dict(
+            (n, {'NetworkID': n + '-id'}) for n in networks
+        )},
+    }
+
+
+class IdleEventsHandler(six.moves.BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    idle = 0.6
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.wfile.flush()
+        time.sleep(self.idle)
+        event = (
+            b'{"Type": "container", "Action": "die", "Actor": {"ID": "a"}}\n'
+        )
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(event), event))
+        self.wfile.flush()
+        # Keep the stream open until the client goes away.
+        self.rfile.read(1)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(six.moves.socketserver.ThreadingMixIn,
+                          six.moves.BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class StateMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.client = mock.Mock(spec=docker.APIClient)
+        self.containers = {
+            'a': container('a', 'web', labels={'app': 'web'}),
+            'b': container('b', 'db', state='exited', image='postgres',
+                           labels={'app': 'db'}, networks=('backend',)),
+        }
+        self.client.containers.side_effect = self.list_containers
+        self.client.images.return_value = [
+            {'Id': 'sha256:busybox', 'RepoTags': ['busybox:latest'],
+             'Labels': None},
+        ]
+        self.client.networks.return_value = [
+            {'Id': 'bridge-id', 'Name': 'bridge', 'Labels': {}},
+        ]
+        self.client.volumes.return_value = {
+            'Volumes': [{'Name': 'data', 'Labels': {'backup': 'yes'}}],
+        }
+        self.mirror = StateMirror(self.client)
+        self.mirror.sync()
+
+    def list_containers(self, all=False, filters=None):
+        if filters and 'id' in filters:
+            found = self.containers.get(filters['id'])
+            return [found] if found else []
+        return list(self.containers.values())
+
+    def ids(self, results):
+        return sorted(r.get('Id', r.get('Name')) for r in results)
+
+    def test_queries(self):
+        m = self.mirror
+        assert self.ids(m.containers()) == ['a', 'b']
+        assert self.ids(m.containers(name='web')) == ['a']
+        assert self.ids(m.containers(status='exited')) == ['b']
+        assert self.ids(m.containers(image='postgres')) == ['b']
+        assert self.ids(m.containers(image='sha256:busybox')) == ['a']
+        assert self.ids(m.containers(network='backend-id')) == ['b']
+        assert self.ids(m.containers(label='app')) == ['a', 'b']
+        assert self.ids(m.containers(label='app=db')) == ['b']
+        assert m.containers(label='app=db', status='running') == []
+        assert self.ids(m.containers(id='a')) == ['a']
+        assert self.ids(m.images(name='busybox')) == ['sha256:busybox']
+        assert self.ids(m.images(name='busybox:latest')) == ['sha256:busybox']
+        assert self.ids(m.networks(name='bridge')) == ['bridge-id']
+        assert self.ids(m.volumes(label='backup=yes')) == ['data']
+
+    def test_container_events(self):
+        self.containers['c'] = container('c', 'worker', state='created')
+        self.mirror.apply({
+            'Type': 'container', 'Action': 'create', 'Actor': {'ID': 'c'}
+        })
+        assert self.ids(self.mirror.containers(status='created')) == ['c']
+
+        self.containers['c'] = container('c', 'worker')
+        self.mirror.apply({
+            'Type': 'container', 'Action': 'start', 'Actor': {'ID': 'c'}
+        })
+        assert self.mirror.containers(status='created') == []
+        assert self.ids(self.mirror.containers(status='running')) == [
+            'a', 'c'
+        ]
+
+        calls = self.client.containers.call_count
+        self.mirror.apply({
+            'Type': 'container', 'Action': 'exec_start: sh',
+            'Actor': {'ID': 'c'}
+        })
+        assert self.client.containers.call_count == calls
+
+        del self.containers['c']
+        self.mirror.apply({
+            'Type': 'container', 'Action': 'destroy', 'Actor': {'ID': 'c'}
+        })
+        assert self.mirror.containers(name='worker') == []
+        assert self.client.containers.call_count == calls
+
+    def test_image_events_update_image_cache(self):
+        self.client.image_cache = mock.Mock()
+        self.client.images.return_value = []
+        event = {'Type': 'image', 'Action': 'delete',
+                 'Actor': {'ID': 'sha256:busybox'}}
+        self.mirror.apply(event)
+        self.client.image_cache.apply.assert_called_once_with(event)
+        assert self.mirror.images() == []
+
+    def test_image_events_refresh_one_image(self):
+        self.client.inspect_image.return_value = {
+            'Id': 'sha256:new', 'RepoTags': ['busybox:latest', 'new:1'],
+        }
+        self.client.images.return_value = [
+            {'Id': 'sha256:new', 'RepoTags': ['busybox:latest', 'new:1'],
+             'Labels': {'v': '2'}},
+        ]
+        self.client.images.reset_mock()
+        self.mirror.apply({
+            'Type': 'image', 'Action': 'pull', 'Actor': {'ID': 'new:1'}
+        })
+        self.client.inspect_image.assert_called_once_with('new:1')
+        self.client.images.assert_called_once_with(name='busybox:latest')
+        assert self.ids(self.mirror.images(name='busybox:latest')) == [
+            'sha256:new'
+        ]
+        assert self.ids(self.mirror.images(label='v=2')) == ['sha256:new']
+        old, = self.mirror.images(id='sha256:busybox')
+        assert old['RepoTags'] == ['<none>:<none>']
+
+        self.client.inspect_image.return_value = {
+            'Id': 'sha256:new', 'RepoTags': ['new:1'], 'RepoDigests': [],
+        }
+        self.mirror.apply({
+            'Type': 'image', 'Action': 'untag',
+            'Actor': {'ID': 'sha256:new'}
+        })
+        assert self.client.images.call_count == 1
+        assert self.mirror.images(name='busybox') == []
+        assert self.ids(self.mirror.images(name='new')) == ['sha256:new']
+
+        self.mirror.apply({
+            'Type': 'image', 'Action': 'delete',
+            'Actor': {'ID': 'sha256:new'}
+        })
+        assert self.ids(self.mirror.images()) == ['sha256:busybox']
+
+    def test_event_errors_are_skipped(self):
+        self.client.inspect_volume.side_effect = docker.errors.NotFound(
+            'No such volume'
+        )
+        self.mirror.apply({
+            'Type': 'volume', 'Action': 'create', 'Actor': {'ID': 'gone'}
+        })
+        assert self.ids(self.mirror.volumes()) == ['data']
+
+    def test_volume_events(self):
+        self.client.inspect_volume.return_value = {'Name': 'logs'}
+        self.mirror.apply({
+            'Type': 'volume', 'Action': 'create', 'Actor': {'ID': 'logs'}
+        })
+        assert self.ids(self.mirror.volumes()) == ['data', 'logs']
+        self.mirror.apply({
+            'Type': 'volume', 'Action': 'destroy', 'Actor': {'ID': 'data'}
+        })
+        assert self.ids(self.mirror.volumes()) == ['logs']
+
+    def test_resync_after_stream_ends(self):
+        self.client._stream_helper.side_effect = [
+            iter([]),
+            iter([{'Type': 'container', 'Action': 'die',
+                   'Actor': {'ID': 'a'}}]),
+        ]
+        stopped = threading.Event()
+        original = self.mirror.apply
+
+        def apply(event):
+            original(event)
+            stopped.set()
+
+        mirror = StateMirror(self.client, retry_interval=0)
+        mirror.apply = apply
+        mirror.start()
+        try:
+            assert stopped.wait(5)
+            assert mirror.wait_ready(5)
+        finally:
+            mirror._stopped.set()
+            mirror._thread.join(5)
+        assert mirror.resyncs >= 1
+        assert self.client._get.call_count >= 2
+        self.client._stream_helper.assert_called_with(
+            mock.ANY, decode=True, buffered=True
+        )
+
+    def test_idle_stream_is_not_resynced(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), IdleEventsHandler)
+        thread = threading.Thread(target=server.serve_forever, args=(0.01,))
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = docker.APIClient(
+            base_url='tcp://127.0.0.1:{0}'.format(server.server_port),
+            timeout=0.2
+        )
+        self.addCleanup(client.close)
+
+        applied = threading.Event()
+        mirror = StateMirror(client, retry_interval=0)
+        mirror.sync = mock.Mock()
+        mirror.apply = lambda event: applied.set()
+        mirror.start()
+        try:
+            assert applied.wait(5)
+        finally:
+            mirror.stop()
+        assert mirror.resyncs == 0
+        assert mirror.sync.call_count == 1
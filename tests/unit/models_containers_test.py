@@ -1,8 +1,18 @@
 import docker
+from docker.constants import DEFAULT_BLOCK_SIZE
 from docker.models.containers import Container, _create_container_args
 from docker.models.images import Image
+import io
+import os
+import shutil
+import tempfile
 import unittest
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from .fake_api import FAKE_CONTAINER_ID, FAKE_IMAGE_ID, FAKE_EXEC_ID
 from .fake_api_client import make_fake_client
 
@@ -312,8 +322,51 @@ class ContainerCollectionTest(unittest.TestCase):
         client.api.inspect_container.assert_called_with(FAKE_CONTAINER_ID)
         assert len(containers) == 1
         assert isinstance(containers[0], Container)
+
+    def test_list_concurrent_inspects(self):
+        client = make_fake_client()
+        ids = ['{0:064x}'.format(i) for i in range(50)]
+        client.api.containers.return_value = [{'Id': i} for i in ids]
+        client.api.inspect_container.side_effect = lambda i: {'Id': i}
+        containers = client.containers.list(max_workers=4)
+        assert [c.id for c in containers] == ids
+        assert all(c.hydrated for c in containers)
+        assert client.api.inspect_container.call_count == 50
+
+    def test_list_sparse(self):
+        client = make_fake_client()
+        client.api.containers.return_value = [{
+            'Id': FAKE_CONTAINER_ID,
+            'Names': ['/foobar'],
+            'State': 'running',
+        }]
+        containers = client.containers.list(sparse=True)
+        assert len(containers) == 1
+        container = containers[0]
+        assert container.id == FAKE_CONTAINER_ID
+        assert container.name == 'foobar'
+        assert container.status == 'running'
+        assert not container.hydrated
+        assert not client.api.inspect_container.called
+
+        assert container.attrs['State']['Pid'] == 0
+        assert container.hydrated
+        client.api.inspect_container.assert_called_once_with(
+            FAKE_CONTAINER_ID
+        )
         assert containers[0].id == FAKE_CONTAINER_ID
 
+    def test_list_sparse_linked_name(self):
+        client = make_fake_client()
+        # The daemon lists the names given by links first.
+        client.api.containers.return_value = [{
+            'Id': FAKE_CONTAINER_ID,
+            'Names': ['/web/db', '/db'],
+        }]
+        container, = client.containers.list(sparse=True)
+        assert container.name == 'db'
+        assert not container.hydrated
+
 
 class ContainerTest(unittest.TestCase):
     def test_name(self):
@@ -357,15 +410,57 @@ class ContainerTest(unittest.TestCase):
             stdin=False, tty=False, privileged=True, user=''
         )
         client.api.exec_start.assert_called_with(
-            FAKE_EXEC_ID, detach=False, tty=False, stream=True, socket=False
+            FAKE_EXEC_ID, detach=False, tty=False, stream=True, socket=False,
+            demux=False, chunk_size=DEFAULT_BLOCK_SIZE, decode=False
         )
 
+    def test_exec_run_chunk_size(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.exec_run("echo hello world", stream=True, chunk_size=1024)
+        assert client.api.exec_start.call_args[1]['chunk_size'] == 1024
+
     def test_export(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
         container.export()
         client.api.export.assert_called_with(FAKE_CONTAINER_ID)
 
+    def test_export_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        response = mock.Mock()
+        response.read.side_effect = io.BytesIO(b'archive').read
+        response.headers = {}
+        client.api.export.return_value = response
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'export.tar')
+
+        result = container.export_to(path)
+        client.api.export.assert_called_with(FAKE_CONTAINER_ID)
+        with open(path, 'rb') as f:
+            assert f.read() == b'archive'
+        assert result['size'] == 7
+
+    def test_copy_archive(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        dest = client.containers.get(FAKE_CONTAINER_ID)
+        container.copy_archive('/data', dest, '/', chunk_size=4096)
+        client.api.copy_archive.assert_called_with(
+            FAKE_CONTAINER_ID, '/data', FAKE_CONTAINER_ID, '/',
+            chunk_size=4096
+        )
+
+    def test_extract_archive(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.extract_archive('foo', '/tmp/foo', chunk_size=4096)
+        client.api.extract_archive.assert_called_with(
+            FAKE_CONTAINER_ID, 'foo', '/tmp/foo', chunk_size=4096
+        )
+
     def test_get_archive(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -397,6 +492,14 @@ class ContainerTest(unittest.TestCase):
         client.api.put_archive.assert_called_with(FAKE_CONTAINER_ID,
                                                   'path', 'foo')
 
+    def test_put_directory(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.put_directory('path', '/src', gzip=True)
+        client.api.put_directory.assert_called_with(FAKE_CONTAINER_ID,
+                                                    'path', '/src',
+                                                    gzip=True)
+
     def test_remove(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
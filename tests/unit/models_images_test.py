@@ -1,6 +1,15 @@
 from docker.models.images import Image
+import io
+import os
+import shutil
+import tempfile
 import unittest
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from .fake_api import FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
 
@@ -95,6 +104,26 @@ class ImageTest(unittest.TestCase):
         image.save()
         client.api.get_image.assert_called_with(FAKE_IMAGE_ID)
 
+    def test_save_to(self):
+        client = make_fake_client()
+        image = client.images.get(FAKE_IMAGE_ID)
+        response = mock.Mock()
+        response.read.side_effect = io.BytesIO(b'tarball').read
+        response.headers = {'Content-Length': '7'}
+        client.api.get_image.return_value = response
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'image.tar')
+
+        calls = []
+        result = image.save_to(path, progress=lambda *a: calls.append(a))
+        client.api.get_image.assert_called_with(FAKE_IMAGE_ID)
+        with open(path, 'rb') as f:
+            assert f.read() == b'tarball'
+        assert result['size'] == 7
+        assert calls == [(7, 7)]
+        response.release_conn.assert_called_with()
+
     def test_tag(self):
         client = make_fake_client()
         image = client.images.get(FAKE_IMAGE_ID)
@@ -39,6 +39,21 @@ class ImageCollectionTest(unittest.TestCase):
 
 class ImageTest(unittest.TestCase):
 
+    def test_containers(self):
+        client = make_fake_client()
+        network = client.networks.get(FAKE_NETWORK_ID)
+        network.attrs['Containers']['lb-bridge'] = {}
+        containers = network.containers
+        client.api.containers.assert_called_once_with(
+            all=True, filters={'network': FAKE_NETWORK_ID}
+        )
+        assert [c.id for c in containers] == [FAKE_CONTAINER_ID]
+        assert not client.api.inspect_container.called
+        assert containers[0].attrs['Name'] == 'foobar'
+        client.api.inspect_container.assert_called_once_with(
+            FAKE_CONTAINER_ID
+        )
+
     def test_connect(self):
         client = make_fake_client()
         network = client.networks.get(FAKE_NETWORK_ID)
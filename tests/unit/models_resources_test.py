@@ -1,6 +1,6 @@
 import unittest
 
-from .fake_api import FAKE_CONTAINER_ID
+from .fake_api import FAKE_CONTAINER_ID, FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
 
 
@@ -12,3 +12,75 @@ class ModelTest(unittest.TestCase):
         container.reload()
         assert client.api.inspect_container.call_count == 2
         assert container.attrs['Name'] == "foobar"
+
+    def test_summary(self):
+        client = make_fake_client()
+        container = client.containers.prepare_summary({
+            'Id': FAKE_CONTAINER_ID
+        })
+        assert container.id == FAKE_CONTAINER_ID
+        assert not container.hydrated
+        assert container.attrs['Name'] == "foobar"
+        assert container.hydrated
+        assert container.summary == {'Id': FAKE_CONTAINER_ID}
+        assert client.api.inspect_container.call_count == 1
+
+    def test_partial_attrs(self):
+        client = make_fake_client()
+        image = client.images.list(sparse=True)[0]
+        assert not image.hydrated
+        assert image.tags == ['busybox:latest', 'busybox:1.0']
+        assert image.attrs['Id'] == FAKE_IMAGE_ID
+        assert not client.api.inspect_image.called
+
+        attrs = image.attrs
+        # Created has another format in the summary.
+        assert attrs['Created'] == '2013-03-23T22:24:18.818426-07:00'
+        assert image.hydrated
+        client.api.inspect_image.assert_called_once_with(FAKE_IMAGE_ID)
+        assert attrs['Parent'] == '27cf784147099545'
+        assert 'Missing' not in attrs
+        assert attrs.get('Missing') is None
+        assert client.api.inspect_image.call_count == 1
+
+    def test_list_is_not_sparse_by_default(self):
+        client = make_fake_client()
+        image = client.images.list()[0]
+        assert image.hydrated
+        assert image.attrs['Created'] == '2 days ago'
+        network = client.networks.list()[0]
+        assert network.hydrated
+        assert not client.api.inspect_image.called
+        assert not client.api.inspect_network.called
+
+    def test_partial_network_containers(self):
+        client = make_fake_client()
+        summary = dict(client.api.networks.return_value[0], Containers={})
+        client.api.networks.return_value = [summary]
+        network = client.networks.list(sparse=True)[0]
+        assert network.name == 'bridge'
+        assert not client.api.inspect_network.called
+        assert len(network.attrs['Containers']) == 1
+        assert client.api.inspect_network.call_count == 1
+
+    def test_hydrate(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.hydrate()
+        assert client.api.inspect_container.call_count == 1
+
+
+class CollectionTest(unittest.TestCase):
+    def test_hydrate(self):
+        client = make_fake_client()
+        ids = ['{0:064x}'.format(i) for i in range(20)]
+        client.api.containers.return_value = [{'Id': i} for i in ids]
+        client.api.inspect_container.side_effect = lambda i: {'Id': i}
+        containers = client.containers.list(sparse=True)
+        containers[0].hydrate()
+
+        result = client.containers.hydrate(containers, max_workers=4)
+        assert result == containers
+        assert all(c.hydrated for c in containers)
+        assert [c.attrs['Id'] for c in containers] == ids
+        assert client.api.inspect_container.call_count == 20
@@ -0,0 +1,276 @@
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import pytest
+import requests
+import six
+
+import docker
+from docker import ssladapter
+from docker.transport import TCPAdapter, UnixAdapter
+from docker.transport.httpconn import HTTPConnection, is_regular_file
+from docker.transport.tcpconn import TCPHTTPConnection
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class IsRegularFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'data')
+        with open(self.path, 'wb') as f:
+            f.write(b'data')
+
+    def test_binary_file(self):
+        with open(self.path, 'rb') as f:
+            assert is_regular_file(f)
+
+    def test_text_file(self):
+        with io.open(self.path, 'r') as f:
+            assert not is_regular_file(f)
+
+    def test_not_a_file(self):
+        assert not is_regular_file(None)
+        assert not is_regular_file(b'data')
+        assert not is_regular_file(io.BytesIO(b'data'))
+        assert not is_regular_file(iter([b'data']))
+
+
+class HTTPConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.conn = HTTPConnection('localhost')
+        self.conn.sock, self.peer = socket.socketpair()
+        self.addCleanup(self.conn.close)
+        self.addCleanup(self.peer.close)
+
+    def receive(self):
+        self.conn.sock.shutdown(socket.SHUT_WR)
+        data = []
+        while True:
+            block = self.peer.recv(65536)
+            if not block:
+                return b''.join(data)
+            data.append(block)
+
+    def make_file(self, content):
+        path = os.path.join(self.tmpdir, 'data')
+        with open(path, 'wb') as f:
+            f.write(content)
+        return open(path, 'rb')
+
+    def test_request_file(self):
+        with self.make_file(b'0123456789') as f:
+            f.read(4)
+            self.conn.request('POST', '/images/load', body=f)
+        headers, body = self.receive().split(b'\r\n\r\n', 1)
+        assert b'Content-Length: 6' in headers
+        assert body == b'456789'
+
+    def test_request_chunked_file(self):
+        with self.make_file(b'0123456789') as f:
+            self.conn.request_chunked('PUT', '/archive', body=f)
+        headers, body = self.receive().split(b'\r\n\r\n', 1)
+        assert b'Transfer-Encoding: chunked' in headers
+        assert body == b'a\r\n0123456789\r\n0\r\n\r\n'
+
+    def test_request_chunked_iterable(self):
+        self.conn.request_chunked(
+            'PUT', '/archive', body=iter([b'01', b'', u'234'])
+        )
+        headers, body = self.receive().split(b'\r\n\r\n', 1)
+        assert body == b'2\r\n01\r\n3\r\n234\r\n0\r\n\r\n'
+
+
+class TCPAdapterTest(unittest.TestCase):
+    def test_mounted_for_http(self):
+        client = docker.APIClient(base_url='tcp://127.0.0.1:2375')
+        self.addCleanup(client.close)
+        adapter = client.get_adapter('http://127.0.0.1:2375')
+        assert isinstance(adapter, TCPAdapter)
+        pool = adapter.get_connection('http://127.0.0.1:2375')
+        assert pool.ConnectionCls is TCPHTTPConnection
+        assert pool.metrics is adapter.metrics
+        assert client.pool_metrics is adapter.metrics
+
+    def test_https_without_tls_is_metered(self):
+        client = docker.APIClient(base_url='https://127.0.0.1:2376')
+        self.addCleanup(client.close)
+        adapter = client.get_adapter('https://127.0.0.1:2376')
+        assert isinstance(adapter, ssladapter.SSLAdapter)
+        assert client.pool_metrics is adapter.metrics
+
+    def test_unmetered_adapter(self):
+        client = docker.APIClient(base_url='tcp://127.0.0.1:2375')
+        self.addCleanup(client.close)
+        client.mount('http://', requests.adapters.HTTPAdapter())
+        assert client.pool_metrics is None
+
+    def test_pool_options(self):
+        client = docker.APIClient(
+            base_url='tcp://127.0.0.1:2375', max_pool_size=3, pool_block=True
+        )
+        self.addCleanup(client.close)
+        pool = client.get_adapter('http://127.0.0.1:2375').get_connection(
+            'http://127.0.0.1:2375'
+        )
+        assert pool.pool.maxsize == 3
+        assert pool.block
+
+    def test_pools_are_replaced_in_forked_child(self):
+        adapter = TCPAdapter()
+        self.addCleanup(adapter.close)
+        manager = adapter.poolmanager
+        metrics = adapter.metrics
+        pool = adapter.get_connection('http://127.0.0.1:2375')
+        with mock.patch('os.getpid', return_value=-1):
+            child_pool = adapter.get_connection('http://127.0.0.1:2375')
+        assert adapter.poolmanager is not manager
+        assert adapter.metrics is not metrics
+        assert child_pool is not pool
+        assert child_pool.metrics is adapter.metrics
+
+
+class SSLAdapterTest(unittest.TestCase):
+    def test_pools_are_metered(self):
+        adapter = ssladapter.SSLAdapter(pool_maxsize=3, pool_block=True)
+        self.addCleanup(adapter.close)
+        pool = adapter.get_connection('https://127.0.0.1:2376')
+        assert isinstance(pool, ssladapter.HTTPSConnectionPool)
+        assert pool.metrics is adapter.metrics
+        assert pool.pool.maxsize == 3
+        assert pool.block
+
+
+class PingHandler(six.moves.BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'OK')
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixServer(six.moves.socketserver.ThreadingMixIn,
+                 six.moves.socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        # BaseHTTPRequestHandler expects a client address
+        sock, _ = self.socket.accept()
+        return sock, ('localhost', 0)
+
+
+class UnixAdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.socket_path = os.path.join(self.tmpdir, 'docker.sock')
+        self.server = UnixServer(self.socket_path, PingHandler)
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def make_client(self, **kwargs):
+        client = docker.APIClient(
+            base_url='unix://' + self.socket_path, **kwargs
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def ping_concurrently(self, client, count):
+        threads = [
+            threading.Thread(target=client.ping) for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+    def test_pool_options(self):
+        adapter = UnixAdapter(
+            'http+unix://' + self.socket_path, pool_maxsize=3, pool_block=True
+        )
+        self.addCleanup(adapter.close)
+        pool = adapter.get_connection('http+docker://localunixsocket')
+        assert pool.pool.maxsize == 3
+        assert pool.block
+        assert pool.metrics is adapter.metrics
+
+    def test_connections_are_reused(self):
+        client = self.make_client()
+        for _ in range(3):
+            assert client.ping()
+        metrics = client.pool_metrics.snapshot()
+        assert metrics['created'] == 1
+        assert metrics['checkouts'] == 3
+        assert metrics['active'] == 0
+        assert metrics['idle'] == 1
+        assert metrics['discarded'] == 0
+
+    def test_full_pool_discards_connections(self):
+        client = self.make_client(max_pool_size=1)
+        PingHandler.delay = 0.2
+        self.addCleanup(setattr, PingHandler, 'delay', 0)
+        self.ping_concurrently(client, 3)
+        metrics = client.pool_metrics
+        assert metrics.created == 3
+        assert metrics.discarded == 2
+        assert metrics.idle == 1
+        assert metrics.active == 0
+
+    def test_blocking_pool_waits(self):
+        client = self.make_client(max_pool_size=1, pool_block=True)
+        PingHandler.delay = 0.1
+        self.addCleanup(setattr, PingHandler, 'delay', 0)
+        self.ping_concurrently(client, 3)
+        metrics = client.pool_metrics
+        assert metrics.created == 1
+        assert metrics.discarded == 0
+        assert metrics.checkouts == 3
+        assert metrics.wait_seconds >= 0.1
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_forked_child_opens_its_own_connections(self):
+        client = self.make_client()
+        assert client.ping()
+        adapter = client.get_adapter(client.base_url)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                if adapter._pid != os.getpid():
+                    # No os.register_at_fork
+                    adapter._check_fork()
+                if (len(adapter.pools) == 0 and client.ping() and
+                        client.pool_metrics.created == 1):
+                    code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        assert status == 0
+        # The connection of the parent is still usable.
+        assert client.ping()
+        assert client.pool_metrics.created == 1
+        assert client.pool_metrics.checkouts == 2
@@ -0,0 +1,248 @@
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+import pytest
+
+from docker.errors import DockerException
+from docker.utils import archive as archive_module
+from docker.utils.archive import (
+    ProgressReader, STAT_MODE_DIR, extract_stream, rewrite_stream,
+    save_stream, stat_size
+)
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class NonSeekableReader(object):
+    def __init__(self, data):
+        self.fileobj = io.BytesIO(data)
+        self.sizes = []
+
+    def read(self, size=-1):
+        self.sizes.append(size)
+        return self.fileobj.read(size)
+
+
+def make_archive(files):
+    f = io.BytesIO()
+    with tarfile.open(fileobj=f, mode='w') as archive:
+        for name, content in files:
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                archive.addfile(info)
+            else:
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+    return f.getvalue()
+
+
+class ExtractStreamTest(unittest.TestCase):
+    files = [
+        ('data', None),
+        ('data/big', b'0123456789' * 100000),
+        ('data/small', b'small'),
+    ]
+
+    def setUp(self):
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest)
+
+    def test_extract(self):
+        reader = NonSeekableReader(make_archive(self.files))
+        extract_stream(reader, self.dest, chunk_size=4096)
+        for name, content in self.files:
+            target = os.path.join(self.dest, name)
+            if content is None:
+                assert os.path.isdir(target)
+            else:
+                with open(target, 'rb') as f:
+                    assert f.read() == content
+        assert max(reader.sizes) == 4096
+
+    def test_callback(self):
+        received = []
+
+        def callback(member, f):
+            received.append((member.name, f.read() if f else None))
+
+        extract_stream(
+            NonSeekableReader(make_archive(self.files)), callback=callback
+        )
+        assert received == self.files
+        assert os.listdir(self.dest) == []
+
+    def test_outside_of_destination(self):
+        data = make_archive([('../escape', b'data')])
+        with pytest.raises(DockerException):
+            extract_stream(NonSeekableReader(data), self.dest)
+        assert not os.path.exists(os.path.join(self.dest, '..', 'escape'))
+
+    def test_path_or_callback_required(self):
+        with pytest.raises(TypeError):
+            extract_stream(io.BytesIO())
+
+    def check_filter(self):
+        def archive(*members):
+            f = io.BytesIO()
+            with tarfile.open(fileobj=f, mode='w') as tar:
+                for name, type, linkname in members:
+                    info = tarfile.TarInfo(name)
+                    info.type = type
+                    info.linkname = linkname
+                    info.mode = 0o6777
+                    tar.addfile(info, io.BytesIO(b''))
+            return NonSeekableReader(f.getvalue())
+
+        for member in [('dev', tarfile.CHRTYPE, ''),
+                       ('disk', tarfile.BLKTYPE, ''),
+                       ('fifo', tarfile.FIFOTYPE, ''),
+                       ('abs', tarfile.SYMTYPE, '/etc/passwd'),
+                       ('up', tarfile.SYMTYPE, 'data/../../etc'),
+                       ('hard', tarfile.LNKTYPE, '../escape'),
+                       ('../escape', tarfile.REGTYPE, '')]:
+            dest = tempfile.mkdtemp(dir=self.dest)
+            with pytest.raises(DockerException):
+                extract_stream(archive(member), dest)
+            assert os.listdir(dest) == []
+
+        dest = tempfile.mkdtemp(dir=self.dest)
+        extract_stream(archive(
+            ('/data', tarfile.DIRTYPE, ''),
+            ('data/small', tarfile.REGTYPE, ''),
+            ('data/link', tarfile.SYMTYPE, 'small'),
+            ('data/sub/up', tarfile.SYMTYPE, '../small'),
+            ('hard', tarfile.LNKTYPE, 'data/small'),
+        ), dest)
+        small = os.stat(os.path.join(dest, 'data', 'small'))
+        assert small.st_mode & 0o7777 == 0o755
+        assert os.path.islink(os.path.join(dest, 'data', 'sub', 'up'))
+        assert os.path.samefile(
+            os.path.join(dest, 'hard'), os.path.join(dest, 'data', 'small')
+        )
+
+    @pytest.mark.skipif(not archive_module._STDLIB_DATA_FILTER,
+                        reason='requires tarfile.data_filter')
+    def test_stdlib_data_filter(self):
+        self.check_filter()
+
+    def test_data_filter_fallback(self):
+        with mock.patch.object(archive_module, '_STDLIB_DATA_FILTER', False):
+            self.check_filter()
+
+
+class RewriteStreamTest(unittest.TestCase):
+    long_name = 'data/' + 'x' * 200
+
+    def make_source(self):
+        f = io.BytesIO()
+        with tarfile.open(fileobj=f, mode='w', format=tarfile.PAX_FORMAT) \
+                as archive:
+            info = tarfile.TarInfo('data')
+            info.type = tarfile.DIRTYPE
+            archive.addfile(info)
+            for name, content in ((self.long_name, b'0123456789' * 1000),
+                                  ('data/skip', b'skip')):
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+            info = tarfile.TarInfo('data/link')
+            info.type = tarfile.LNKTYPE
+            info.linkname = self.long_name
+            archive.addfile(info)
+        return f.getvalue()
+
+    def rename(self, name):
+        if name.endswith('skip'):
+            return None
+        return 'copy' + name[len('data'):]
+
+    def test_rewrite(self):
+        blocks = list(rewrite_stream(
+            NonSeekableReader(self.make_source()), self.rename,
+            chunk_size=1024
+        ))
+        assert len(blocks) > 1
+        archive = tarfile.open(fileobj=io.BytesIO(b''.join(blocks)))
+        long_name = self.rename(self.long_name)
+        assert archive.getnames() == ['copy', long_name, 'copy/link']
+        assert archive.extractfile(long_name).read() == b'0123456789' * 1000
+        assert archive.getmember('copy/link').linkname == long_name
+
+    def test_identity(self):
+        source = self.make_source()
+        data = b''.join(rewrite_stream(io.BytesIO(source), lambda n: n))
+        archive = tarfile.open(fileobj=io.BytesIO(data))
+        assert archive.getnames() == [
+            'data', self.long_name, 'data/skip', 'data/link'
+        ]
+        assert archive.extractfile('data/skip').read() == b'skip'
+
+
+class FailingReader(object):
+    def __init__(self, data):
+        self.fileobj = io.BytesIO(data)
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if not data:
+            raise IOError('Connection lost')
+        return data
+
+
+class SaveStreamTest(unittest.TestCase):
+    content = b'0123456789' * 100000
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'image.tar')
+
+    def test_save(self):
+        calls = []
+        result = save_stream(
+            io.BytesIO(self.content), self.path, chunk_size=65536,
+            progress=lambda *args: calls.append(args),
+            total=len(self.content)
+        )
+        with open(self.path, 'rb') as f:
+            assert f.read() == self.content
+        assert result['size'] == len(self.content)
+        assert result['sha256'] == hashlib.sha256(self.content).hexdigest()
+        assert result['seconds'] >= 0
+        assert calls[-1] == (len(self.content), len(self.content))
+        assert os.listdir(self.tmpdir) == ['image.tar']
+
+    def test_interrupted(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'previous')
+        with pytest.raises(IOError):
+            save_stream(FailingReader(self.content), self.path)
+        with open(self.path, 'rb') as f:
+            assert f.read() == b'previous'
+        assert os.listdir(self.tmpdir) == ['image.tar']
+
+
+class ProgressReaderTest(unittest.TestCase):
+    def test_progress(self):
+        calls = []
+        reader = ProgressReader(
+            io.BytesIO(b'x' * 10), lambda *args: calls.append(args), 10
+        )
+        while reader.read(4):
+            pass
+        assert calls == [(4, 10), (8, 10), (10, 10)]
+
+    def test_stat_size(self):
+        assert stat_size({'size': 10, 'mode': 0o644}) == 10
+        assert stat_size({'size': 4096, 'mode': STAT_MODE_DIR | 0o755}) is None
+        assert stat_size(None) is None
@@ -0,0 +1,104 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+import pytest
+
+from docker.errors import DockerException
+from docker.utils import ImageArchive
+
+
+def add_file(archive, name, content):
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    archive.addfile(info, io.BytesIO(content))
+
+
+def make_image_archive(path, corrupt=False):
+    layers = [b'first layer' * 1000, b'second layer' * 2000]
+    diff_ids = [
+        'sha256:' + hashlib.sha256(layer).hexdigest() for layer in layers
+    ]
+    if corrupt:
+        layers[1] = layers[1][:-1] + b'!'
+    config = json.dumps({
+        'rootfs': {'type': 'layers', 'diff_ids': diff_ids + diff_ids[:1]}
+    })
+    manifest = json.dumps([{
+        'Config': 'abcdef.json',
+        'RepoTags': ['busybox:latest'],
+        'Layers': ['aaa/layer.tar', 'bbb/layer.tar', 'ccc/layer.tar'],
+    }])
+    with tarfile.open(path, 'w') as archive:
+        add_file(archive, 'aaa/layer.tar', layers[0])
+        add_file(archive, 'bbb/layer.tar', layers[1])
+        # Identical layers are written as links to the first one
+        info = tarfile.TarInfo('ccc/layer.tar')
+        info.type = tarfile.SYMTYPE
+        info.linkname = '../aaa/layer.tar'
+        archive.addfile(info)
+        add_file(archive, 'abcdef.json', config.encode('utf-8'))
+        add_file(archive, 'manifest.json', manifest.encode('utf-8'))
+    return layers, diff_ids
+
+
+class ImageArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'image.tar')
+
+    def test_manifest_and_layers(self):
+        layers, diff_ids = make_image_archive(self.path)
+        archive = ImageArchive(self.path)
+        assert archive.manifest[0]['RepoTags'] == ['busybox:latest']
+        assert archive.config()['rootfs']['diff_ids'][:2] == diff_ids
+        assert archive.layers() == [
+            ('aaa/layer.tar', diff_ids[0]),
+            ('bbb/layer.tar', diff_ids[1]),
+            ('ccc/layer.tar', diff_ids[0]),
+        ]
+        assert archive.read('bbb/layer.tar') == layers[1]
+        assert archive.read('ccc/layer.tar') == layers[0]
+
+    def test_random_access(self):
+        layers, _ = make_image_archive(self.path)
+        archive = ImageArchive(self.path)
+        with archive.open('bbb/layer.tar') as f:
+            f.seek(-12, io.SEEK_END)
+            assert f.read() == b'second layer'
+            f.seek(100)
+            assert f.read(10) == layers[1][100:110]
+        with pytest.raises(KeyError):
+            archive.open('missing')
+
+    def test_from_stream(self):
+        source = os.path.join(self.tmpdir, 'source.tar')
+        layers, _ = make_image_archive(source)
+        with open(source, 'rb') as f:
+            archive = ImageArchive.from_stream(f, self.path, chunk_size=4096)
+        with open(source, 'rb') as f, open(self.path, 'rb') as g:
+            assert f.read() == g.read()
+        assert sorted(archive.members) == sorted(ImageArchive(source).members)
+        assert archive.read('aaa/layer.tar') == layers[0]
+
+    def test_verify_layer(self):
+        layers, _ = make_image_archive(self.path)
+        archive = ImageArchive(self.path)
+        archive.verify_layer('bbb/layer.tar')
+        with archive.open_layer('aaa/layer.tar') as f:
+            assert f.read() == layers[0]
+
+    def test_verify_corrupt_layer(self):
+        make_image_archive(self.path, corrupt=True)
+        archive = ImageArchive(self.path)
+        archive.verify_layer('aaa/layer.tar')
+        with pytest.raises(DockerException):
+            archive.verify_layer('bbb/layer.tar')
+        with archive.open_layer('bbb/layer.tar', verify=False) as f:
+            assert f.read().endswith(b'!')
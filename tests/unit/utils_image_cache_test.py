@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from docker.utils import ImageCache
+from docker.utils.image_cache import full_image_id
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+IMAGE_ID = 'sha256:' + 'a' * 64
+OTHER_ID = 'sha256:' + 'b' * 64
+
+
+class FullImageIdTest(unittest.TestCase):
+    def test_full_id(self):
+        assert full_image_id(IMAGE_ID) == IMAGE_ID
+        assert full_image_id('a' * 64) == IMAGE_ID
+
+    def test_not_a_full_id(self):
+        assert full_image_id('busybox') is None
+        assert full_image_id('aaaaaaaaaaaa') is None
+        assert full_image_id('sha256:' + 'A' * 64) is None
+        assert full_image_id(None) is None
+
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ImageCache()
+
+    def test_get_returns_copies(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID, 'Size': 1})
+        result = self.cache.get('inspect', IMAGE_ID)
+        assert result == {'Id': IMAGE_ID, 'Size': 1}
+        result['Size'] = 2
+        assert self.cache.get('inspect', IMAGE_ID)['Size'] == 1
+        assert self.cache.hits == 2
+
+    def test_miss(self):
+        assert self.cache.get('inspect', IMAGE_ID) is None
+        assert self.cache.get('inspect', 'busybox') is None
+        assert self.cache.misses == 2
+
+    def test_kinds_are_separate(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        assert self.cache.get('history', IMAGE_ID) is None
+
+    def test_only_full_ids_are_keys(self):
+        self.cache.put('inspect', 'aaaaaaaaaaaa', {'Id': 'aaaaaaaaaaaa'})
+        assert self.cache.get('inspect', 'aaaaaaaaaaaa') is None
+
+    def test_name_resolves_until_ttl(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID}, name='busybox')
+        assert self.cache.resolve('busybox') == IMAGE_ID
+        assert self.cache.get('inspect', 'busybox') == {'Id': IMAGE_ID}
+        with mock.patch('time.time', return_value=1e12):
+            assert self.cache.resolve('busybox') is None
+            assert self.cache.get('inspect', 'busybox') is None
+        # The entry itself does not expire.
+        assert self.cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+
+    def test_lru_eviction(self):
+        self.cache = ImageCache(max_entries=2)
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        self.cache.put('history', IMAGE_ID, [])
+        self.cache.get('inspect', IMAGE_ID)
+        self.cache.put('inspect', OTHER_ID, {'Id': OTHER_ID})
+        assert self.cache.get('history', IMAGE_ID) is None
+        assert self.cache.get('inspect', IMAGE_ID) is not None
+        assert self.cache.get('inspect', OTHER_ID) is not None
+
+    def test_invalidate_by_name(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID}, name='busybox')
+        self.cache.put('history', IMAGE_ID, [])
+        self.cache.put('inspect', OTHER_ID, {'Id': OTHER_ID}, name='alpine')
+        self.cache.invalidate('busybox')
+        assert self.cache.resolve('busybox') is None
+        assert self.cache.get('inspect', IMAGE_ID) is None
+        assert self.cache.get('history', IMAGE_ID) is None
+        assert self.cache.get('inspect', 'alpine') is not None
+
+    def test_forget_tags(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID},
+                       name='busybox:1.36')
+        self.cache.put('inspect', OTHER_ID, {'Id': OTHER_ID}, name='alpine')
+        self.cache.forget_tags(['busybox:latest'])
+        assert self.cache.resolve('alpine') is None
+        assert self.cache.get('inspect', IMAGE_ID) is None
+        assert self.cache.get('inspect', OTHER_ID) is not None
+        self.cache.put('inspect', OTHER_ID, {'Id': OTHER_ID}, name='alpine')
+        self.cache.forget_tags()
+        assert self.cache.get('inspect', OTHER_ID) is None
+
+    def test_apply_untag_and_delete(self):
+        for action in ('untag', 'delete'):
+            self.cache.put(
+                'inspect', IMAGE_ID, {'Id': IMAGE_ID}, name='busybox'
+            )
+            self.cache.put('inspect', OTHER_ID, {'Id': OTHER_ID})
+            self.cache.apply({
+                'Type': 'image', 'Action': action, 'Actor': {'ID': IMAGE_ID}
+            })
+            assert self.cache.get('inspect', IMAGE_ID) is None
+            assert self.cache.get('inspect', OTHER_ID) is not None
+
+    def test_apply_pull_forgets_names(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID}, name='busybox')
+        self.cache.apply({
+            'Type': 'image', 'Action': 'pull', 'Actor': {'ID': 'busybox'}
+        })
+        assert self.cache.resolve('busybox') is None
+        assert self.cache.get('inspect', IMAGE_ID) is not None
+
+    def test_apply_ignores_other_events(self):
+        self.cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID}, name='busybox')
+        self.cache.apply({
+            'Type': 'container', 'Action': 'delete', 'Actor': {'ID': IMAGE_ID}
+        })
+        self.cache.apply({
+            'Type': 'image', 'Action': 'push', 'Actor': {'ID': 'busybox'}
+        })
+        assert self.cache.resolve('busybox') == IMAGE_ID
+
+
+class ImageCacheDiskTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'images')
+
+    def test_survives_the_process(self):
+        ImageCache(path=self.path).put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        assert os.listdir(self.path) == ['inspect-' + 'a' * 64 + '.json']
+        cache = ImageCache(path=self.path)
+        assert cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+
+    def test_evicted_entries_are_read_from_disk(self):
+        cache = ImageCache(max_entries=1, path=self.path)
+        cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        cache.put('inspect', OTHER_ID, {'Id': OTHER_ID})
+        assert cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+
+    def test_invalidate_removes_files(self):
+        cache = ImageCache(path=self.path)
+        cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        cache.put('history', IMAGE_ID, [])
+        cache.invalidate(IMAGE_ID)
+        assert os.listdir(self.path) == []
+        assert ImageCache(path=self.path).get('inspect', IMAGE_ID) is None
+
+    def test_corrupt_file_is_a_miss(self):
+        cache = ImageCache(path=self.path)
+        cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        with open(cache._filename('inspect', IMAGE_ID), 'w') as f:
+            f.write('{"Id": ')
+        assert ImageCache(path=self.path).get('inspect', IMAGE_ID) is None
+
+    def test_clear(self):
+        cache = ImageCache(path=self.path)
+        cache.put('inspect', IMAGE_ID, {'Id': IMAGE_ID})
+        cache.clear()
+        assert cache.get('inspect', IMAGE_ID) is None
+        assert os.listdir(self.path) == []
@@ -2,7 +2,20 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from docker.utils.json_stream import json_splitter, stream_as_text, json_stream
+import json
+
+import pytest
+
+from docker.errors import StreamParseError
+from docker.utils import json_stream as json_stream_module
+from docker.utils.json_stream import (
+    json_splitter, stream_as_text, json_stream, split_buffer
+)
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 
 class TestJsonSplitter(object):
@@ -60,3 +73,82 @@ class TestJsonStream(object):
             {'three': 'four'},
             {'x': 2}
         ]
+
+    def test_with_bytes_split_anywhere(self):
+        objs = [
+            {'stream': 'Step 1 : FROM busybox\n', 'x': '{[\\"]}'},
+            [1, 2.5, None, True, {'nested': ['\u011b']}],
+            {},
+        ]
+        data = b''.join(json.dumps(o).encode('utf-8') for o in objs)
+        for size in (1, 2, 7):
+            stream = [data[i:i + size] for i in range(0, len(data), size)]
+            assert list(json_stream(stream)) == objs
+
+    def test_with_scalars(self):
+        stream = [b'"one" 2', b'2 true\n', b'null']
+        assert list(json_stream(stream)) == ['one', 22, True, None]
+
+    def test_lines_are_decoded_whole(self):
+        calls = []
+
+        def loads(data):
+            calls.append(data)
+            return json.loads(data.decode('utf-8'))
+
+        with mock.patch.object(json_stream_module, '_json_loads', loads):
+            assert list(json_stream([b'{"a": 1}\n{"b"', b': 2}\n[]'])) == [
+                {'a': 1}, {'b': 2}, []
+            ]
+        assert calls == [b'{"a": 1}', b'{"b"', b'{"b": 2}', b'[]']
+
+    def test_scanning_stops_after_split_values(self):
+        stream = [b'{\n  "a": [1,\n', b'2]\n}\n{"b": 2}\n1', b'2\n']
+        calls = []
+
+        def loads(data):
+            calls.append(data)
+            return json.loads(data.decode('utf-8'))
+
+        with mock.patch.object(json_stream_module, '_json_loads', loads):
+            assert list(json_stream(stream)) == [{'a': [1, 2]}, {'b': 2}, 12]
+        assert calls[-3:] == [b'{\n  "a": [1,\n2]\n}', b'{"b": 2}', b'12']
+
+    def test_invalid_json(self):
+        with pytest.raises(StreamParseError):
+            list(json_stream([b'{"one": tw', b'o}']))
+        with pytest.raises(StreamParseError):
+            list(json_stream([b'{"one": "two"']))
+
+
+class TestSplitBuffer(object):
+
+    def test_lines(self):
+        stream = [b'one\ntw', b'o', b'\nthree\n', b'four']
+        assert list(split_buffer(stream)) == [
+            'one\n', 'two\n', 'three\n', 'four'
+        ]
+
+
+class TestSetJsonDecoder(object):
+
+    def test_custom_decoder(self):
+        calls = []
+
+        def loads(data):
+            calls.append(data)
+            return json.loads(data.decode('utf-8'))
+
+        json_stream_module.set_json_decoder(loads)
+        try:
+            assert list(json_stream([b'{"a": 1}\n{"b": 2}\n'])) == [
+                {'a': 1}, {'b': 2}
+            ]
+            assert json_stream_module.json_loads(b'[]') == []
+        finally:
+            json_stream_module.set_json_decoder(None)
+        assert calls == [b'{"a": 1}', b'{"b": 2}', b'[]']
+        assert (
+            json_stream_module._json_loads is
+            json_stream_module.default_json_loads
+        )
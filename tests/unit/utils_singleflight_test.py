@@ -0,0 +1,96 @@
+import threading
+import unittest
+
+import pytest
+
+from docker.utils.singleflight import SingleFlight
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self, result=None, error=None):
+        def call():
+            self.calls += 1
+            self.started.set()
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return result
+        return call
+
+    def run_concurrently(self, key, fn, count):
+        results = [None] * count
+        errors = [None] * count
+
+        def run(i):
+            try:
+                results[i] = self.flight.do(key, fn)
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=run, args=(0,))]
+        threads[0].start()
+        self.started.wait(5)
+        for i in range(1, count):
+            threads.append(threading.Thread(target=run, args=(i,)))
+            threads[i].start()
+        while self.flight.hits < count - 1:
+            threading.Event().wait(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_sequential_calls_are_not_shared(self):
+        self.release.set()
+        assert self.flight.do('a', self.slow({'a': 1})) == {'a': 1}
+        assert self.flight.do('a', self.slow({'a': 1})) == {'a': 1}
+        assert self.calls == 2
+        assert (self.flight.hits, self.flight.misses) == (0, 2)
+
+    def test_concurrent_calls_share_one_execution(self):
+        results, errors = self.run_concurrently('a', self.slow({'a': [1]}), 5)
+        assert self.calls == 1
+        assert (self.flight.hits, self.flight.misses) == (4, 1)
+        assert errors == [None] * 5
+        assert results == [{'a': [1]}] * 5
+        # Each caller gets its own copy.
+        assert len(set(id(r) for r in results)) == 5
+        assert len(set(id(r['a']) for r in results)) == 5
+
+    def test_concurrent_calls_share_errors(self):
+        results, errors = self.run_concurrently(
+            'a', self.slow(error=ValueError('boom')), 3
+        )
+        assert self.calls == 1
+        assert all(isinstance(e, ValueError) for e in errors)
+
+    def test_other_keys_are_not_shared(self):
+        self.release.set()
+        self.flight.do('a', self.slow())
+        self.flight.do('b', self.slow())
+        assert self.calls == 2
+
+    def test_error_is_raised_to_leader(self):
+        self.release.set()
+        with pytest.raises(ValueError):
+            self.flight.do('a', self.slow(error=ValueError('boom')))
+        assert self.flight.do('a', self.slow(1)) == 1
+
+    def test_calls_of_parent_are_forgotten_in_forked_child(self):
+        # A call that was in progress in another thread of the parent
+        self.flight._calls['a'] = object()
+        self.release.set()
+        with mock.patch('os.getpid', return_value=-1):
+            assert self.flight.do('a', self.slow(1)) == 1
+        assert self.calls == 1
@@ -0,0 +1,61 @@
+import socket
+import struct
+import threading
+import unittest
+
+import pytest
+
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.utils.socket import (
+    STDERR, STDOUT, chunks_iter, frames_iter, read_exactly, SocketError
+)
+
+
+def frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class FramesIterTest(unittest.TestCase):
+    def setUp(self):
+        self.reader, self.writer = socket.socketpair()
+        self.addCleanup(self.reader.close)
+
+    def send(self, *parts):
+        def write():
+            for part in parts:
+                self.writer.sendall(part)
+            self.writer.close()
+        t = threading.Thread(target=write)
+        t.start()
+        self.addCleanup(t.join)
+
+    def test_tags_frames_with_stream(self):
+        self.send(frame(STDOUT, b'out'), frame(STDERR, b'err'))
+        assert list(frames_iter(self.reader)) == [
+            (STDOUT, b'out'), (STDERR, b'err')
+        ]
+
+    def test_yields_whole_frames_from_partial_reads(self):
+        data = frame(STDOUT, b'hello') + frame(STDERR, b'world')
+        self.send(*[data[i:i + 3] for i in range(0, len(data), 3)])
+        assert list(frames_iter(self.reader)) == [
+            (STDOUT, b'hello'), (STDERR, b'world')
+        ]
+
+    def test_frame_larger_than_block_size(self):
+        payload = b'x' * 100000
+        self.send(frame(STDOUT, payload), frame(STDOUT, b'!'))
+        assert list(frames_iter(self.reader, block_size=16)) == [
+            (STDOUT, payload), (STDOUT, b'!')
+        ]
+
+    def test_read_exactly(self):
+        self.send(b'ab', b'cd')
+        assert read_exactly(self.reader, 3) == b'abc'
+        with pytest.raises(SocketError):
+            read_exactly(self.reader, 2)
+
+    def test_chunks_iter(self):
+        self.send(b'raw ', b'tty output')
+        assert b''.join(chunks_iter(self.reader)) == b'raw tty output'
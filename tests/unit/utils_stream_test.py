@@ -0,0 +1,93 @@
+import io
+import struct
+
+from docker.utils.stream import (decode_blocks, decode_frames, decode_output,
+                                 demux_buffer, iter_lines, read_chunked)
+
+
+def chunked(*chunks):
+    data = b''
+    for chunk in chunks:
+        data += '{0:x}\r\n'.format(len(chunk)).encode('ascii')
+        data += chunk + b'\r\n'
+    return data + b'0\r\n\r\n'
+
+
+def multiplexed(*frames):
+    return b''.join(
+        struct.pack('>BxxxL', stream, len(data)) + data
+        for stream, data in frames
+    )
+
+
+class TestReadChunked(object):
+
+    def test_merges_chunks_received_together(self):
+        fp = io.BufferedReader(io.BytesIO(chunked(b'one', b'two', b'three')))
+        assert list(read_chunked(fp)) == [b'onetwothree']
+
+    def test_any_block_size(self):
+        payload = [b'{"status": "x"}\r\n', b'a' * 40, b'', b'b' * 17]
+        body = chunked(*[p for p in payload if p])
+        for block_size in range(1, 20):
+            fp = io.BufferedReader(io.BytesIO(body), buffer_size=block_size)
+            blocks = list(read_chunked(fp, block_size=block_size))
+            assert b''.join(blocks) == b''.join(payload)
+            assert all(blocks)
+
+    def test_chunk_extensions(self):
+        body = b'3;name=value\r\nabc\r\n0\r\n\r\n'
+        fp = io.BufferedReader(io.BytesIO(body))
+        assert list(read_chunked(fp)) == [b'abc']
+
+    def test_stops_at_last_chunk(self):
+        fp = io.BufferedReader(io.BytesIO(chunked(b'abc') + b'garbage'))
+        assert list(read_chunked(fp)) == [b'abc']
+
+
+class TestIterLines(object):
+
+    def test_lines_split_across_blocks(self):
+        blocks = [b'{"a": 1}\r\n{"b"', b': 2}', b'\r\n{"c": 3}']
+        assert list(iter_lines(blocks)) == [
+            b'{"a": 1}\r', b'{"b": 2}\r', b'{"c": 3}'
+        ]
+
+    def test_several_lines_per_block(self):
+        assert list(iter_lines([b'a\nb\n', b'c\n'])) == [b'a', b'b', b'c']
+
+
+class TestDemuxBuffer(object):
+
+    def test_joins_payload(self):
+        buf = multiplexed((1, b'hello '), (2, b'world'), (1, b'!\n'))
+        assert demux_buffer(buf) == b'hello world!\n'
+
+    def test_separate(self):
+        buf = multiplexed((1, b'hello '), (2, b'world'), (1, b'!\n'))
+        assert demux_buffer(buf, separate=True) == (b'hello !\n', b'world')
+
+    def test_ignores_truncated_header(self):
+        buf = multiplexed((1, b'out'), (1, b'')) + b'\x01\x00'
+        assert demux_buffer(buf) == b'out'
+        assert demux_buffer(b'') == b''
+
+
+class TestDecode(object):
+
+    def test_blocks_split_characters(self):
+        blocks = [b'caf', b'\xc3', b'\xa9 ok']
+        assert u''.join(decode_blocks(blocks)) == u'caf\xe9 ok'
+
+    def test_blocks_incomplete_character(self):
+        assert list(decode_blocks([b'a\xc3'])) == [u'a', u'\ufffd']
+
+    def test_frames_are_decoded_by_stream(self):
+        frames = [(1, b'\xc3'), (2, b'\xa9'), (1, b'\xa9')]
+        assert list(decode_frames(frames)) == [
+            (2, u'\ufffd'), (1, u'\xe9')
+        ]
+
+    def test_output(self):
+        assert decode_output(b'\xc3\xa9') == u'\xe9'
+        assert decode_output((b'out', b'')) == (u'out', u'')
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import base64
+import gzip
 import json
 import os
 import os.path
@@ -9,26 +10,36 @@ import sys
 import tarfile
 import tempfile
 import unittest
+import zlib
 
 import pytest
 import six
 
+import docker.utils.utils
 from docker.api.client import APIClient
 from docker.constants import DEFAULT_DOCKER_API_VERSION, IS_WINDOWS_PLATFORM
 from docker.errors import DockerException, InvalidVersion
 from docker.utils import (
     parse_repository_tag, parse_host, convert_filters, kwargs_from_env,
     create_host_config, Ulimit, LogConfig, parse_bytes, parse_env_file,
-    exclude_paths, convert_volume_binds, decode_json_header, tar,
+    exclude_paths, convert_volume_binds, decode_json_header, tar, tar_stream,
     split_command, create_ipam_config, create_ipam_pool, parse_devices,
-    update_headers
+    update_headers, BuildContextCache, BuildContextStats
 )
 
+from docker.utils.compression import gzip_stream
 from docker.utils.ports import build_port_bindings, split_port
-from docker.utils.utils import create_endpoint_config, format_environment
+from docker.utils.utils import (
+    create_endpoint_config, format_environment, PatternMatcher
+)
 
 from ..helpers import make_tree
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 
 TEST_CERT_DIR = os.path.join(
     os.path.dirname(__file__),
@@ -1008,6 +1019,50 @@ class ExcludePathsTest(unittest.TestCase):
         )
 
 
+class PatternMatcherTest(unittest.TestCase):
+    def test_includes(self):
+        matcher = PatternMatcher(['*.py', 'foo'], ['b.py', 'foo/bar'])
+        assert matcher.includes(['a.go'])
+        assert not matcher.includes(['a.py'])
+        assert matcher.includes(['b.py'])
+        assert matcher.includes(['bar', 'a.py'])
+        assert not matcher.includes(['foo', 'a.py'])
+        assert matcher.includes(['foo', 'bar', 'a.py'])
+
+    def test_may_include_below(self):
+        matcher = PatternMatcher(
+            ['node_modules', 'foo'], ['Dockerfile', 'foo/*/keep']
+        )
+        assert not matcher.may_include_below(['node_modules'])
+        assert matcher.may_include_below(['foo'])
+        assert matcher.may_include_below(['foo', 'bar'])
+        assert not matcher.may_include_below(['foo', 'bar', 'baz'])
+
+    def test_may_include_below_character_class(self):
+        matcher = PatternMatcher(['foo'], ['foo[/]bar'])
+        assert matcher.may_include_below(['foo'])
+
+    def test_ignored_directory_is_not_walked(self):
+        base = make_tree(
+            ['node_modules/mod', 'src'],
+            ['node_modules/mod/a.js', 'src/a.log', 'src/keep.log']
+        )
+        self.addCleanup(shutil.rmtree, base)
+        walked = []
+        list_dir = docker.utils.utils._list_dir
+
+        def fake_list_dir(path):
+            walked.append(os.path.relpath(path, base))
+            return list_dir(path)
+
+        with mock.patch('docker.utils.utils._list_dir', fake_list_dir):
+            paths = exclude_paths(
+                base, ['node_modules', '*/*.log', '!src/keep.log']
+            )
+        assert paths == set(convert_paths(['src', 'src/keep.log']))
+        assert sorted(walked) == ['.', 'src']
+
+
 class TarTest(unittest.TestCase):
     def test_tar_with_excludes(self):
         dirs = [
@@ -1092,6 +1147,89 @@ class TarTest(unittest.TestCase):
             )
 
 
+class TarStreamTest(unittest.TestCase):
+    def make_context(self):
+        base = make_tree(['foo', 'foo/bar'], ['Dockerfile', 'foo/a.py'])
+        self.addCleanup(shutil.rmtree, base)
+        self.content = b'0123456789' * 10000 + b'!'
+        with open(os.path.join(base, 'foo/bar/big'), 'wb') as f:
+            f.write(self.content)
+        return base
+
+    def check_archive(self, data, mode='r'):
+        archive = tarfile.open(fileobj=six.BytesIO(data), mode=mode)
+        self.assertEqual(sorted(archive.getnames()), [
+            'Dockerfile', 'foo', 'foo/a.py', 'foo/bar', 'foo/bar/big'
+        ])
+        self.assertEqual(
+            archive.extractfile('foo/bar/big').read(), self.content
+        )
+
+    def test_tar_stream(self):
+        base = self.make_context()
+        blocks = list(tar_stream(base, chunk_size=4096))
+        assert len(blocks) > 1
+        assert max(len(block) for block in blocks) < 4096 + 10240
+        self.check_archive(b''.join(blocks))
+
+        with tar(base) as archive:
+            self.assertEqual(b''.join(blocks), archive.read())
+
+    def test_tar_stream_gzip(self):
+        base = self.make_context()
+        data = b''.join(tar_stream(base, gzip=True))
+        self.check_archive(data, mode='r:gz')
+
+    def test_tar_stream_gzip_workers(self):
+        base = self.make_context()
+        data = b''.join(tar_stream(
+            base, gzip=True, gzip_workers=4, gzip_level=1
+        ))
+        self.check_archive(data, mode='r:gz')
+
+    def test_tar_stream_with_excludes(self):
+        base = self.make_context()
+        data = b''.join(tar_stream(base, exclude=['foo/bar']))
+        archive = tarfile.open(fileobj=six.BytesIO(data))
+        self.assertEqual(
+            sorted(archive.getnames()), ['Dockerfile', 'foo', 'foo/a.py']
+        )
+
+
+class GzipStreamTest(unittest.TestCase):
+    data = b''.join(
+        six.int2byte(i % 251) * (i % 17) for i in range(20000)
+    )
+
+    def blocks(self, size=1000):
+        return (
+            self.data[i:i + size] for i in range(0, len(self.data), size)
+        )
+
+    def test_single_worker(self):
+        compressed = b''.join(gzip_stream(self.blocks()))
+        assert zlib.decompress(compressed, 31) == self.data
+
+    def test_multiple_workers(self):
+        compressed = b''.join(
+            gzip_stream(self.blocks(), workers=4, block_size=4096)
+        )
+        with gzip.GzipFile(fileobj=six.BytesIO(compressed)) as f:
+            assert f.read() == self.data
+        # Each piece is a gzip member of its own
+        decompressor = zlib.decompressobj(31)
+        first = decompressor.decompress(compressed)
+        assert first == self.data[:4096]
+        assert decompressor.unused_data
+
+    def test_empty(self):
+        for workers in (1, 4):
+            compressed = b''.join(gzip_stream(iter([]), workers=workers))
+            assert compressed
+            with gzip.GzipFile(fileobj=six.BytesIO(compressed)) as f:
+                assert f.read() == b''
+
+
 class FormatEnvironmentTest(unittest.TestCase):
     def test_format_env_binary_unicode_value(self):
         env_dict = {
@@ -1105,3 +1243,88 @@ class FormatEnvironmentTest(unittest.TestCase):
             'BAR': '',
         }
         assert sorted(format_environment(env_dict)) == ['BAR=', 'FOO']
+
+
+class BuildContextCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.base = make_tree(['foo'], ['Dockerfile', 'foo/a', 'b'])
+        self.addCleanup(shutil.rmtree, self.base)
+        for name, content in [('foo/a', b'same'), ('b', b'same')]:
+            with open(os.path.join(self.base, name), 'wb') as f:
+                f.write(content)
+        self.cache = BuildContextCache()
+
+    def archive(self, base=None, stats=None):
+        base = base or self.base
+        data = b''.join(
+            tar_stream(base, cache=self.cache, cache_stats=stats)
+        )
+        with tar(base) as archive:
+            self.assertEqual(data, archive.read())
+        return self.cache.last_build
+
+    def test_reuses_unchanged_files(self):
+        stats = self.archive()
+        assert (stats.hits, stats.misses) == (0, 3)
+        assert stats.hit_ratio == 0.0
+        # Identical content is stored once.
+        assert len(self.cache._segments) == 2
+
+        with mock.patch(
+            'docker.utils.utils.open', create=True, side_effect=open
+        ) as mock_open:
+            stats = self.archive()
+        # Only tar() reads the files, to compare the archives.
+        assert mock_open.call_count == 3
+        assert (stats.hits, stats.misses) == (3, 0)
+        assert stats.hit_ratio == 1.0
+        assert stats.bytes_reused == 3 * tarfile.BLOCKSIZE
+        assert sorted(stats.manifest) == ['Dockerfile', 'b', 'foo/a']
+        assert stats.manifest['b'] == stats.manifest['foo/a']
+
+    def test_rereads_changed_files(self):
+        self.archive()
+        path = os.path.join(self.base, 'b')
+        with open(path, 'wb') as f:
+            f.write(b'changed')
+        stats = self.archive()
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.manifest['b'] != stats.manifest['foo/a']
+        assert len(self.cache._segments) == 3
+
+    def test_stats_are_per_context(self):
+        other = make_tree([], ['Dockerfile', 'c'])
+        self.addCleanup(shutil.rmtree, other)
+        with open(os.path.join(self.base, 'foo/a'), 'wb') as f:
+            f.write(b'x' * 64 * 1024)
+        stats = BuildContextStats()
+        blocks = tar_stream(
+            self.base, cache=self.cache, cache_stats=stats,
+            chunk_size=tarfile.BLOCKSIZE
+        )
+        next(blocks)
+        assert self.cache.last_build is None
+        # Another context is archived while the first one is in progress.
+        other_stats = self.archive(other)
+        b''.join(blocks)
+        assert sorted(other_stats.manifest) == ['Dockerfile', 'c']
+        assert sorted(stats.manifest) == ['Dockerfile', 'b', 'foo/a']
+        assert self.cache.last_build is stats
+
+    def test_max_size(self):
+        assert self.cache.max_size is not None
+        self.cache = BuildContextCache(max_size=2 * tarfile.BLOCKSIZE)
+        with open(os.path.join(self.base, 'foo/a'), 'wb') as f:
+            f.write(b'x' * (2 * tarfile.BLOCKSIZE + 1))
+        self.archive()
+        assert self.cache.size == 2 * tarfile.BLOCKSIZE
+        stats = self.archive()
+        assert (stats.hits, stats.misses) == (2, 1)
+
+    def test_eviction_forgets_files(self):
+        self.cache = BuildContextCache(max_size=tarfile.BLOCKSIZE)
+        self.archive()
+        assert len(self.cache._segments) == 1
+        digest, = self.cache._segments
+        assert set(v[1] for v in self.cache._files.values()) == set([digest])
+        assert set(self.cache._paths) == set([digest])